@@ -0,0 +1,144 @@
+# arvore.py — Árvore sintática concreta guardada em arena (colunas paralelas)
+from array import array
+
+# Valor das colunas para "nenhum" (sem filho, sem irmão, sem token, sem produção)
+NENHUM = -1
+
+
+class ArvoreSintatica:
+    """
+    Árvore sintática concreta em uma arena: cada nó é um índice inteiro e
+    seus campos ficam em arrays paralelos, sem um objeto por nó.
+
+      tipo[n]     id do símbolo (nome em nomes[tipo[n]])
+      filho[n]    primeiro filho ou -1
+      irmao[n]    próximo irmão ou -1
+      token[n]    índice do token casado (folhas) ou -1
+      producao[n] id da produção usada (nós internos) ou -1
+
+    Os analisadores preenchem a árvore quando recebem uma instância em
+    `arvore=`; nós de erro ficam sem filhos (não-terminal não expandido)
+    ou sem token (terminal que faltou). Todos os percursos são iterativos.
+    """
+
+    __slots__ = ("tipo", "filho", "irmao", "token", "producao", "nomes", "ids", "tokens", "raiz")
+
+    def __init__(self):
+        self.reiniciar([], None)
+
+    def reiniciar(self, nomes, tokens):
+        """
+        Esvazia a arena. `nomes` é a tabela de símbolos inicial (ids = posições).
+        """
+        self.tipo = array("H")
+        self.filho = array("i")
+        self.irmao = array("i")
+        self.token = array("i")
+        self.producao = array("i")
+        self.nomes = list(nomes)
+        self.ids = {nome: i for i, nome in enumerate(self.nomes)}
+        self.tokens = tokens
+        self.raiz = NENHUM
+
+    def id_simbolo(self, nome):
+        i = self.ids.get(nome)
+        if i is None:
+            i = self.ids[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        return i
+
+    def novo(self, tipo, token=NENHUM, producao=NENHUM):
+        """
+        Cria um nó solto (sem filhos nem irmãos) e devolve seu índice.
+        """
+        n = len(self.tipo)
+        self.tipo.append(tipo)
+        self.filho.append(NENHUM)
+        self.irmao.append(NENHUM)
+        self.token.append(token)
+        self.producao.append(producao)
+        return n
+
+    def __len__(self):
+        return len(self.tipo)
+
+    def nome(self, no):
+        return self.nomes[self.tipo[no]]
+
+    def lexema(self, no):
+        """
+        Lexema do token da folha (None em nós internos e terminais ausentes).
+        """
+        t = self.token[no]
+        return None if t < 0 else self.tokens[t][1]
+
+    def filhos(self, no):
+        filho, irmao = self.filho, self.irmao
+        n = filho[no]
+        while n >= 0:
+            yield n
+            n = irmao[n]
+
+    def percorrer(self, no=None):
+        """
+        Pré-ordem a partir de `no` (padrão: raiz), gerando (nó, profundidade).
+        """
+        no = self.raiz if no is None else no
+        if no < 0:
+            return
+        filho, irmao = self.filho, self.irmao
+        pilha = [(no, 0)]
+        while pilha:
+            n, prof = pilha.pop()
+            yield n, prof
+            # empilha os filhos do último para o primeiro
+            filhos = []
+            f = filho[n]
+            while f >= 0:
+                filhos.append(f)
+                f = irmao[f]
+            prof += 1
+            pilha.extend((f, prof) for f in reversed(filhos))
+
+    def pos_ordem(self, no=None):
+        """
+        Pós-ordem a partir de `no`: cada nó depois de todos os seus filhos.
+        """
+        no = self.raiz if no is None else no
+        if no < 0:
+            return
+        filho, irmao = self.filho, self.irmao
+        # (nó, próximo filho a visitar)
+        pilha = [[no, filho[no]]]
+        while pilha:
+            topo = pilha[-1]
+            f = topo[1]
+            if f >= 0:
+                topo[1] = irmao[f]
+                pilha.append([f, filho[f]])
+            else:
+                pilha.pop()
+                yield topo[0]
+
+    def folhas(self, no=None):
+        """
+        Folhas com token, na ordem do fonte.
+        """
+        token = self.token
+        for n, _ in self.percorrer(no):
+            if token[n] >= 0:
+                yield n
+
+    def formatar(self, no=None, limite=None):
+        """
+        Texto da árvore, um nó por linha, indentado pela profundidade.
+        """
+        linhas = []
+        for n, prof in self.percorrer(no):
+            if limite is not None and len(linhas) >= limite:
+                linhas.append("...")
+                break
+            lexema = self.lexema(n)
+            rotulo = self.nome(n) if lexema is None else f"{self.nome(n)} '{lexema}'"
+            linhas.append("  " * prof + rotulo)
+        return "\n".join(linhas)
@@ -0,0 +1 @@
+# benchmarks — medições de desempenho do compilador Brick
@@ -0,0 +1,62 @@
+# benchmarks/bench_descendente.py — LL(1) por tabela x descendente recursivo gerado (gerador_descendente.py)
+#
+# Uso: python -m benchmarks.bench_descendente [tokens ...]
+#
+# Antes de medir, confere que os dois produzem os mesmos eventos de rastro
+# e os mesmos diagnósticos (em programas com e sem erros).
+import statistics
+import sys
+import time
+
+from benchmarks.gerador import gerar_programa
+from cache_tabelas import obter_tabelas
+from gerador_descendente import obter_descendente
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from scanner import analisador_lexico_buffer
+
+REPETICOES = 5
+NIVEIS = ("desligado", "anel")
+
+
+def mediana(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def conferir(parser, modulo, tokens):
+    for nivel in ("completo", "desligado"):
+        esperado, obtido = [], []
+        rastro_tabela = parser.analisar(tokens, nivel, esperado, exibir=False)
+        rastro_gerado = modulo.analisar(tokens, nivel, obtido, exibir=False)
+        if esperado != obtido or list(rastro_tabela.eventos) != list(rastro_gerado.eventos):
+            raise SystemExit(f"o analisador gerado diverge da tabela (rastro {nivel})")
+
+
+def main(argv):
+    tamanhos = [int(x) for x in argv] or [10_000, 100_000, 1_000_000]
+    tabela = obter_tabelas(grammar).ll1
+    parser = AnalisadorSintaticoLL1(grammar, tabela)
+    inicio = time.perf_counter()
+    modulo = obter_descendente(grammar, tabela=tabela)
+    print(f"módulo {modulo.__file__} pronto em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    for erros in (0, 5):
+        conferir(parser, modulo, analisador_lexico_buffer(gerar_programa(5000, erros=erros), []))
+
+    print(f"{'tokens':>9} {'rastro':>10} {'tabela (ms)':>12} {'gerado (ms)':>12} {'ganho':>6}")
+    for n in tamanhos:
+        tokens = analisador_lexico_buffer(gerar_programa(n), [])
+        for nivel in NIVEIS:
+            t_tabela = mediana(lambda: parser.analisar(tokens, nivel, [], exibir=False))
+            t_gerado = mediana(lambda: modulo.analisar(tokens, nivel, [], exibir=False))
+            print(f"{len(tokens):>9} {nivel:>10} {t_tabela * 1000:>12.1f} {t_gerado * 1000:>12.1f} "
+                  f"{t_tabela / t_gerado:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
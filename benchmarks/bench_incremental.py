@@ -0,0 +1,58 @@
+# benchmarks/bench_incremental.py — Análise completa x reanálise incremental após uma edição
+#
+# Uso: python -m benchmarks.bench_incremental [copias ...]
+import os
+import random
+import sys
+import time
+
+from grammar import grammar
+from incremental import AnalisadorIncremental
+from ll1_parser import AnalisadorSintaticoLL1
+
+APP_BR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.br")
+
+
+def replicar_programa(fonte, copias):
+    """
+    Repete `copias` vezes o corpo do bloco principal do programa.
+    """
+    inicio = fonte.index("principal {") + len("principal {")
+    fim = fonte.rindex("}")
+    return fonte[:inicio] + fonte[inicio:fim] * copias + fonte[fim:]
+
+
+def medir(inc, texto, edicoes=50):
+    inicio = time.perf_counter()
+    estado = inc.analisar(texto)
+    t_completo = time.perf_counter() - inicio
+
+    # insere dois espaços em pontos aleatórios entre tokens
+    sorteio = random.Random(0)
+    t_edicoes = 0.0
+    passos = 0
+    for _ in range(edicoes):
+        deslocamento = sorteio.randrange(len(texto))
+        while texto[deslocamento] not in " \n":
+            deslocamento = (deslocamento + 1) % len(texto)
+        inicio = time.perf_counter()
+        passos += inc.editar(estado, deslocamento, 0, "  ").passos
+        t_edicoes += time.perf_counter() - inicio
+
+    return len(estado.tokens), estado.passos, t_completo, passos / edicoes, t_edicoes / edicoes
+
+
+def main(argv):
+    copias = [int(x) for x in argv] or [1, 20, 300]
+    with open(APP_BR, "r", encoding="utf-8") as f:
+        fonte = f.read()
+    inc = AnalisadorIncremental(AnalisadorSintaticoLL1(grammar))
+
+    print(f"{'cópias':>7} {'tokens':>8} | {'passos':>8} {'completo (ms)':>14} | {'passos':>7} {'edição (ms)':>12}")
+    for k in copias:
+        n, passos, t_completo, passos_ed, t_ed = medir(inc, replicar_programa(fonte, k))
+        print(f"{k:>7} {n:>8} | {passos:>8} {t_completo * 1000:>14.2f} | {passos_ed:>7.0f} {t_ed * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+# benchmarks/bench_inicializacao.py — Tempo de inicialização do main.py por conjunto de etapas
+#
+# Uso: python -m benchmarks.bench_inicializacao [--repeticoes 10] [arquivo.br]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (rótulo, argumentos do main.py); a linha de base é o interpretador vazio.
+# "{saida}" vira um caminho em um diretório temporário.
+CENARIOS = (
+    ("python vazio", None),
+    ("--etapas lex -q", ["--etapas", "lex", "-q", "--formato", "nenhum"]),
+    ("--etapas lex,ll1 -q", ["--etapas", "lex,ll1", "-q", "--formato", "nenhum"]),
+    ("--etapas lex,ll1,slr -q", ["--etapas", "lex,ll1,slr", "-q", "--formato", "nenhum"]),
+    ("todas, jsonl", ["--formato", "jsonl", "--saida", "{saida}"]),
+    ("todas, pdf", ["--formato", "pdf", "--saida", "{saida}"]),
+)
+
+
+def medir(argumentos, arquivo, repeticoes):
+    """
+    Mediana do tempo de parede de `repeticoes` processos novos.
+    """
+    if argumentos is None:
+        comando = [sys.executable, "-c", "pass"]
+    else:
+        comando = [sys.executable, os.path.join(RAIZ, "main.py"), arquivo] + argumentos
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def modulos_carregados(argumentos, arquivo):
+    """
+    Módulos pesados (de terceiros e os escritores de PDF) importados pelo
+    cenário (python -X importtime).
+    """
+    comando = [sys.executable, "-X", "importtime", os.path.join(RAIZ, "main.py"), arquivo] + argumentos
+    saida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True).stderr
+    pesados = ("tabulate", "fpdf", "fontTools", "pdf_rastro", "pdf_exporter")
+    return sorted({linha.rsplit("|", 1)[-1].strip().split(".")[0] for linha in saida.splitlines()
+                   if any(p in linha for p in pesados)})
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Mede a inicialização do main.py.")
+    args.add_argument("arquivo", nargs="?", default="app.br")
+    args.add_argument("--repeticoes", type=int, default=10)
+    opcoes = args.parse_args(argv)
+
+    print(f"{'cenário':>26} {'mediana (ms)':>13}  dependências pesadas")
+    pasta = tempfile.TemporaryDirectory()
+    saida = os.path.join(pasta.name, "relatorio")
+    for rotulo, argumentos in CENARIOS:
+        if argumentos is not None:
+            argumentos = [a.replace("{saida}", saida) for a in argumentos]
+        tempo = medir(argumentos, opcoes.arquivo, opcoes.repeticoes)
+        pesadas = "-" if argumentos is None else ", ".join(modulos_carregados(argumentos, opcoes.arquivo)) or "nenhuma"
+        print(f"{rotulo:>26} {tempo * 1000:>13.1f}  {pesadas}")
+    pasta.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_lalr.py — SLR(1) x LALR(1): tempo de construção e entradas de reduce
+#
+# Uso: python -m benchmarks.bench_lalr [copias ...]
+import sys
+import time
+
+from benchmarks.gramaticas import replicar_gramatica
+from grammar import grammar
+from slr_parser import ConstrucaoTabelaLALR, ConstrucaoTabelaSLR, Conversao
+
+# Gramática clássica de atribuição com ponteiros: não é SLR(1), mas é LALR(1)
+PONTEIROS = {
+    "S": [["L", "ATRIB", "R"], ["R"]],
+    "L": [["ESTRELA", "R"], ["IDENT"]],
+    "R": [["L"]],
+}
+
+
+def medir(construtor, G):
+    conflitos = []
+    inicio = time.perf_counter()
+    acao, _, estados = construtor(G, conflitos=conflitos)
+    tempo = time.perf_counter() - inicio
+    # reduces gravados, inclusive os que perderam um conflito para um shift
+    reduces = sum(1 for tipo, _ in acao.values() if tipo == "reduce")
+    for (_, _, existente, nova, escolhida) in conflitos:
+        perdedora = nova if escolhida is existente else existente
+        reduces += perdedora[0] == "reduce"
+    return tempo, reduces, len(conflitos), len(estados)
+
+
+def main(argv):
+    copias = [int(x) for x in argv] or [1, 16, 64, 256]
+    casos = [("ponteiros", PONTEIROS)]
+    base = Conversao(grammar)
+    casos += [(f"brick x{k}", replicar_gramatica(base, k)) for k in copias]
+
+    print(f"{'gramática':>12} {'produções':>10} {'estados':>8} | {'SLR (s)':>8} {'reduces':>8} {'confl.':>6} | {'LALR (s)':>8} {'reduces':>8} {'confl.':>6}")
+    for nome, G in casos:
+        n_prods = sum(len(p) for p in G.values())
+        t_slr, r_slr, c_slr, n_estados = medir(ConstrucaoTabelaSLR, G)
+        t_lalr, r_lalr, c_lalr, _ = medir(ConstrucaoTabelaLALR, G)
+        print(f"{nome:>12} {n_prods:>10} {n_estados:>8} | {t_slr:>8.4f} {r_slr:>8} {c_slr:>6} | {t_lalr:>8.4f} {r_lalr:>8} {c_lalr:>6}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
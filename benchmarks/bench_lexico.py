@@ -0,0 +1,151 @@
+# benchmarks/bench_lexico.py — Scanner atual (IDENT + busca de palavra-chave) x scanner anterior (uma alternativa por palavra-chave)
+#
+# Uso: python -m benchmarks.bench_lexico [tokens ...]
+#
+# Primeiro a regressão: nos programas gerados (sem identificadores com
+# prefixo de palavra-chave) os dois scanners devem dar os mesmos tokens,
+# também lendo em blocos pequenos; nos CASOS, o resultado esperado é o
+# do scanner atual. Depois, a vazão (MB/s) dos dois.
+import io
+import re
+import statistics
+import sys
+import time
+from array import array
+
+from benchmarks.gerador import gerar_programa
+from scanner import ID_TIPO, analisador_lexico, analisador_lexico_buffer, gerar_tokens_arquivo
+
+REPETICOES = 5
+
+# expressão mestra anterior: cada palavra-chave é uma alternativa antes do IDENT
+LEXEMAS_ANTERIORES = [
+    ("PRINCIPAL", r'principal'), ("FUNCAO", r'funcao'), ("TIPO_VAR", r'int|real|cadeia|car|booleano|vazio'),
+    ("SENAO", r'senao'), ("SE", r'se'), ("ENQUANTO", r'enquanto'), ("FACA", r'faca'), ("PARA", r'para'),
+    ("RETORNO", r'retornar'), ("BOOLEANO", r'verdadeiro|falso'), ("NUMERO_REAL", r'\d+\.\d+'),
+    ("NUMERO_INT", r'\d+'), ("CARACTERE", r'\'.\''), ("PALAVRA", r'"(?:\\.|[^"\\])*"'),
+    ("IDENT", r'[a-zA-Z_]\w*'), ("COMPAR", r'[<>]=?|==|!='), ("OPER_ARIT", r'[+\-*/%]'),
+    ("OPER_LOGI_UN", r'!'), ("OPER_LOGI_BIN", r'&&|\|\|'), ("ATRIB", r'='), ("LPAREN", r'\('),
+    ("RPAREN", r'\)'), ("LCHAVE", r'\{'), ("RCHAVE", r'\}'), ("VIRGULA", r','), ("PONTOVIRG", r';'),
+    ("NOVA_LINHA", r'\n'), ("IGNORAR", r'[ \t]+'), ("INCOMPAT", r'.'),
+]
+PADRAO_ANTERIOR = re.compile("|".join(f"(?P<{nome}>{expressao})" for nome, expressao in LEXEMAS_ANTERIORES))
+
+# (fonte, tokens esperados do scanner atual sem o EOF); os primeiros são
+# os que o scanner anterior partia em palavra-chave + IDENT
+CASOS = [
+    ("sequencia", [("IDENT", "sequencia")]),
+    ("inteiro x", [("IDENT", "inteiro"), ("IDENT", "x")]),
+    ("principalmente", [("IDENT", "principalmente")]),
+    ("paralelo = falsos;", [("IDENT", "paralelo"), ("ATRIB", "="), ("IDENT", "falsos"), ("PONTOVIRG", ";")]),
+    ("senao se", [("SENAO", "senao"), ("SE", "se")]),
+    ("int real cadeia car booleano vazio", [("TIPO_VAR", t) for t in ("int", "real", "cadeia", "car", "booleano", "vazio")]),
+    ("verdadeiro falso", [("BOOLEANO", "verdadeiro"), ("BOOLEANO", "falso")]),
+    ("x<=1!=y==z>=!w", [("IDENT", "x"), ("COMPAR", "<="), ("NUMERO_INT", "1"), ("COMPAR", "!="), ("IDENT", "y"),
+                        ("COMPAR", "=="), ("IDENT", "z"), ("COMPAR", ">="), ("OPER_LOGI_UN", "!"), ("IDENT", "w")]),
+    ("a&&b||c", [("IDENT", "a"), ("OPER_LOGI_BIN", "&&"), ("IDENT", "b"), ("OPER_LOGI_BIN", "||"), ("IDENT", "c")]),
+    ("12.5 12 3.", [("NUMERO_REAL", "12.5"), ("NUMERO_INT", "12"), ("NUMERO_INT", "3")]),
+    ("'a' \"x\\\"y\"", [("CARACTERE", "'a'"), ("PALAVRA", '"x\\"y"')]),
+    ("x_1\t= 2abc", [("IDENT", "x_1"), ("ATRIB", "="), ("NUMERO_INT", "2"), ("IDENT", "abc")]),
+    # brancos no fim do fonte, sem quebra de linha final
+    ("x = 1;  ", [("IDENT", "x"), ("ATRIB", "="), ("NUMERO_INT", "1"), ("PONTOVIRG", ";")]),
+    ("principal { }\t \t", [("PRINCIPAL", "principal"), ("LCHAVE", "{"), ("RCHAVE", "}")]),
+    ("a\n \t", [("IDENT", "a")]),
+]
+
+
+def lexico_anterior(codigo, diagnosticos):
+    tokens = []
+    linha = 1
+    for correspondencia in PADRAO_ANTERIOR.finditer(codigo):
+        tipo_token = correspondencia.lastgroup
+        if tipo_token == "NOVA_LINHA":
+            linha += 1
+        elif tipo_token == "INCOMPAT":
+            diagnosticos.append(linha)
+        elif tipo_token != "IGNORAR":
+            tokens.append((tipo_token, correspondencia.group(), linha))
+    tokens.append(("EOF", None, linha))
+    return tokens
+
+
+def lexico_buffer_anterior(codigo):
+    # mesmo laço do analisador_lexico_buffer anterior (só as colunas)
+    tipos, inicios, comprimentos, linhas = array("B"), array("I"), array("I"), array("I", [0])
+    for correspondencia in PADRAO_ANTERIOR.finditer(codigo):
+        tipo_token = correspondencia.lastgroup
+        if tipo_token == "NOVA_LINHA":
+            linhas.append(correspondencia.end())
+            continue
+        if tipo_token == "IGNORAR" or tipo_token == "INCOMPAT":
+            continue
+        inicio, fim = correspondencia.span()
+        tipos.append(ID_TIPO[tipo_token])
+        inicios.append(inicio)
+        comprimentos.append(fim - inicio)
+    return tipos
+
+
+def regressao():
+    falhas = []
+    for fonte, esperado in CASOS:
+        diag_lista, diag_buffer = [], []
+        tokens = analisador_lexico(fonte, diag_lista)
+        obtido = [(tipo, lexema) for tipo, lexema, _ in tokens[:-1]]
+        if obtido != esperado:
+            falhas.append(f"{fonte!r}: {obtido}")
+        if list(analisador_lexico_buffer(fonte, diag_buffer)) != tokens or diag_buffer != diag_lista:
+            falhas.append(f"{fonte!r}: TokenBuffer diverge da lista")
+        if fonte != fonte.rstrip(" \t") and diag_lista:
+            falhas.append(f"{fonte!r}: brancos no fim viraram erro léxico")
+
+    for semente in range(5):
+        # caracteres inválidos e linhas em branco no meio do programa
+        fonte = gerar_programa(3000, semente=semente).replace(";\n", "; @\n\n", 7)
+        diag_anterior, diag_atual = [], []
+        anterior = lexico_anterior(fonte, diag_anterior)
+        atual = analisador_lexico(fonte, diag_atual)
+        if atual != anterior:
+            falhas.append(f"programa {semente}: tokens diferentes do scanner anterior")
+        if [d.linha for d in diag_atual] != diag_anterior:
+            falhas.append(f"programa {semente}: diagnósticos diferentes do scanner anterior")
+        if list(analisador_lexico_buffer(fonte, [])) != atual:
+            falhas.append(f"programa {semente}: TokenBuffer diferente da lista")
+        for bloco in (7, 64, 4096):
+            if list(gerar_tokens_arquivo(io.StringIO(fonte), bloco, [])) != atual:
+                falhas.append(f"programa {semente}: leitura em blocos de {bloco} diverge")
+    return falhas
+
+
+def vazao(funcao, fonte):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao(fonte)
+        tempos.append(time.perf_counter() - inicio)
+    return len(fonte.encode("utf-8")) / statistics.median(tempos) / 1e6
+
+
+def main(argv):
+    falhas = regressao()
+    for falha in falhas:
+        print("FALHA", falha)
+    print(f"regressão: {len(CASOS)} casos + 5 programas, {len(falhas)} falhas")
+
+    tamanhos = [int(x) for x in argv] or [10_000, 100_000, 1_000_000]
+    print(f"{'tokens':>9} {'MB':>6} | {'lista ant.':>10} {'lista':>8} | {'buffer ant.':>11} {'buffer':>8}  (MB/s)")
+    for n in tamanhos:
+        fonte = gerar_programa(n)
+        resultados = (
+            vazao(lambda f: lexico_anterior(f, []), fonte),
+            vazao(lambda f: analisador_lexico(f, []), fonte),
+            vazao(lexico_buffer_anterior, fonte),
+            vazao(lambda f: analisador_lexico_buffer(f, []), fonte),
+        )
+        print(f"{n:>9} {len(fonte) / 1e6:>6.2f} | {resultados[0]:>10.1f} {resultados[1]:>8.1f} | "
+              f"{resultados[2]:>11.1f} {resultados[3]:>8.1f}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
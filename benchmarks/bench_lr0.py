@@ -0,0 +1,39 @@
+# benchmarks/bench_lr0.py — Tempo de construção do autômato LR(0) x tamanho da gramática
+#
+# Uso: python -m benchmarks.bench_lr0 [copias ...]
+import sys
+import time
+
+from benchmarks.gramaticas import replicar_gramatica
+from grammar import grammar
+from slr_parser import ConstrucaoTabelaSLR, Conversao, itens_lr0
+
+
+def medir(G, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        estados, trans, _ = itens_lr0(G)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return len(estados), len(trans), melhor
+
+
+def main(argv):
+    copias = [int(x) for x in argv] or [1, 4, 16, 64, 256]
+    base = Conversao(grammar)
+
+    print(f"{'cópias':>7} {'produções':>10} {'estados':>8} {'transições':>11} {'LR(0) (s)':>10} {'SLR (s)':>9} {'µs/estado':>10}")
+    for k in copias:
+        G = replicar_gramatica(base, k)
+        n_prods = sum(len(p) for p in G.values())
+        n_estados, n_trans, t_lr0 = medir(G)
+
+        inicio = time.perf_counter()
+        ConstrucaoTabelaSLR(G)
+        t_slr = time.perf_counter() - inicio
+
+        print(f"{k:>7} {n_prods:>10} {n_estados:>8} {n_trans:>11} {t_lr0:>10.4f} {t_slr:>9.4f} {t_lr0 / n_estados * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+# benchmarks/bench_otimizacao.py — Gramática original x otimizada (otimizacao_gramatica.py), passe a passe
+#
+# Uso: python -m benchmarks.bench_otimizacao [tokens]
+#
+# Primeiro a regressão: com a gramática otimizada os dois analisadores
+# aceitam e rejeitam os mesmos programas, e as expansões/reduções
+# traduzidas de volta dão exatamente as contagens da gramática original.
+# Depois, para cada prefixo da lista de passes: estados LR(0), entradas
+# de ACTION/GOTO, células LL(1), conflitos SLR e passos por token.
+import statistics
+import sys
+import time
+
+from benchmarks.gerador import gerar_programa
+from cache_tabelas import construir_tabelas
+from grammar import analyze, grammar
+from instrumentacao import ContadoresLL1, ContadoresSLR
+from ll1_parser import AnalisadorSintaticoLL1
+from otimizacao_gramatica import PASSES, otimizar
+from scanner import analisador_lexico_buffer
+from slr_parser import SINCRONIA_SLR, ConstrucaoTabelaSLR, Conversao, analisar_slr, itens_lr0
+
+REPETICOES = 5
+
+
+def mediana(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+class Medida:
+    def __init__(self, G):
+        self.G = G
+        self.tabelas = construir_tabelas(G)
+        self.parser = AnalisadorSintaticoLL1(G, self.tabelas.ll1)
+        self.estados = len(itens_lr0(Conversao(G))[0])
+        self.conflitos = []
+        ConstrucaoTabelaSLR(Conversao(G), analyze(G, next(iter(G))), self.conflitos)
+
+    def ll1(self, tokens, otimizada=None):
+        contador = ContadoresLL1(self.parser, otimizada=otimizada)
+        diagnosticos = []
+        self.parser.analisar(tokens, contador, diagnosticos, exibir=False)
+        return contador.resumo(), diagnosticos
+
+    def slr(self, tokens, otimizada=None):
+        contador = ContadoresSLR(otimizada=otimizada)
+        diagnosticos = []
+        analisar_slr(tokens, self.G, self.tabelas.lr("slr"), contador, diagnosticos=diagnosticos, exibir=False)
+        return contador.resumo(), diagnosticos
+
+
+def regressao(original, otimizada):
+    falhas = []
+    medida = Medida(otimizada.gramatica)
+    for semente in range(5):
+        for erros in (0, 3):
+            tokens = analisador_lexico_buffer(gerar_programa(2000, semente=semente, erros=erros), [])
+            for analise in ("ll1", "slr"):
+                (antes, diag_antes) = getattr(original, analise)(tokens)
+                (depois, diag_depois) = getattr(medida, analise)(tokens, otimizada)
+                if bool(diag_antes) != bool(diag_depois):
+                    falhas.append(f"programa {semente}/{erros} erros: {analise} aceita um e rejeita o outro")
+                chave = "expansoes_por_producao" if analise == "ll1" else "reduces_por_producao"
+                if not erros and antes[chave] != depois[chave + "_original"]:
+                    falhas.append(f"programa {semente}: {analise} traduzido não bate com a gramática original")
+    return falhas
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 100_000
+    original = Medida(grammar)
+    otimizada = otimizar(grammar, preservar=SINCRONIA_SLR)
+    falhas = regressao(original, otimizada)
+    for falha in falhas:
+        print("FALHA", falha)
+    print(f"regressão: 5 programas x (0, 3 erros), {len(falhas)} falhas")
+
+    tokens = analisador_lexico_buffer(gerar_programa(n), [])
+    total = len(tokens.tipos)
+    passes = list(PASSES)
+    print(f"{'passes':>18} {'prods':>5} {'estados':>7} {'ACTION':>6} {'GOTO':>5} {'LL(1)':>5} {'confl.':>6} | "
+          f"{'LL/tok':>6} {'SLR/tok':>7} {'LL (ms)':>8} {'SLR (ms)':>8}")
+    for k in range(len(passes) + 1):
+        medida = original if k == 0 else Medida(otimizar(grammar, passes[:k], SINCRONIA_SLR).gramatica)
+        ll1, _ = medida.ll1(tokens)
+        slr, _ = medida.slr(tokens)
+        t_ll1 = mediana(lambda: medida.parser.analisar(tokens, "desligado", [], exibir=False))
+        t_slr = mediana(lambda: analisar_slr(tokens, medida.G, medida.tabelas.lr("slr"), "desligado",
+                                             diagnosticos=[], exibir=False))
+        slr_tab = medida.tabelas.slr
+        print(f"{passes[k - 1] if k else 'original':>18} {sum(map(len, medida.G.values())):>5} {medida.estados:>7} "
+              f"{slr_tab.entradas_acao:>6} {slr_tab.entradas_goto:>5} {len(medida.tabelas.ll1):>5} "
+              f"{len(medida.conflitos):>6} | {(ll1['expansoes'] + ll1['casamentos']) / total:>6.2f} "
+              f"{(slr['shifts'] + slr['reduces']) / total:>7.2f} {t_ll1 * 1000:>8.1f} {t_slr * 1000:>8.1f}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,59 @@
+# benchmarks/bench_paralelo.py — LL(1) e SLR em sequência x ao mesmo tempo (paralelo.py)
+#
+# Uso: python -m benchmarks.bench_paralelo [tokens ...]
+#
+# Com um só núcleo (ou com GIL e modo threads) não há ganho a esperar: a
+# tabela mostra então só o custo de coordenação de cada modo.
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.gerador import gerar_programa
+from cache_tabelas import obter_tabelas
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from paralelo import PROCESSOS, THREADS, AnalisadorParalelo, gil_ativo
+from scanner import analisador_lexico_buffer
+from slr_parser import analisar_slr
+
+REPETICOES = 5
+
+
+def mediana(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(argv):
+    tamanhos = [int(x) for x in argv] or [1000, 10000, 100000]
+    tabelas = obter_tabelas(grammar, usar_cache=False)
+    parser = AnalisadorSintaticoLL1(grammar, tabelas.ll1)
+    tabelas_slr = tabelas.lr("slr")
+    analisadores = {modo: AnalisadorParalelo(tabelas, modo=modo) for modo in (THREADS, PROCESSOS)}
+
+    print(f"núcleos: {os.cpu_count()}, GIL: {'sim' if gil_ativo() else 'não'}")
+    print(f"{'tokens':>8} {'sequência (ms)':>15} {'threads (ms)':>13} {'processos (ms)':>15}")
+    try:
+        for n in tamanhos:
+            tokens = analisador_lexico_buffer(gerar_programa(n), [])
+
+            def sequencia():
+                parser.analisar(tokens, "desligado", [], exibir=False)
+                analisar_slr(tokens, grammar, tabelas_slr, "desligado", diagnosticos=[], exibir=False)
+
+            tempos = [mediana(sequencia)]
+            for analisador in analisadores.values():
+                tempos.append(mediana(lambda: analisador.analisar(tokens, "desligado", "desligado", False)))
+            print(f"{len(tokens.tipos):>8} " + " ".join(f"{t * 1000:>{w}.1f}" for t, w in zip(tempos, (15, 13, 15))))
+    finally:
+        for analisador in analisadores.values():
+            analisador.fechar()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
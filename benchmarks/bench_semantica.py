@@ -0,0 +1,135 @@
+# benchmarks/bench_semantica.py — Custo da análise semântica feita nas reduções do SLR (semantica.py)
+#
+# Uso: python -m benchmarks.bench_semantica [tokens ...]
+#
+# Primeiro a regressão: os CASOS dão exatamente os erros esperados, o
+# app.br só reclama de `escrever`, e nos programas gerados o rastro e os
+# diagnósticos sintáticos não mudam com a semântica ligada (com lista de
+# tuplas ou TokenBuffer). Depois compara o SLR sozinho, o SLR com a
+# semântica na mesma passada e, como referência de uma segunda passada,
+# o SLR montando a árvore seguido de um percurso dela (sem verificação
+# nenhuma: é o mínimo que uma travessia separada custaria).
+import sys
+import time
+
+from benchmarks.gerador import gerar_programa
+from arvore import ArvoreSintatica
+from cache_tabelas import obter_tabelas
+from grammar import grammar
+from scanner import analisador_lexico, analisador_lexico_buffer
+from semantica import AnalisadorSemantico
+from slr_parser import analisar_slr
+
+REPETICOES = 5
+TABELA = obter_tabelas(grammar).lr("slr")
+
+# (fonte, mensagens esperadas, na ordem)
+CASOS = [
+    ("principal { int x = 1; x = x + 2; }", []),
+    ("principal { x = 1; y = x; x = 2; }", ["variável 'x' não declarada", "variável 'y' não declarada"]),
+    ("principal { int x; real x; }", ["'x' já declarada neste escopo (linha 1)"]),
+    ("principal { int x; se (verdadeiro) { real x = 1; } }", []),
+    ("principal { se (verdadeiro) { int x; } x = 1; }", ["variável 'x' não declarada"]),
+    ("principal { para (int i = 0; i < 3; i = i + 1) { } i = 1; }", ["variável 'i' não declarada"]),
+    ("funcao int f(int a) { retornar f(a - 1); } principal { int x = f(1); }", []),
+    ("funcao int f(int a, real b) { retornar a; } principal { int x = f(1); }",
+     ["'f' espera 2 argumento(s), recebeu 1"]),
+    ("funcao int f(int a) { retornar a; } principal { int x = f(\"a\"); }", ["argumento 1 de 'f' deve ser int, não cadeia"]),
+    ("funcao real f(int a) { retornar a; } principal { real r = f(1); }", []),
+    ("funcao int f(int a) { int a; retornar a; } principal { }", ["'a' já declarada neste escopo (linha 1)"]),
+    ("funcao int f() { retornar 1; } funcao int f() { retornar 2; } principal { }",
+     ["função 'f' já declarada (linha 1)"]),
+    ("funcao int f() { retornar \"a\"; } principal { }", ["função 'f' retorna int, não cadeia"]),
+    ("funcao vazio f() { retornar 1; } principal { int x = f(); }",
+     ["função 'f' é vazio e não retorna valor", "'x' é int, inicializada com vazio"]),
+    ("principal { g(1); }", ["função 'g' não declarada"]),
+    ("principal { int x = 1 + 2.5; real r = 1 + 2.5; }", ["'x' é int, inicializada com real"]),
+    ("principal { cadeia s = \"a\" + \"b\"; s = s * s; }", ["'*' não se aplica a cadeia e cadeia"]),
+    ("principal { booleano b = 1 < 2 && 'a' == 'b'; b = 1 || b; }", ["'||' exige booleano, não int e booleano"]),
+    ("principal { enquanto (1) { } faca { } enquanto (!1); }",
+     ["condição do 'enquanto' deve ser booleano, não int", "'!' exige booleano, não int"]),
+    ("principal { vazio v; }", ["variável 'v' não pode ser do tipo vazio"]),
+    ("principal { int x = y + z * 2; }", ["variável 'y' não declarada", "variável 'z' não declarada"]),
+]
+
+
+def semantica(tokens, diagnosticos):
+    analise = AnalisadorSemantico()
+    _, rastro = analisar_slr(tokens, grammar, TABELA, "completo", diagnosticos=diagnosticos, exibir=False,
+                             semantica=analise)
+    return rastro
+
+
+def regressao():
+    falhas = []
+    for fonte, esperado in CASOS:
+        diagnosticos = []
+        semantica(analisador_lexico_buffer(fonte, []), diagnosticos)
+        obtido = [d.mensagem for d in diagnosticos]
+        if obtido != esperado:
+            falhas.append(f"{fonte!r}: {obtido}")
+
+    with open("app.br", encoding="utf-8") as f:
+        diagnosticos = []
+        semantica(analisador_lexico_buffer(f.read(), []), diagnosticos)
+    if [d.mensagem for d in diagnosticos] != ["função 'escrever' não declarada"]:
+        falhas.append(f"app.br: {[d.mensagem for d in diagnosticos]}")
+
+    for semente in range(5):
+        for erros in (0, 3):
+            fonte = gerar_programa(3000, semente=semente, erros=erros)
+            tokens = analisador_lexico_buffer(fonte, [])
+            sem, com, lista = [], [], []
+            _, rastro = analisar_slr(tokens, grammar, TABELA, "completo", diagnosticos=sem, exibir=False)
+            if list(semantica(tokens, com)) != list(rastro):
+                falhas.append(f"programa {semente}/{erros} erros: rastro muda com a semântica")
+            if [d for d in com if d.etapa != "semantica"] != sem:
+                falhas.append(f"programa {semente}/{erros} erros: diagnósticos sintáticos mudam")
+            semantica(analisador_lexico(fonte, []), lista)
+            if lista != com:
+                falhas.append(f"programa {semente}/{erros} erros: lista de tuplas diverge do TokenBuffer")
+    return falhas
+
+
+def alternados(*funcoes):
+    # menor tempo de cada uma, rodando alternadas (menos sensível a ruído da máquina)
+    tempos = [[] for _ in funcoes]
+    for _ in range(REPETICOES):
+        for k, funcao in enumerate(funcoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos[k].append(time.perf_counter() - inicio)
+    return [min(t) for t in tempos]
+
+
+def arvore_e_percurso(tokens):
+    arvore = ArvoreSintatica()
+    analisar_slr(tokens, grammar, TABELA, "desligado", diagnosticos=[], exibir=False, arvore=arvore)
+    for _ in arvore.pos_ordem():
+        pass
+
+
+def main(argv):
+    falhas = regressao()
+    for falha in falhas:
+        print("FALHA", falha)
+    print(f"regressão: {len(CASOS)} casos + app.br + 5 programas x (0, 3 erros), {len(falhas)} falhas")
+
+    tamanhos = [int(x) for x in argv] or [10_000, 100_000]
+    print(f"{'tokens':>9} | {'SLR':>8} {'+ semântica':>11} {'árvore + percurso':>17} | {'erros sem.':>10}  (ms)")
+    for n in tamanhos:
+        tokens = analisador_lexico_buffer(gerar_programa(n), [])
+        analise = AnalisadorSemantico()
+        analisar_slr(tokens, grammar, TABELA, "desligado", diagnosticos=[], exibir=False, semantica=analise)
+        t_slr, t_sem, t_arv = alternados(
+            lambda: analisar_slr(tokens, grammar, TABELA, "desligado", diagnosticos=[], exibir=False),
+            lambda: analisar_slr(tokens, grammar, TABELA, "desligado", diagnosticos=[], exibir=False,
+                                 semantica=AnalisadorSemantico()),
+            lambda: arvore_e_percurso(tokens))
+        print(f"{len(tokens.tipos):>9} | {t_slr * 1000:>8.1f} {t_sem * 1000:>11.1f} {t_arv * 1000:>17.1f} | "
+              f"{analise.erros:>10}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,139 @@
+# benchmarks/bench_tabela_lr.py — ACTION/GOTO em dicionários x TabelaLRCompilada (pente + reduções padrão)
+#
+# Uso: python -m benchmarks.bench_tabela_lr [tokens ...]
+#
+# Primeiro confere que a tabela compilada dá a mesma ação que os
+# dicionários em toda célula (erros inclusive) e o mesmo GOTO. Depois
+# compara tamanho em memória, tamanho serializado (pickle), tempo de
+# carga e o mesmo laço de análise (sem rastro) com cada formato.
+import pickle
+import statistics
+import sys
+import time
+
+from benchmarks.gerador import gerar_programa
+from grammar import analyze, grammar
+from scanner import TIPOS_TOKEN, analisador_lexico_buffer
+from slr_parser import CONSTRUTORES, Conversao, TabelaLRCompilada, analisar_slr
+
+REPETICOES = 5
+
+
+def mediana(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def alternados(*funcoes):
+    # menor tempo de cada uma, rodando alternadas (menos sensível a ruído da máquina)
+    tempos = [[] for _ in funcoes]
+    for _ in range(REPETICOES):
+        for k, funcao in enumerate(funcoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos[k].append(time.perf_counter() - inicio)
+    return [min(t) for t in tempos]
+
+
+def laco_dicionarios(tokens, acao, goto):
+    # mesmo laço do analisar_slr anterior (sem rastro nem modo pânico)
+    tipos, nomes = tokens.tipos, TIPOS_TOKEN
+    pilha = (0, None)
+    pos = 0
+    simbolo = nomes[tipos[pos]]
+    while True:
+        act = acao.get((pilha[0], simbolo))
+        if not act:
+            return False
+        tipo, valor = act
+        if tipo == "shift":
+            pilha = (valor, pilha)
+            pos += 1
+            simbolo = nomes[tipos[pos]]
+        elif tipo == "reduce":
+            A, prod = valor
+            for _ in prod:
+                pilha = pilha[1]
+            pilha = (goto[(pilha[0], A)], pilha)
+        else:
+            return True
+
+
+def laco_compactada(tokens, tabela):
+    # o mesmo laço, com as consultas do analisar_slr atual
+    colunas = tabela.colunas(TIPOS_TOKEN)
+    tipos = tokens.tipos
+    base, valores, verificacao = list(tabela.base), list(tabela.valores), list(tabela.verificacao)
+    padrao, lookaheads = list(tabela.padrao), list(tabela.lookaheads)
+    cabecas, tamanhos = list(tabela.cabecas), list(tabela.tamanhos)
+    aceitar = -tabela.aceitar - 1
+    pilha = (0, None)
+    pos = 0
+    coluna = colunas[tipos[pos]]
+    while True:
+        estado = pilha[0]
+        k = base[estado] + coluna
+        if verificacao[k] == estado:
+            codigo = valores[k]
+        elif lookaheads[estado] >> coluna & 1:
+            codigo = padrao[estado]
+        else:
+            return False
+        if codigo > 0:
+            pilha = (codigo - 1, pilha)
+            pos += 1
+            coluna = colunas[tipos[pos]]
+        elif codigo == aceitar:
+            return True
+        else:
+            producao = -codigo - 1
+            for _ in range(tamanhos[producao]):
+                pilha = pilha[1]
+            pilha = (valores[base[pilha[0]] + cabecas[producao]], pilha)
+
+
+def conferir(tabela, acao, goto):
+    for e in range(tabela.n_estados):
+        for x in range(tabela.n_colunas):
+            esperado = acao.get((e, tabela.simbolos[x]))
+            codigo = tabela.acao(e, x)
+            if (tabela.decodificar(codigo) if codigo else None) != esperado:
+                raise SystemExit(f"ACTION diverge em ({e}, {tabela.simbolos[x]})")
+    if sorted(tabela.transicoes()) != sorted((e, A, j) for (e, A), j in goto.items()):
+        raise SystemExit("GOTO diverge")
+
+
+def main(argv):
+    tamanhos = [int(x) for x in argv] or [10_000, 100_000]
+    G = Conversao(grammar)
+    analise = analyze(grammar, next(iter(grammar)))
+    fontes = {n: analisador_lexico_buffer(gerar_programa(n), []) for n in tamanhos}
+
+    for metodo in ("slr", "lalr"):
+        acao, goto, _ = CONSTRUTORES[metodo](G, analise)
+        tabela = TabelaLRCompilada(G, acao, goto)
+        conferir(tabela, acao, goto)
+        t = tabela.tamanho()
+        serial_dic, serial_tab = pickle.dumps((acao, goto), 5), pickle.dumps(tabela, 5)
+        print(f"\n{metodo.upper()}: {t['estados']} estados, {t['entradas_acao']} ACTION + {t['entradas_goto']} GOTO, "
+              f"{t['reducoes_padrao']} viraram redução padrão")
+        print(f"  células: {t['celulas_densas']} na matriz densa, {t['celulas_pente']} no pente")
+        print(f"  memória: {t['bytes_dicionarios']:,} B em dicionários -> {t['bytes_compactada']:,} B compactada")
+        print(f"  pickle:  {len(serial_dic):,} B -> {len(serial_tab):,} B; carga "
+              f"{mediana(lambda: pickle.loads(serial_dic)) * 1e6:.0f} µs -> "
+              f"{mediana(lambda: pickle.loads(serial_tab)) * 1e6:.0f} µs")
+        for n, tokens in fontes.items():
+            t_dic, t_tab, t_slr = alternados(
+                lambda: laco_dicionarios(tokens, acao, goto),
+                lambda: laco_compactada(tokens, tabela),
+                lambda: analisar_slr(tokens, grammar, tabela, "desligado", diagnosticos=[], exibir=False))
+            print(f"  {len(tokens.tipos):>8} tokens: laço com dicionários {t_dic * 1000:.1f} ms, "
+                  f"com a compactada {t_tab * 1000:.1f} ms ({t_dic / t_tab:.2f}x); analisar_slr {t_slr * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,256 @@
+# benchmarks/executar.py — Mede cada etapa do compilador em programas sintéticos
+#
+# Uso: python -m benchmarks.executar [--tamanhos 1000 10000 100000] [--salvar base.json]
+#                                    [--comparar base.json] [--tolerancia 0.20]
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.gerador import gerar_programa
+from exportadores import EXPORTADORES, exportar
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from rastro import Rastro
+from scanner import analisador_lexico_buffer
+from slr_parser import ConstrucaoTabelaLALR, ConstrucaoTabelaSLR, Conversao, analisar_slr, itens_lr0
+
+VERSAO_FORMATO = 1
+
+
+class RastroContagem(Rastro):
+    """Rastro que só conta os passos (usado fora da medição de tempo)."""
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+        self.registrar = self._contar
+
+    def _contar(self, evento):
+        self.total += 1
+
+    def __len__(self):
+        return self.total
+
+
+def medir(funcao, repeticoes=3, memoria=True):
+    """
+    Melhor tempo de `repeticoes` execuções e, se `memoria`, o pico de
+    memória alocada (tracemalloc) em uma execução extra, fora da medição.
+    Devolve (tempo, pico em bytes ou None, resultado da última execução).
+    """
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return melhor, pico, resultado
+
+
+def _etapa(tempo, pico, **extras):
+    etapa = {"tempo": tempo, "pico_memoria": pico}
+    etapa.update(extras)
+    return etapa
+
+
+def medir_tabelas(repeticoes, memoria):
+    """
+    Construção das tabelas a partir da gramática (sem o cache em disco).
+    Cada execução usa uma cópia da gramática para não reaproveitar FIRST/FOLLOW.
+    """
+    convertida = Conversao(grammar)
+    medidas = {
+        "tabela_ll1": lambda: AnalisadorSintaticoLL1(dict(grammar)),
+        "lr0": lambda: itens_lr0(dict(convertida)),
+        "slr": lambda: ConstrucaoTabelaSLR(dict(convertida)),
+        "lalr": lambda: ConstrucaoTabelaLALR(dict(convertida)),
+    }
+    resultado = {}
+    for nome, funcao in medidas.items():
+        tempo, pico, _ = medir(funcao, repeticoes, memoria)
+        resultado[nome] = _etapa(tempo, pico)
+    return resultado
+
+
+def medir_tamanho(tokens_alvo, parser, tabelas_lr, opcoes):
+    """
+    Lexico, LL(1), SLR(1) e relatórios (PDF só até `pdf_ate` tokens) de um programa gerado.
+    """
+    texto = gerar_programa(tokens_alvo, opcoes.profundidade, opcoes.erros, opcoes.semente)
+    repeticoes, memoria = opcoes.repeticoes, not opcoes.sem_memoria
+    etapas = {}
+
+    tempo, pico, tokens = medir(lambda: analisador_lexico_buffer(texto, []), repeticoes, memoria)
+    n = len(tokens)
+    etapas["lexico"] = _etapa(tempo, pico, tokens_por_s=n / tempo)
+
+    contagem = RastroContagem()
+    parser.analisar(tokens, contagem, [], exibir=False)
+    tempo, pico, _ = medir(lambda: parser.analisar(tokens, "desligado", [], exibir=False), repeticoes, memoria)
+    etapas["ll1"] = _etapa(tempo, pico, tokens_por_s=n / tempo, passos=len(contagem),
+                           passos_por_s=len(contagem) / tempo)
+
+    contagem = RastroContagem()
+    analisar_slr(tokens, grammar, tabelas_lr, contagem, diagnosticos=[], exibir=False)
+    tempo, pico, _ = medir(lambda: analisar_slr(tokens, grammar, tabelas_lr, "desligado",
+                                                diagnosticos=[], exibir=False), repeticoes, memoria)
+    etapas["slr"] = _etapa(tempo, pico, tokens_por_s=n / tempo, passos=len(contagem),
+                           passos_por_s=len(contagem) / tempo)
+
+    etapas.update(_medir_relatorios(tokens, parser, tabelas_lr, repeticoes, memoria, n, n <= opcoes.pdf_ate))
+
+    return {"tokens": n, "caracteres": len(texto), "etapas": etapas}
+
+
+def _medir_relatorios(tokens, parser, tabelas_lr, repeticoes, memoria, n, com_pdf):
+    """
+    Cada exportador de exportadores.py sobre os mesmos passos (últimos 25,
+    como no main.py); o PDF só quando `com_pdf` e o fpdf2 está instalado.
+    """
+    passos_ll1 = parser.analisar(tokens, "anel", [], exibir=False)
+    G, passos_slr = analisar_slr(tokens, grammar, tabelas_lr, "anel", diagnosticos=[], exibir=False)
+    etapas = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        raiz = os.path.join(pasta, "relatorio")
+        for formato in EXPORTADORES:
+            if formato == "pdf" and not com_pdf:
+                continue
+
+            def gerar():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    exportar(formato, tokens, passos_ll1, passos_slr, G, raiz)
+
+            try:
+                tempo, pico, _ = medir(gerar, repeticoes, memoria)
+            except ImportError:
+                continue
+            etapas[formato] = _etapa(tempo, pico, tokens_por_s=n / tempo)
+    return etapas
+
+
+def _commit():
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def executar(opcoes):
+    parser = AnalisadorSintaticoLL1(grammar)
+    tabelas_lr = ConstrucaoTabelaSLR(Conversao(grammar))[:2]
+
+    relatorio = {
+        "versao": VERSAO_FORMATO,
+        "meta": {
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "commit": _commit(),
+            "profundidade": opcoes.profundidade,
+            "erros": opcoes.erros,
+            "semente": opcoes.semente,
+        },
+        "tabelas": medir_tabelas(opcoes.repeticoes, not opcoes.sem_memoria),
+        "tamanhos": {},
+    }
+    for tamanho in opcoes.tamanhos:
+        relatorio["tamanhos"][str(tamanho)] = medir_tamanho(tamanho, parser, tabelas_lr, opcoes)
+    return relatorio
+
+
+def _mb(pico):
+    return "-" if pico is None else f"{pico / 2 ** 20:.1f}"
+
+
+def imprimir(relatorio):
+    print(f"{'tabelas':>10} {'tempo (ms)':>11} {'pico (MB)':>10}")
+    for nome, etapa in relatorio["tabelas"].items():
+        print(f"{nome:>10} {etapa['tempo'] * 1000:>11.2f} {_mb(etapa['pico_memoria']):>10}")
+
+    print(f"\n{'tokens':>9} {'etapa':>7} {'tempo (s)':>10} {'tokens/s':>12} {'passos/s':>12} {'pico (MB)':>10}")
+    for medida in relatorio["tamanhos"].values():
+        for nome, etapa in medida["etapas"].items():
+            if etapa is None:
+                continue
+            passos = f"{etapa['passos_por_s']:,.0f}" if "passos_por_s" in etapa else "-"
+            print(f"{medida['tokens']:>9} {nome:>7} {etapa['tempo']:>10.4f} {etapa['tokens_por_s']:>12,.0f} "
+                  f"{passos:>12} {_mb(etapa['pico_memoria']):>10}")
+
+
+def comparar(atual, base, tolerancia):
+    """
+    Compara os tempos com uma linha de base salva. Devolve as regressões
+    (etapas mais lentas que base * (1 + tolerancia)).
+    """
+    pares = []
+    for nome, etapa in atual["tabelas"].items():
+        anterior = base.get("tabelas", {}).get(nome)
+        if anterior:
+            pares.append((f"tabelas/{nome}", anterior["tempo"], etapa["tempo"]))
+    for tamanho, medida in atual["tamanhos"].items():
+        anteriores = base.get("tamanhos", {}).get(tamanho, {}).get("etapas", {})
+        for nome, etapa in medida["etapas"].items():
+            if etapa and anteriores.get(nome):
+                pares.append((f"{tamanho}/{nome}", anteriores[nome]["tempo"], etapa["tempo"]))
+
+    regressoes = []
+    print(f"\ncomparação com {base['meta'].get('commit') or 'linha de base'} (tolerância {tolerancia:.0%})")
+    for chave, antes, agora in pares:
+        razao = agora / antes if antes else float("inf")
+        marca = ""
+        if razao > 1 + tolerancia:
+            marca = "  <-- regressão"
+            regressoes.append(chave)
+        print(f"{chave:>22} {antes:>10.4f} -> {agora:>10.4f}  x{razao:.2f}{marca}")
+    return regressoes
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Mede as etapas do compilador Brick.")
+    args.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000],
+                      help="tamanhos dos programas gerados, em tokens")
+    args.add_argument("--profundidade", type=int, default=4, help="aninhamento máximo de blocos")
+    args.add_argument("--erros", type=int, default=0, help="mutações por programa (entradas inválidas)")
+    args.add_argument("--semente", type=int, default=0)
+    args.add_argument("--repeticoes", type=int, default=5)
+    args.add_argument("--pdf-ate", type=int, default=2000, help="gera PDF só até este número de tokens")
+    args.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória")
+    args.add_argument("--salvar", help="grava o resultado em JSON (linha de base)")
+    args.add_argument("--comparar", help="linha de base JSON para detectar regressões")
+    args.add_argument("--tolerancia", type=float, default=0.20)
+    opcoes = args.parse_args(argv)
+
+    relatorio = executar(opcoes)
+    imprimir(relatorio)
+
+    if opcoes.salvar:
+        with open(opcoes.salvar, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    if opcoes.comparar:
+        with open(opcoes.comparar, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        if comparar(relatorio, base, opcoes.tolerancia):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# benchmarks/gerador.py — Gerador de programas Brick sintéticos guiado pela gramática
+#
+# Uso: python -m benchmarks.gerador <tokens> [saida.br] [--profundidade N] [--erros K] [--semente S]
+import argparse
+import random
+import sys
+
+from grammar import EPS, grammar
+
+# Lexemas sorteados para cada terminal. Os identificadores não começam com
+# uma palavra-chave: assim o scanner anterior (benchmarks/bench_lexico.py),
+# que partia "senha" em SE + IDENT, dá os mesmos tokens que o atual.
+LEXEMAS = {
+    "PRINCIPAL": ["principal"],
+    "FUNCAO": ["funcao"],
+    "TIPO_VAR": ["int", "real", "cadeia", "car", "booleano"],
+    "SENAO": ["senao"],
+    "SE": ["se"],
+    "ENQUANTO": ["enquanto"],
+    "FACA": ["faca"],
+    "PARA": ["para"],
+    "RETORNO": ["retornar"],
+    "BOOLEANO": ["verdadeiro", "falso"],
+    "NUMERO_REAL": ["0.5", "3.14", "10.0", "2.75"],
+    "NUMERO_INT": ["0", "1", "2", "10", "42", "100"],
+    "CARACTERE": ["'a'", "'z'", "'0'"],
+    "PALAVRA": ['"ok"', '"Resultado: "', '"texto"'],
+    "IDENT": ["x", "y", "z", "total", "k", "w2", "xs", "yy_1", "m", "nome"],
+    "COMPAR": ["<", ">", "<=", ">=", "==", "!="],
+    "OPER_ARIT": ["+", "-", "*", "/", "%"],
+    "OPER_LOGI_UN": ["!"],
+    "OPER_LOGI_BIN": ["&&", "||"],
+    "ATRIB": ["="],
+    "LPAREN": ["("],
+    "RPAREN": [")"],
+    "LCHAVE": ["{"],
+    "RCHAVE": ["}"],
+    "VIRGULA": [","],
+    "PONTOVIRG": [";"],
+}
+
+
+def menores_derivacoes(G):
+    """
+    Para cada não-terminal, o menor número de tokens que ele deriva e a
+    produção que atinge esse mínimo (ponto fixo).
+    """
+    infinito = float("inf")
+    minimo = {A: infinito for A in G}
+    escolha = {}
+    mudou = True
+    while mudou:
+        mudou = False
+        for A, producoes in G.items():
+            for producao in producoes:
+                custo = sum(minimo.get(X, 1) for X in producao if X != EPS)
+                if custo < minimo[A]:
+                    minimo[A] = custo
+                    escolha[A] = producao
+                    mudou = True
+    return minimo, escolha
+
+
+class GeradorBrick:
+    """
+    Gera sequências de tipos de token derivadas da gramática.
+
+    Cada trecho é uma derivação mais à esquerda a partir de um não-terminal,
+    com produções sorteadas. Quando o orçamento de tokens do trecho acaba,
+    só se escolhem as produções mínimas, o que fecha a derivação. Produções
+    que abrem um bloco (`abre`) ficam de fora quando o aninhamento já está
+    em `profundidade`.
+    """
+
+    def __init__(self, G=grammar, semente=0, profundidade=4, abre="LCHAVE", fecha="RCHAVE"):
+        self.G = G
+        self.sorteio = random.Random(semente)
+        self.profundidade = profundidade
+        self.abre = abre
+        self.fecha = fecha
+        self.minimo, self.escolha = menores_derivacoes(G)
+
+    def derivar(self, simbolo, orcamento, nivel=0):
+        """
+        Tipos de token de uma derivação de `simbolo` com cerca de `orcamento` tokens.
+        """
+        G, minimo, escolha = self.G, self.minimo, self.escolha
+        sorteio = self.sorteio
+        saida = []
+        pilha = [simbolo]
+        # tokens mínimos ainda devidos pelos símbolos da pilha
+        pendente = minimo.get(simbolo, 1)
+
+        while pilha:
+            X = pilha.pop()
+            if X not in G:
+                pendente -= 1
+                saida.append(X)
+                if X == self.abre:
+                    nivel += 1
+                elif X == self.fecha:
+                    nivel -= 1
+                continue
+
+            pendente -= minimo[X]
+            if len(saida) + pendente + minimo[X] >= orcamento:
+                producao = escolha[X]
+            else:
+                candidatas = G[X]
+                if nivel >= self.profundidade:
+                    candidatas = [p for p in candidatas if self.abre not in p] or [escolha[X]]
+                producao = sorteio.choice(candidatas)
+
+            for Y in reversed(producao):
+                if Y != EPS:
+                    pilha.append(Y)
+                    pendente += minimo.get(Y, 1)
+        return saida
+
+    def programa(self, tokens, funcoes=None, erros=0):
+        """
+        Tipos de token de um programa com cerca de `tokens` tokens: algumas
+        funções e o bloco principal cheio de comandos, cada trecho derivado
+        da gramática. Com `erros` > 0, aplica essa quantidade de mutações
+        (remoção, inserção ou troca de um token) e o programa deixa de ser válido.
+        """
+        sorteio = self.sorteio
+        if funcoes is None:
+            funcoes = max(1, min(50, tokens // 2000))
+
+        saida = []
+        for _ in range(funcoes):
+            saida += self._funcao(max(20, tokens // (10 * funcoes)))
+
+        saida += ["PRINCIPAL", "LCHAVE"]
+        while len(saida) < tokens - 1:
+            saida += self.derivar("COMANDO_G", sorteio.randint(4, 80), nivel=1)
+        saida.append("RCHAVE")
+
+        terminais = [t for t in LEXEMAS if t not in ("PRINCIPAL", "FUNCAO")]
+        for _ in range(erros):
+            i = sorteio.randrange(len(saida))
+            operacao = sorteio.random()
+            if operacao < 1 / 3:
+                del saida[i]
+            elif operacao < 2 / 3:
+                saida.insert(i, sorteio.choice(terminais))
+            else:
+                saida[i] = sorteio.choice(terminais)
+        return saida
+
+    def _funcao(self, orcamento):
+        # DECL_FUNCOES_G é recursiva à direita: gera uma função por vez
+        cabecalho = ["FUNCAO", "TIPO_VAR", "IDENT", "LPAREN"]
+        corpo = self.derivar("PARAMS_G", 8) + ["RPAREN", "LCHAVE"]
+        corpo += self.derivar("COMANDOS_G", orcamento, nivel=1)
+        return cabecalho + corpo + ["RCHAVE"]
+
+    def texto(self, tipos):
+        """
+        Fonte Brick para a sequência de tipos: lexemas sorteados, quebra
+        de linha depois de ';', '{' e '}' e indentação pelo aninhamento.
+        """
+        sorteio = self.sorteio
+        partes = []
+        nivel = 0
+        inicio_linha = True
+        for tipo in tipos:
+            if tipo == self.fecha:
+                nivel = max(0, nivel - 1)
+            if inicio_linha:
+                partes.append("    " * nivel)
+            else:
+                partes.append(" ")
+            partes.append(sorteio.choice(LEXEMAS[tipo]))
+            inicio_linha = tipo in ("PONTOVIRG", "LCHAVE", "RCHAVE")
+            if inicio_linha:
+                partes.append("\n")
+            if tipo == self.abre:
+                nivel += 1
+        return "".join(partes)
+
+
+def gerar_programa(tokens, profundidade=4, erros=0, semente=0):
+    """
+    Texto de um programa Brick sintético com cerca de `tokens` tokens.
+    """
+    gerador = GeradorBrick(semente=semente, profundidade=profundidade)
+    return gerador.texto(gerador.programa(tokens, erros=erros))
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Gera um programa Brick sintético.")
+    args.add_argument("tokens", type=int, help="tamanho aproximado em tokens")
+    args.add_argument("saida", nargs="?", help="arquivo .br (padrão: saída padrão)")
+    args.add_argument("--profundidade", type=int, default=4, help="aninhamento máximo de blocos")
+    args.add_argument("--erros", type=int, default=0, help="mutações para gerar um programa inválido")
+    args.add_argument("--semente", type=int, default=0)
+    opcoes = args.parse_args(argv)
+
+    texto = gerar_programa(opcoes.tokens, opcoes.profundidade, opcoes.erros, opcoes.semente)
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as f:
+            f.write(texto)
+    else:
+        sys.stdout.write(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# benchmarks/gramaticas.py — Gramáticas sintéticas maiores que a do Brick
+
+
+def replicar_gramatica(G, copias):
+    """
+    Junta `copias` cópias independentes de G sob um novo símbolo inicial.
+
+    Cada cópia recebe não-terminais com sufixo _<i> e é escolhida por um
+    terminal próprio (SEL_<i>), então o autômato LR(0) e as tabelas crescem
+    de forma aproximadamente linear com o número de cópias.
+    """
+    inicial = next(iter(G))
+    nova = {"INICIO": [[f"SEL_{i}", f"{inicial}_{i}"] for i in range(copias)]}
+
+    for i in range(copias):
+        for A, producoes in G.items():
+            nova[f"{A}_{i}"] = [
+                [f"{X}_{i}" if X in G else X for X in prod]
+                for prod in producoes
+            ]
+    return nova
@@ -0,0 +1,144 @@
+# cache_tabelas.py — Cache em disco das tabelas LL(1), SLR(1) e LALR(1)
+import glob
+import os
+import pickle
+import zlib
+from collections import namedtuple
+
+from grammar import analyze, grammar_hash
+
+# Aumente sempre que o formato das tabelas mudar: invalida caches antigos.
+VERSAO_TABELAS = 3
+
+# Um arquivo por gramática (brick.tabelas.<hash>.cache): a original e a
+# otimizada (main.py --otimizar) não sobrescrevem o cache uma da outra.
+# Só os CACHES_MANTIDOS gravados por último ficam no diretório.
+DIRETORIO_CACHE = os.path.dirname(os.path.abspath(__file__))
+CACHES_MANTIDOS = 4
+
+_ASSINATURA = b"BRICKTAB"
+
+# ll1: {(nao_terminal, terminal): producao}
+# slr / lalr: ACTION e GOTO compactadas (slr_parser.TabelaLRCompilada); o
+# GOTO é o mesmo nas duas, vem do mesmo autômato LR(0)
+class Tabelas(namedtuple("Tabelas", ["ll1", "slr", "lalr"])):
+    __slots__ = ()
+
+    def lr(self, metodo="slr"):
+        """
+        Tabela LR no formato aceito por analisar_slr(tabelas=...).
+        """
+        return self.lalr if metodo == "lalr" else self.slr
+
+
+def chave_cache(G):
+    """
+    Chave do cache: hash do conteúdo da gramática + versão do formato.
+    """
+    return f"{VERSAO_TABELAS}:{grammar_hash(G)}".encode("ascii")
+
+
+def caminho_cache(G, diretorio=None):
+    """
+    Arquivo de cache da gramática no `diretorio` (padrão: DIRETORIO_CACHE).
+    """
+    return os.path.join(diretorio or DIRETORIO_CACHE, f"brick.tabelas.{grammar_hash(G)[:16]}.cache")
+
+
+def _podar(diretorio):
+    # apaga os caches mais antigos (por data de gravação) além dos CACHES_MANTIDOS
+    arquivos = []
+    for caminho in glob.glob(os.path.join(glob.escape(diretorio), "brick.tabelas.*.cache")):
+        try:
+            arquivos.append((os.path.getmtime(caminho), caminho))
+        except OSError:
+            pass
+    for _, caminho in sorted(arquivos, reverse=True)[CACHES_MANTIDOS:]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+def construir_tabelas(G):
+    """
+    Constrói as tabelas LL(1), SLR(1) e LALR(1) da gramática, sem usar o cache.
+    """
+    from ll1_parser import AnalisadorSintaticoLL1
+    from slr_parser import ConstrucaoTabelaLALR, ConstrucaoTabelaSLR, Conversao, TabelaLRCompilada, itens_lr0
+
+    inicial = next(iter(G))
+    analise = analyze(G, inicial)
+    convertida = Conversao(G)
+    ll1 = AnalisadorSintaticoLL1(G).analiseTabela
+    # SLR e LALR partem do mesmo autômato LR(0): constrói uma vez só
+    lr0 = itens_lr0(convertida)
+    acao, goto, _ = ConstrucaoTabelaSLR(convertida, analise, lr0=lr0)
+    acao_lalr, _, _ = ConstrucaoTabelaLALR(convertida, analise, lr0=lr0)
+    return Tabelas(ll1, TabelaLRCompilada(convertida, acao, goto), TabelaLRCompilada(convertida, acao_lalr, goto))
+
+
+def carregar_cache(G, caminho=None):
+    """
+    Lê as tabelas do arquivo de cache (padrão: caminho_cache(G)).
+    Devolve None se o arquivo não existir, for de outra gramática/versão
+    ou estiver corrompido.
+    """
+    try:
+        with open(caminho or caminho_cache(G), "rb") as f:
+            dados = f.read()
+    except OSError:
+        return None
+
+    chave = chave_cache(G)
+    cabecalho = _ASSINATURA + chave + b"\n"
+    if not dados.startswith(cabecalho):
+        return None
+
+    try:
+        # o zlib confere o checksum (adler32) do conteúdo
+        return Tabelas(*pickle.loads(zlib.decompress(dados[len(cabecalho):])))
+    except Exception:
+        return None
+
+
+def salvar_cache(G, tabelas, caminho=None):
+    """
+    Grava as tabelas no cache de forma atômica (arquivo temporário + rename).
+    Sem `caminho`, grava em caminho_cache(G) e poda os caches antigos.
+    """
+    padrao = caminho is None
+    if padrao:
+        caminho = caminho_cache(G)
+    cabecalho = _ASSINATURA + chave_cache(G) + b"\n"
+    corpo = zlib.compress(pickle.dumps(tuple(tabelas), protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "wb") as f:
+            f.write(cabecalho + corpo)
+        os.replace(temporario, caminho)
+        if padrao:
+            _podar(os.path.dirname(caminho))
+    except OSError:
+        # sem permissão de escrita: segue sem cache
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+
+def obter_tabelas(G, caminho=None, usar_cache=True):
+    """
+    Tabelas LL(1), SLR(1) e LALR(1) da gramática: carregadas do cache quando ele
+    é válido, ou construídas e gravadas quando está ausente ou desatualizado.
+    """
+    if usar_cache:
+        tabelas = carregar_cache(G, caminho)
+        if tabelas is not None:
+            return tabelas
+
+    tabelas = construir_tabelas(G)
+    if usar_cache:
+        salvar_cache(G, tabelas, caminho)
+    return tabelas
@@ -0,0 +1,141 @@
+# cliente.py — Cliente do servidor de compilação (servidor.py)
+#
+# Uso: python cliente.py arquivo.br [...] [--socket CAMINHO] [--metodo slr|lalr]
+#                        [--rastro anel|completo] [--tokens] [--json]
+#      python cliente.py --ping | --encerrar
+#
+# Só usa a biblioteca padrão: não importa o compilador, então inicia rápido.
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# mesmo caminho padrão do servidor.py
+SOCKET_PADRAO = os.path.join(tempfile.gettempdir(), f"brick-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+
+
+class ClienteCompilacao:
+    """
+    Conexão JSON-RPC (enquadramento do LSP) com o servidor por socket Unix.
+    `enviar` não espera a resposta: várias requisições seguem em sequência
+    e `receber` devolve as respostas pela ordem de chegada.
+    """
+
+    def __init__(self, caminho=SOCKET_PADRAO):
+        self.conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.conexao.connect(caminho)
+        self.leitor = self.conexao.makefile("rb")
+        self.proximo_id = 0
+
+    def enviar(self, metodo, params=None):
+        self.proximo_id += 1
+        corpo = json.dumps({"jsonrpc": "2.0", "id": self.proximo_id, "method": metodo,
+                            "params": params or {}}, ensure_ascii=False).encode("utf-8")
+        self.conexao.sendall(b"Content-Length: %d\r\n\r\n" % len(corpo) + corpo)
+        return self.proximo_id
+
+    def receber(self):
+        tamanho = None
+        while True:
+            linha = self.leitor.readline()
+            if not linha:
+                raise ConnectionError("o servidor fechou a conexão")
+            linha = linha.strip()
+            if not linha:
+                if tamanho is None:
+                    continue
+                break
+            nome, _, valor = linha.decode("ascii", "replace").partition(":")
+            if nome.strip().lower() == "content-length":
+                tamanho = int(valor)
+        return json.loads(self.leitor.read(tamanho))
+
+    def chamar(self, metodo, params=None):
+        """
+        Requisição única: devolve o "result" ou levanta RuntimeError com o erro.
+        """
+        identificador = self.enviar(metodo, params)
+        while True:
+            resposta = self.receber()
+            if resposta.get("id") == identificador:
+                break
+        if "error" in resposta:
+            raise RuntimeError(resposta["error"]["message"])
+        return resposta["result"]
+
+    def fechar(self):
+        self.leitor.close()
+        self.conexao.close()
+
+
+def _imprimir(caminho, resultado):
+    aceito = resultado["ll1_aceito"] and resultado["lr_aceito"]
+    tempo = sum(resultado["tempos"].values()) * 1000
+    print(f"{'OK  ' if aceito else 'ERRO'} {caminho} ({tempo:.1f} ms no servidor)")
+    for d in resultado["diagnosticos"]:
+        print(f"     [{d['etapa']}] linha {d['linha']}: {d['mensagem']}")
+    for nome in ("passos_ll1", "passos_slr"):
+        for passo in resultado.get(nome, ()):
+            print(f"     {nome[7:]} " + " | ".join(map(str, passo)))
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Envia programas Brick ao servidor de compilação.")
+    args.add_argument("arquivos", nargs="*")
+    args.add_argument("--socket", default=SOCKET_PADRAO)
+    args.add_argument("--metodo", choices=["slr", "lalr"], default="slr")
+    args.add_argument("--rastro", choices=["desligado", "anel", "completo"], default="desligado")
+    args.add_argument("--tokens", action="store_true", help="pede também a lista de tokens")
+    args.add_argument("--json", action="store_true", help="imprime as respostas em JSON")
+    args.add_argument("--ping", action="store_true")
+    args.add_argument("--encerrar", action="store_true", help="pede ao servidor que termine")
+    opcoes = args.parse_args(argv)
+
+    try:
+        cliente = ClienteCompilacao(opcoes.socket)
+    except OSError as erro:
+        print(f"não foi possível conectar a {opcoes.socket}: {erro}", file=sys.stderr)
+        return 2
+
+    try:
+        if opcoes.ping:
+            print(cliente.chamar("ping"))
+
+        # todas as requisições vão de uma vez; as respostas chegam em qualquer ordem
+        pendentes = {}
+        for caminho in opcoes.arquivos:
+            with open(caminho, "r", encoding="utf-8") as f:
+                params = {"codigo": f.read(), "metodo": opcoes.metodo, "rastro": opcoes.rastro,
+                          "tokens": opcoes.tokens}
+            pendentes[cliente.enviar("analisar", params)] = caminho
+
+        respostas = {}
+        while len(respostas) < len(pendentes):
+            resposta = cliente.receber()
+            respostas[resposta.get("id")] = resposta
+
+        falhas = 0
+        for identificador, caminho in pendentes.items():
+            resposta = respostas[identificador]
+            if "error" in resposta:
+                falhas += 1
+                print(f"ERRO {caminho}: {resposta['error']['message']}", file=sys.stderr)
+                continue
+            resultado = resposta["result"]
+            falhas += not (resultado["ll1_aceito"] and resultado["lr_aceito"])
+            if opcoes.json:
+                print(json.dumps({"arquivo": caminho, **resultado}, ensure_ascii=False))
+            else:
+                _imprimir(caminho, resultado)
+
+        if opcoes.encerrar:
+            cliente.chamar("encerrar")
+    finally:
+        cliente.fechar()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# diagnosticos.py — Mensagens de erro coletadas pelas etapas do compilador
+from collections import namedtuple
+
+# etapa: "lexico", "ll1", "slr", ...; linha: linha do fonte (1 em diante)
+Diagnostico = namedtuple("Diagnostico", ["etapa", "linha", "mensagem"])
+
+
+def formatar(diagnostico):
+    return f"[{diagnostico.etapa}] linha {diagnostico.linha}: {diagnostico.mensagem}"
@@ -0,0 +1,118 @@
+# exportadores.py — Relatórios em JSON Lines, CSV e HTML (alternativas ao PDF)
+import csv
+import html
+import json
+import os
+
+# escrita em blocos grandes: os relatórios são gerados linha a linha
+BUFFER = 1 << 16
+
+COLUNAS_LL1 = ("passo", "pilha", "entrada", "acao")
+COLUNAS_SLR = ("passo", "estados", "simbolos", "entrada", "acao")
+
+# um codificador só: json.dumps com argumentos cria um novo a cada chamada
+_codificar = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _producoes(gram_convertida):
+    for cabeca, producoes in gram_convertida.items():
+        for corpo in producoes:
+            yield cabeca, [x for x in corpo if x != "ε"]
+
+
+def exportar_jsonl(tokens, passos_ll1, passos_slr, gram_convertida, caminho):
+    """
+    Um objeto JSON por linha, com "tipo" = token, producao, ll1 ou slr.
+    """
+    codificar = _codificar
+    with open(caminho, "w", encoding="utf-8", buffering=BUFFER) as f:
+        f.writelines(codificar({"tipo": "token", "token": tk[0], "lexema": tk[1], "linha": tk[2]}) + "\n"
+                     for tk in tokens)
+        f.writelines(codificar({"tipo": "producao", "cabeca": cabeca, "corpo": corpo}) + "\n"
+                     for cabeca, corpo in _producoes(gram_convertida))
+        for tipo, colunas, passos in (("ll1", COLUNAS_LL1, passos_ll1), ("slr", COLUNAS_SLR, passos_slr)):
+            f.writelines(codificar({"tipo": tipo, **dict(zip(colunas, p))}) + "\n" for p in passos)
+    return [caminho]
+
+
+def exportar_csv(tokens, passos_ll1, passos_slr, gram_convertida, caminho):
+    """
+    Um CSV por seção, ao lado de `caminho`: <raiz>_tokens.csv,
+    <raiz>_gramatica.csv, <raiz>_ll1.csv e <raiz>_slr.csv.
+    """
+    raiz = os.path.splitext(caminho)[0]
+    secoes = (
+        ("tokens", ("token", "lexema", "linha"), tokens),
+        ("gramatica", ("cabeca", "corpo"), ((c, " ".join(corpo) or "ε") for c, corpo in _producoes(gram_convertida))),
+        ("ll1", COLUNAS_LL1, passos_ll1),
+        ("slr", COLUNAS_SLR, passos_slr),
+    )
+    caminhos = []
+    for nome, colunas, linhas in secoes:
+        destino = f"{raiz}_{nome}.csv"
+        with open(destino, "w", encoding="utf-8", newline="", buffering=BUFFER) as f:
+            escritor = csv.writer(f)
+            escritor.writerow(colunas)
+            escritor.writerows(linhas)
+        caminhos.append(destino)
+    return caminhos
+
+
+_ESTILO = (
+    "body{font:13px system-ui,sans-serif;margin:1.5em}"
+    "table{border-collapse:collapse;margin-bottom:2em}"
+    "th,td{border:1px solid #bbb;padding:2px 6px;text-align:left;vertical-align:top}"
+    "th{background:#eee;position:sticky;top:0}"
+    "td{font-family:monospace}"
+)
+
+
+def _tabela_html(f, titulo, colunas, linhas):
+    escape = html.escape
+    f.write(f"<h2>{escape(titulo)}</h2>\n<table><tr>")
+    f.write("".join(f"<th>{escape(c)}</th>" for c in colunas))
+    f.write("</tr>\n")
+    f.writelines("<tr>" + "".join(f"<td>{escape(str(c))}</td>" for c in linha) + "</tr>\n" for linha in linhas)
+    f.write("</table>\n")
+
+
+def exportar_html(tokens, passos_ll1, passos_slr, gram_convertida, caminho):
+    """
+    Um único arquivo HTML, sem dependências externas (estilo embutido).
+    """
+    with open(caminho, "w", encoding="utf-8", buffering=BUFFER) as f:
+        f.write("<!DOCTYPE html>\n<html lang=\"pt-BR\"><head><meta charset=\"utf-8\">"
+                f"<title>Relatório do Compilador</title><style>{_ESTILO}</style></head><body>\n"
+                "<h1>Relatório do Compilador (LL(1) + SLR)</h1>\n")
+        _tabela_html(f, "Tabela de tokens", ("Tipo", "Lexema", "Linha"),
+                     ((tk[0], tk[1] or "", tk[2]) for tk in tokens))
+        _tabela_html(f, "Gramática convertida para LR(0)", ("Não-terminal", "Produção"),
+                     ((c, " ".join(corpo) or "ε") for c, corpo in _producoes(gram_convertida)))
+        _tabela_html(f, "Passos do LL(1)", ("Passo", "Pilha", "Entrada", "Ação"), passos_ll1)
+        _tabela_html(f, "Passos do SLR(1)", ("Passo", "Estados", "Símbolos", "Entrada", "Ação"), passos_slr)
+        f.write("</body></html>\n")
+    return [caminho]
+
+
+def exportar_pdf(tokens, passos_ll1, passos_slr, gram_convertida, caminho):
+    # fpdf2 e as fontes só são carregados quando o PDF é pedido
+    from pdf_exporter import gerar_pdf
+
+    return [gerar_pdf(tokens, passos_ll1, passos_slr, gram_convertida, caminho)]
+
+
+# formato -> (função, extensão padrão)
+EXPORTADORES = {
+    "jsonl": (exportar_jsonl, ".jsonl"),
+    "csv": (exportar_csv, ".csv"),
+    "html": (exportar_html, ".html"),
+    "pdf": (exportar_pdf, ".pdf"),
+}
+
+
+def exportar(formato, tokens, passos_ll1, passos_slr, gram_convertida, raiz="relatorio_compilador"):
+    """
+    Gera o relatório no `formato` em <raiz><extensão> e devolve os arquivos escritos.
+    """
+    funcao, extensao = EXPORTADORES[formato]
+    return funcao(tokens, passos_ll1, passos_slr, gram_convertida, raiz + extensao)
@@ -0,0 +1,511 @@
+# gerador_descendente.py — Gera da gramática um analisador descendente recursivo (uma função por não-terminal)
+#
+# Uso: python gerador_descendente.py [--saida arquivo.py]
+#
+# O módulo gerado faz o mesmo que AnalisadorSintaticoLL1.analisar (mesmos
+# eventos de rastro, mesmos diagnósticos, mesmo modo pânico), mas sem
+# interpretar a tabela: cada não-terminal vira uma função que escolhe a
+# produção testando o token contra os conjuntos da tabela LL(1) (FIRST
+# da produção, mais o FOLLOW quando ela é anulável) e casa os terminais
+# em linha. Recursão à direita na última posição (listas) vira laço.
+# Aninhamento mais fundo que a pilha do Python (expressões com milhares
+# de parênteses) não é erro: a análise é refeita pela tabela.
+#
+# Um módulo por gramática (brick_descendente_<hash>.py, como o cache das
+# tabelas): a original e a otimizada (main.py --otimizar) não regeram o
+# módulo uma da outra. Só os MODULOS_MANTIDOS gravados por último ficam.
+import argparse
+import glob
+import importlib.util
+import keyword
+import os
+import re
+import sys
+import types
+
+from cache_tabelas import obter_tabelas
+from grammar import grammar, grammar_hash
+from ll1_parser import (CASAR, DESCARTE, DESCARTE_ESGOTADO, ERRO, ERRO_TERMINAL, EXPANDIR, RECUPERADO,
+                        AnalisadorSintaticoLL1)
+
+# Aumente sempre que o código gerado mudar: invalida módulos antigos.
+VERSAO_GERADOR = 3
+
+DIRETORIO_DESCENDENTE = os.path.dirname(os.path.abspath(__file__))
+MODULOS_MANTIDOS = 4
+
+
+def chave_descendente(G):
+    """
+    Chave gravada no cabeçalho do módulo: versão do gerador + hash da gramática.
+    """
+    return f"{VERSAO_GERADOR}:{grammar_hash(G)}"
+
+
+def caminho_descendente(G, diretorio=None):
+    """
+    Arquivo do módulo gerado da gramática no `diretorio` (padrão: DIRETORIO_DESCENDENTE).
+    """
+    return os.path.join(diretorio or DIRETORIO_DESCENDENTE, f"brick_descendente_{grammar_hash(G)[:16]}.py")
+
+
+def _podar(diretorio):
+    # apaga os módulos mais antigos (por data de gravação) além dos MODULOS_MANTIDOS
+    arquivos = []
+    for caminho in glob.glob(os.path.join(glob.escape(diretorio), "brick_descendente_*.py")):
+        try:
+            arquivos.append((os.path.getmtime(caminho), caminho))
+        except OSError:
+            pass
+    for _, caminho in sorted(arquivos, reverse=True)[MODULOS_MANTIDOS:]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+class _Codigo:
+    """
+    Linhas do módulo gerado. `restos` guarda, para cada linha que chama
+    uma função de não-terminal (ou o erro de terminal), os símbolos que
+    continuariam na pilha do LL(1) depois dela: quando a análise é
+    interrompida, a pilha final é remontada pelas linhas do traceback.
+    """
+
+    def __init__(self):
+        self.linhas = []
+        self.restos = {}
+
+    def __call__(self, nivel, texto, resto=None):
+        self.linhas.append("    " * nivel + texto)
+        if resto is not None:
+            self.restos[len(self.linhas)] = tuple(resto)
+
+
+def _nome_funcao(tab, nt):
+    nome = tab.simbolos[nt]
+    if nome.isidentifier() and not keyword.iskeyword(nome):
+        return f"nt_{nome}"
+    return f"nt_{nt - tab.n_colunas}_" + re.sub(r"\W", "_", nome)
+
+
+def _conjuntos(tab):
+    """
+    Terminais que escolhem cada produção, lidos das células da tabela
+    (assim conflitos resolvidos na tabela valem igual no código gerado).
+    """
+    conjuntos = [[] for _ in tab.producoes]
+    n_nt = len(tab.simbolos) - tab.n_colunas
+    for k in range(n_nt):
+        for terminal in range(tab.n_colunas):
+            regra = tab.celulas[k * tab.n_colunas + terminal]
+            if regra:
+                conjuntos[regra - 1].append(terminal)
+    return conjuntos
+
+
+def _condicao(conjunto):
+    if len(conjunto) == 1:
+        return f"ttoken == {conjunto[0]}"
+    return "ttoken in {" + ", ".join(map(str, conjunto)) + "}"
+
+
+def _profundidade(c):
+    return "d" if c == 0 else f"d + {c}"
+
+
+def _casar(cod, nivel, terminal, c, rastro):
+    if rastro:
+        cod(nivel, f"registrar((contador, {CASAR}, {terminal}, pos, {_profundidade(c)}))")
+    cod(nivel, "pos += 1")
+    cod(nivel, "if pos < n:")
+    cod(nivel + 1, "ttoken = ids[pos]")
+    if rastro:
+        cod(nivel, "contador += 1")
+
+
+def _funcao(cod, tab, nt, conjuntos, rastro):
+    """
+    Função de um não-terminal. Com `rastro`, recebe a profundidade `d` da
+    pilha do LL(1) depois de desempilhá-lo e registra os mesmos eventos
+    que o analisador por tabela; sem rastro, não conta passos.
+    """
+    producoes = [p for p in range(len(tab.producoes)) if tab.cabecas[p] == nt and conjuntos[p]]
+    corpos = [tab.producoes[p] for p in producoes]
+    laco = any(corpo and corpo[-1] == nt for corpo in corpos)
+    casa_terminal = any(x < tab.n_colunas for corpo in corpos for x in corpo)
+
+    cod(1, f"def {_nome_funcao(tab, nt)}({'d' if rastro else ''}):")
+    nonlocais = (["pos", "ttoken"] if casa_terminal else []) + (["contador"] if rastro else [])
+    if nonlocais:
+        cod(2, "nonlocal " + ", ".join(nonlocais))
+    nivel = 2
+    if laco:
+        cod(2, "while True:")
+        nivel = 3
+
+    for i, (p, corpo) in enumerate(zip(producoes, corpos)):
+        texto = " ".join(tab.originais[p]) or "ε"
+        cod(nivel, f"{'if' if i == 0 else 'elif'} {_condicao(conjuntos[p])}:  # {tab.simbolos[nt]} → {texto}")
+        dentro = nivel + 1
+        if rastro:
+            cod(dentro, f"registrar((contador, {EXPANDIR}, {p}, pos, d))")
+            cod(dentro, "contador += 1")
+        antes = len(cod.linhas)
+        m = len(corpo)
+        for j, simbolo in enumerate(corpo):
+            c = m - j - 1
+            resto = corpo[j + 1:] if rastro else None
+            if simbolo < tab.n_colunas:
+                if j == 0:
+                    # a produção foi escolhida por este mesmo terminal
+                    _casar(cod, dentro, simbolo, c, rastro)
+                else:
+                    cod(dentro, f"if ttoken == {simbolo}:")
+                    _casar(cod, dentro + 1, simbolo, c, rastro)
+                    cod(dentro, "else:")
+                    cod(dentro + 1, f"erro_terminal({simbolo}{', ' + _profundidade(c) if rastro else ''})", resto)
+            elif j == m - 1 and simbolo == nt:
+                cod(dentro, "continue")
+            else:
+                cod(dentro, f"{_nome_funcao(tab, simbolo)}({_profundidade(c) if rastro else ''})", resto)
+        if laco and not (corpo and corpo[-1] == nt):
+            cod(dentro, "return")
+        elif len(cod.linhas) == antes:
+            cod(dentro, "pass")
+
+    # nenhuma produção para o token: erro e modo pânico
+    if producoes:
+        cod(nivel, "else:")
+        nivel += 1
+    cod(nivel, f"panico({nt}{', d' if rastro else ''})")
+    if laco:
+        cod(nivel, "return")
+    cod(0, "")
+
+
+def _analisador(cod, tab, conjuntos, rastro):
+    """
+    Função de entrada de uma das variantes (com ou sem rastro): o estado
+    (posição, token atual, contador de passos) fica em variáveis locais
+    compartilhadas pelas funções aninhadas.
+    """
+    if rastro:
+        cod(0, "def _analisar_com_rastro(tokens, ids, n, registrar, diagnosticos):")
+        cod(1, '"""')
+        cod(1, "Devolve a pilha que sobrou (vazia, salvo se a entrada acabou no meio).")
+        cod(1, '"""')
+        cod(1, "contador = 1")
+    else:
+        cod(0, "def _analisar_sem_rastro(tokens, ids, n, diagnosticos):")
+    cod(1, "pos = 0")
+    cod(1, "ttoken = ids[0]")
+    cod(1, "ids_bytes = None")
+    cod(0, "")
+    d = ", d" if rastro else ""
+
+    cod(1, f"def erro_terminal(terminal{d}):")
+    cod(2, "nonlocal pos, ttoken" + (", contador" if rastro else ""))
+    if rastro:
+        cod(2, f"registrar((contador, {ERRO_TERMINAL}, terminal, pos, d))")
+    cod(2, "if diagnosticos is not None:")
+    cod(3, "token = tokens[min(pos, n - 1)]")
+    cod(3, "diagnosticos.append(Diagnostico(\"ll1\", token[2], f\"encontrado '{token[0]}', "
+           "esperado '{SIMBOLOS[terminal]}'\"))")
+    cod(2, "pos += 1")
+    cod(2, "if pos >= n:")
+    cod(3, "raise _Interrompido")
+    cod(2, "ttoken = ids[pos]")
+    if rastro:
+        cod(2, "contador += 1")
+    cod(0, "")
+
+    cod(1, f"def panico(nt{d}):")
+    cod(2, "nonlocal pos, ttoken, ids_bytes" + (", contador" if rastro else ""))
+    if rastro:
+        cod(2, f"registrar((contador, {ERRO}, nt, pos, d))")
+    cod(2, "if diagnosticos is not None:")
+    cod(3, "token = tokens[min(pos, n - 1)]")
+    cod(3, "diagnosticos.append(Diagnostico(\"ll1\", token[2], f\"esperado {ESPERADOS[nt - N_COLUNAS]}, "
+           "encontrado '{token[0]}'\"))")
+    cod(2, "fim = min(n, pos + DESCARTE_MAXIMO)")
+    cod(2, "marcas = SINCRONIA[nt - N_COLUNAS]")
+    if rastro:
+        cod(2, "contador += 1")
+        cod(2, "while pos < fim and not marcas[ttoken]:")
+        cod(3, f"registrar((contador, {DESCARTE}, nt, pos, d))")
+        cod(3, "pos += 1")
+        cod(3, "if pos < n:")
+        cod(4, "ttoken = ids[pos]")
+        cod(3, "contador += 1")
+    else:
+        cod(2, "busca = BUSCA_SINCRONIA[nt - N_COLUNAS]")
+        cod(2, "if busca is not None:")
+        cod(3, "if ids_bytes is None:")
+        cod(4, "ids_bytes = bytes(ids)")
+        cod(3, "achado = busca.search(ids_bytes, pos, fim)")
+        cod(3, "pos = achado.start() if achado else fim")
+        cod(2, "else:")
+        cod(3, "while pos < fim and not marcas[ids[pos]]:")
+        cod(4, "pos += 1")
+        cod(2, "if pos < n:")
+        cod(3, "ttoken = ids[pos]")
+    # sem token de sincronia aqui, foi o limite de descarte que parou
+    cod(2, "esgotado = not marcas[ttoken]")
+    cod(2, "if esgotado and diagnosticos is not None:")
+    cod(3, "token = tokens[min(pos, n - 1)]")
+    cod(3, "diagnosticos.append(Diagnostico(\"ll1\", token[2], mensagem_descarte_esgotado(token[0])))")
+    if rastro:
+        cod(2, f"registrar((contador, {DESCARTE_ESGOTADO} if esgotado else {RECUPERADO}, nt, pos, d))")
+        cod(2, "contador += 1")
+    cod(0, "")
+
+    for nt in range(tab.n_colunas, len(tab.simbolos)):
+        _funcao(cod, tab, nt, conjuntos, rastro)
+
+    # pilha inicial [EOF, inicial]: o símbolo inicial e depois o EOF
+    cod(1, "try:")
+    cod(2, f"{_nome_funcao(tab, tab.inicial)}({1 if rastro else ''})", (tab.eof,) if rastro else None)
+    cod(2, f"if ttoken == {tab.eof}:")
+    if rastro:
+        cod(3, f"registrar((contador, {CASAR}, {tab.eof}, pos, 0))")
+    else:
+        cod(3, "pass")
+    cod(2, "else:")
+    cod(3, f"erro_terminal({tab.eof}{', 0' if rastro else ''})", () if rastro else None)
+    cod(1, "except _Interrompido as interrompido:")
+    cod(2, "return _pilha_restante(interrompido.__traceback__)" if rastro else "pass")
+    cod(1, "return []" if rastro else "return None")
+    cod(0, "")
+    cod(0, "")
+
+
+_CABECALHO = '''\
+# {arquivo} — Analisador LL(1) descendente recursivo GERADO por gerador_descendente.py; não edite
+# chave: {chave}
+import re
+import sys
+
+from diagnosticos import Diagnostico
+from ll1_parser import DESCARTE_MAXIMO, RenderizadorLL1, exibir_resultado, mensagem_descarte_esgotado
+from rastro import COMPLETO, criar_rastro
+from scanner import TIPOS_TOKEN, TokenBuffer
+
+SIMBOLOS = {simbolos!r}
+N_COLUNAS = {n_colunas}
+IDS = {{s: i for i, s in enumerate(SIMBOLOS)}}
+DESCONHECIDO = {desconhecido}
+_TRADUCAO = [IDS.get(nome, DESCONHECIDO) for nome in TIPOS_TOKEN]
+
+# por não-terminal: terminais esperados (mensagens) e de sincronia do modo pânico
+ESPERADOS = {esperados!r}
+SINCRONIA = {sincronia!r}
+BUSCA_SINCRONIA = [{busca}]
+
+
+class TabelaGerada:
+    """
+    O que o RenderizadorLL1 e os contadores do perfil consultam da
+    TabelaLL1Compilada. O próprio módulo faz o papel do analisador
+    (`modulo.compilada`), como AnalisadorSintaticoLL1.
+    """
+
+    simbolos = SIMBOLOS
+    n_colunas = N_COLUNAS
+    eof = {eof}
+    inicial = {inicial}
+    cabecas = {cabecas!r}
+    producoes = {producoes!r}
+    invertidas = [p[::-1] for p in producoes]
+    originais = {originais!r}
+    esperados = ESPERADOS
+
+
+compilada = TabelaGerada()
+_reserva = None
+
+
+class _Interrompido(Exception):
+    """
+    Erro de terminal no último token: o analisador por tabela para aí.
+    """
+
+
+def _ids_tokens(tokens):
+    if isinstance(tokens, TokenBuffer):
+        return [_TRADUCAO[t] for t in tokens.tipos]
+    return [IDS.get(tk[0], DESCONHECIDO) for tk in tokens]
+
+
+def _pilha_restante(tb):
+    pilha = []
+    while tb is not None:
+        pilha.extend(reversed(RESTOS.get(tb.tb_lineno, ())))
+        tb = tb.tb_next
+    return pilha
+
+
+def analisador_tabela():
+    """
+    AnalisadorSintaticoLL1 da mesma gramática (remontada das produções
+    acima), com a tabela do cache_tabelas.
+    """
+    global _reserva
+    if _reserva is None:
+        from cache_tabelas import obter_tabelas
+        from ll1_parser import AnalisadorSintaticoLL1
+
+        gramatica = {{nome: [] for nome in SIMBOLOS[N_COLUNAS:]}}
+        for cabeca, producao in zip(TabelaGerada.cabecas, TabelaGerada.originais):
+            gramatica[SIMBOLOS[cabeca]].append(producao)
+        _reserva = AnalisadorSintaticoLL1(gramatica, obter_tabelas(gramatica).ll1)
+    return _reserva
+
+
+def analisar(tokens, rastro=COMPLETO, diagnosticos=None, exibir=True):
+    """
+    Mesmo contrato de AnalisadorSintaticoLL1.analisar (sem a árvore):
+    devolve o rastro, anexa os erros a `diagnosticos` e imprime os
+    últimos passos se `exibir`. Se o aninhamento estourar a pilha do
+    Python, a análise é refeita pela tabela (mesmo resultado) com um
+    aviso em stderr.
+    """
+    rastro = criar_rastro(rastro)
+    registrar = rastro.registrar
+    ids = _ids_tokens(tokens)
+    n = len(tokens)
+    anteriores = None if diagnosticos is None else len(diagnosticos)
+    try:
+        if registrar:
+            pilha = _analisar_com_rastro(tokens, ids, n, registrar, diagnosticos)
+            rastro.vincular(RenderizadorLL1(sys.modules[__name__], tokens, pilha))
+        else:
+            _analisar_sem_rastro(tokens, ids, n, diagnosticos)
+    except RecursionError:
+        # descarta o que a tentativa interrompida gravou
+        if diagnosticos is not None:
+            del diagnosticos[anteriores:]
+        rastro.limpar()
+        print("aviso: aninhamento fundo demais para o analisador descendente; "
+              "LL(1) refeito pela tabela", file=sys.stderr)
+        return analisador_tabela().analisar(tokens, rastro, diagnosticos, exibir)
+    if exibir:
+        exibir_resultado(rastro)
+    return rastro
+
+
+'''
+
+
+def gerar_codigo(analisador, chave="", arquivo="brick_descendente.py"):
+    """
+    Texto do módulo descendente recursivo para um AnalisadorSintaticoLL1
+    (a gramática, a tabela e a sincronia do modo pânico vêm dele).
+    """
+    tab = analisador.compilada
+    conjuntos = _conjuntos(tab)
+    # sem busca por expressão regular quando os ids não cabem em um byte
+    busca = ", ".join("None" if b is None else f"re.compile({b.pattern!r})" for b in tab.busca_sincronia)
+
+    cabecalho = _CABECALHO.format(
+        arquivo=arquivo, chave=chave,
+        simbolos=list(tab.simbolos), n_colunas=tab.n_colunas, desconhecido=tab.desconhecido,
+        esperados=[list(e) for e in tab.esperados], sincronia=[bytes(s) for s in tab.sincronia],
+        busca=busca, eof=tab.eof, inicial=tab.inicial, cabecas=list(tab.cabecas),
+        producoes=list(tab.producoes), originais=[list(p) for p in tab.originais],
+    )
+    cod = _Codigo()
+    cod.linhas.extend(cabecalho.splitlines())
+    _analisador(cod, tab, conjuntos, rastro=True)
+    _analisador(cod, tab, conjuntos, rastro=False)
+    cod(0, "# linha de cada chamada -> símbolos que ficam na pilha depois dela")
+    cod(0, f"RESTOS = {cod.restos!r}")
+    return "\n".join(cod.linhas) + "\n"
+
+
+def _chave_arquivo(caminho):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            f.readline()
+            linha = f.readline()
+    except OSError:
+        return None
+    return linha[len("# chave: "):].strip() if linha.startswith("# chave: ") else None
+
+
+def _importar(caminho):
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def salvar_descendente(codigo, caminho):
+    """
+    Grava o módulo de forma atômica (arquivo temporário + rename).
+    Devolve False se não foi possível gravar.
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(codigo)
+        os.replace(temporario, caminho)
+        return True
+    except OSError:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        return False
+
+
+def obter_descendente(G=grammar, caminho=None, tabela=None, usar_cache=True):
+    """
+    Módulo descendente recursivo da gramática: importado de `caminho`
+    (padrão: caminho_descendente(G)) quando a chave do cabeçalho confere,
+    ou gerado, gravado e importado.
+    `tabela` é a tabela LL(1) de onde gerar; por padrão, a do
+    cache_tabelas (a mesma que o AnalisadorSintaticoLL1 usa no main.py,
+    então até a ordem dos esperados nas mensagens é a mesma).
+    """
+    padrao = caminho is None
+    if padrao:
+        caminho = caminho_descendente(G)
+    chave = chave_descendente(G)
+    if usar_cache and _chave_arquivo(caminho) == chave:
+        return _importar(caminho)
+
+    if tabela is None:
+        tabela = obter_tabelas(G).ll1
+
+    codigo = gerar_codigo(AnalisadorSintaticoLL1(G, tabela), chave, os.path.basename(caminho))
+    if usar_cache and salvar_descendente(codigo, caminho):
+        if padrao:
+            _podar(os.path.dirname(caminho))
+        return _importar(caminho)
+    # sem cache (ou sem permissão de escrita): executa o código em memória
+    modulo = types.ModuleType(os.path.splitext(os.path.basename(caminho))[0])
+    modulo.__file__ = caminho
+    sys.modules[modulo.__name__] = modulo
+    exec(compile(codigo, caminho, "exec"), modulo.__dict__)
+    return modulo
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Gera o analisador LL(1) descendente recursivo da gramática.")
+    args.add_argument("--saida", default=caminho_descendente(grammar), help="arquivo .py gerado")
+    opcoes = args.parse_args(argv)
+
+    codigo = gerar_codigo(AnalisadorSintaticoLL1(grammar, obter_tabelas(grammar).ll1), chave_descendente(grammar),
+                          os.path.basename(opcoes.saida))
+    if not salvar_descendente(codigo, opcoes.saida):
+        print(f"não foi possível gravar {opcoes.saida}", file=sys.stderr)
+        return 1
+    print(f"{opcoes.saida}: {codigo.count(chr(10))} linhas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
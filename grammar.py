@@ -1,166 +1,252 @@
 # grammar.py — Definição da gramática do compilador Brick + FIRST e FOLLOW
+import hashlib
+import json
+import os
 from collections import defaultdict, deque
-# GRAMÁTICA DA LINGUAGEM "BRICK
-# Cada não-terminal aponta para uma lista de produções.
+# GRAMÁTICA DA LINGUAGEM "BRICK"
+# A gramática fica no arquivo brick.bnf e é carregada para um dicionário:
+# cada não-terminal aponta para uma lista de produções.
 # Cada produção é uma lista de símbolos terminais ou não-terminais.
 # O símbolo "ε" representa a produção vazia
 
-grammar = {
-    # Programa composto por declarações de funções + função principal obrigatória.
-    "PROGRAMA_G": [["DECL_FUNCOES_G", "PRINCIPAL_G"]],
-
-    # Lista recursiva de funções. Pode ser vazia.
-    "DECL_FUNCOES_G": [
-        ["FUNCAO", "TIPO_VAR", "IDENT", "LPAREN", "PARAMS_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE", "DECL_FUNCOES_G"],
-        ["ε"]
-    ],
-
-    # Chamada de função simples
-    "CHAM_FUNCOES_G": [["IDENT", "LPAREN", "ARGUMENTOS_G", "RPAREN"]],
-
-    # Bloco principal obrigatório
-    "PRINCIPAL_G": [["PRINCIPAL", "LCHAVE", "COMANDOS_G", "RCHAVE"]],
-
-    # Parâmetros formais da função
-    "PARAMS_G": [["TIPO_VAR", "IDENT", "PARAMS_RESTO_G"], ["ε"]],
-    "PARAMS_RESTO_G": [["VIRGULA", "TIPO_VAR", "IDENT", "PARAMS_RESTO_G"], ["ε"]],
-
-    # Lista de comandos
-    "COMANDOS_G": [["COMANDO_G", "COMANDOS_G"], ["ε"]],
-
-    # Categoria principal dos comandos da linguagem
-    "COMANDO_G": [
-        ["DECLARACOES_G", "PONTOVIRG"],                           # Declaração de variável
-        ["IDENT", "ELEMENTO_IDENT_G", "PONTOVIRG"],               # Ident seguido de atribuição ou chamada
-        ["SE", "LPAREN", "EXPRESSAO_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE", "SENAO_G"],  # Condicional
-        ["ENQUANTO", "LPAREN", "EXPRESSAO_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE"],       # While
-        ["FACA", "LCHAVE", "COMANDOS_G", "RCHAVE", "ENQUANTO", "LPAREN", "EXPRESSAO_G", "RPAREN", "PONTOVIRG"], # Do-while
-        ["PARA", "LPAREN", "DECL_OU_ATRIB_G", "PONTOVIRG", "EXPRESSAO_G", "PONTOVIRG", "ATRIBUICAO_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE"],  # For
-        ["RETORNO", "EXPRESSAO_G", "PONTOVIRG"]                   # Return
-    ],
-
-    # Produção que aceita declarações ou atribuições
-    "DECL_OU_ATRIB_G": [["DECLARACOES_G"], ["ATRIBUICAO_G"]],
-
-    # Declarações locais
-    "DECLARACOES_G": [
-        ["TIPO_VAR", "IDENT", "DECLARACOES_ATRIB_G", "DECLARACOES_RESTO_G"]
-    ],
-    "DECLARACOES_RESTO_G": [["VIRGULA", "IDENT", "DECLARACOES_ATRIB_G", "DECLARACOES_RESTO_G"], ["ε"]],
-    "DECLARACOES_ATRIB_G": [["ATRIB", "EXPRESSAO_G"], ["ε"]],
-
-    # Atribuição
-    "ATRIBUICAO_G": [["IDENT", "ATRIB", "EXPRESSAO_G"]],
-
-    # Elemento que segue um identificador: atribuição ou chamada
-    "ELEMENTO_IDENT_G": [
-        ["ATRIB", "EXPRESSAO_G"],
-        ["LPAREN", "ARGUMENTOS_G", "RPAREN"]
-    ],
-
-    # Ramo opcional
-    "SENAO_G": [["SENAO", "LCHAVE", "COMANDOS_G", "RCHAVE"], ["ε"]],
-
-    # Argumentos de chamada de função
-    "ARGUMENTOS_G": [["EXPRESSAO_G", "ARGUMENTOS_RESTO_G"], ["ε"]],
-    "ARGUMENTOS_RESTO_G": [["VIRGULA", "EXPRESSAO_G", "ARGUMENTOS_RESTO_G"], ["ε"]],
-
-    # Expressões lógicas, comparativas e aritméticas
-    "EXPRESSAO_G": [["EXPR_LOGICA_G"]],
-
-    # Expressões lógicas binárias
-    "EXPR_LOGICA_G": [["EXPR_COMPAR_G", "EXPR_LOGICA_RESTO_G"]],
-    "EXPR_LOGICA_RESTO_G": [["OPER_LOGI_BIN", "EXPR_COMPAR_G", "EXPR_LOGICA_RESTO_G"], ["ε"]],
-
-    # Expressões comparativas
-    "EXPR_COMPAR_G": [["EXPR_ARITMETICA_G", "EXPR_COMPAR_RESTO_G"]],
-    "EXPR_COMPAR_RESTO_G": [["COMPAR", "EXPR_ARITMETICA_G", "EXPR_COMPAR_RESTO_G"], ["ε"]],
-
-    # Expressões aritméticas
-    "EXPR_ARITMETICA_G": [["TERMO_G", "EXPR_ARITMETICA_RESTO_G"]],
-    "EXPR_ARITMETICA_RESTO_G": [["OPER_ARIT", "TERMO_G", "EXPR_ARITMETICA_RESTO_G"], ["ε"]],
-
-    # Termos
-    "TERMO_G": [["FATOR_G", "TERMO_RESTO_G"]],
-    "TERMO_RESTO_G": [["OPER_ARIT", "FATOR_G", "TERMO_RESTO_G"], ["ε"]],
-
-    # Valores possíveis de expressão
-    "FATOR_G": [
-        ["LPAREN", "EXPRESSAO_G", "RPAREN"],
-        ["OPER_LOGI_UN", "FATOR_G"],
-        ["IDENT", "FATOR_IDENT_G"],
-        ["NUMERO_INT"],
-        ["NUMERO_REAL"],
-        ["PALAVRA"],
-        ["CARACTERE"],
-        ["BOOLEANO"]
-    ],
-
-    # Identificação de função ou variável
-    "FATOR_IDENT_G": [
-        ["LPAREN", "ARGUMENTOS_G", "RPAREN"],
-        ["ε"]
-    ],
-}
+BRICK_BNF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "brick.bnf")
+
+
+def ler_bnf(texto, origem="<texto>"):
+    """
+    Converte um texto no formato BNF do brick.bnf para o dicionário de gramática.
+    """
+    G = {}
+    atual = None
+
+    for num, linha in enumerate(texto.splitlines(), start=1):
+        linha = linha.split("#", 1)[0].strip()
+        if not linha:
+            continue
+
+        if linha.startswith("|"):
+            if atual is None:
+                raise ValueError(f"{origem}:{num}: alternativa '|' sem não-terminal")
+            corpo = linha[1:]
+        elif "::=" in linha:
+            cabeca, corpo = linha.split("::=", 1)
+            atual = cabeca.strip()
+            if not atual or len(atual.split()) != 1:
+                raise ValueError(f"{origem}:{num}: não-terminal inválido '{cabeca.strip()}'")
+            G.setdefault(atual, [])
+        else:
+            raise ValueError(f"{origem}:{num}: esperado '::=' ou '|'")
+
+        # cada "|" na mesma linha separa outra alternativa
+        for alternativa in corpo.split("|"):
+            simbolos = alternativa.split()
+            if not simbolos:
+                raise ValueError(f"{origem}:{num}: produção vazia (use ε)")
+            G[atual].append(simbolos)
+
+    if not G:
+        raise ValueError(f"{origem}: nenhuma produção encontrada")
+    return G
+
+
+def carregar_gramatica(caminho):
+    """
+    Lê uma gramática de um arquivo BNF.
+    """
+    with open(caminho, "r", encoding="utf-8") as f:
+        return ler_bnf(f.read(), caminho)
+
+
+def grammar_hash(G):
+    """
+    Hash SHA-256 do conteúdo da gramática (ordem dos não-terminais incluída).
+    """
+    canonica = json.dumps(list(G.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonica.encode("utf-8")).hexdigest()
+
+
+grammar = carregar_gramatica(BRICK_BNF)
 
 EPS = "ε"
 
-def all_firsts(G):
+# Quantas análises ficam memorizadas ao mesmo tempo (por identidade da gramática).
+_MAX_ANALISES = 16
+_analises = {}
+
+
+class GrammarAnalysis:
     """
-    Calcula FIRST(X) para TODOS os não-terminais.
+    Anuláveis, FIRST, FOLLOW e FIRST de cada produção de uma gramática.
+
+    Tudo é calculado uma única vez no construtor, com listas de trabalho
+    guiadas por dependências: uma produção só é reavaliada quando o FIRST
+    de um não-terminal que ela usa muda, e um FOLLOW só é propagado
+    quando cresce. Use `analyze(G)` para obter a instância compartilhada.
     """
-    EPS = "ε"
-    FIRST = {nt: set() for nt in G}
-
-    changed = True
-    while changed:
-        changed = False
-
-        for A, prods in G.items():
-            for prod in prods:
-
-                # Produção epsilon
-                if prod == [EPS]:
-                    if EPS not in FIRST[A]:
-                        FIRST[A].add(EPS)
-                        changed = True
-                    continue
-
-                # Percorre símbolos da produção
-                for X in prod:
-                    # X é terminal → FIRST(A) recebe X
-                    if X not in G:
-                        if X not in FIRST[A]:
-                            FIRST[A].add(X)
-                            changed = True
-                        break
+
+    def __init__(self, G, start_symbol=None):
+        self.gramatica = G
+        self.start_symbol = start_symbol if start_symbol is not None else next(iter(G))
+
+        # Produções sem o símbolo ε (["ε"] e [] viram a sequência vazia)
+        self._prods = [
+            (A, i, tuple(X for X in prod if X != EPS))
+            for A, prods in G.items()
+            for i, prod in enumerate(prods)
+        ]
+
+        self.nullable = set()
+        self.first = {nt: set() for nt in G}
+        self.follow = {nt: set() for nt in G}
+        self.first_prod = {}
+
+        self._calcula_first()
+        self._calcula_follow()
+
+    def first_of(self, seq):
+        """
+        FIRST de uma sequência de símbolos (inclui ε se ela for anulável).
+        """
+        G = self.gramatica
+        result = set()
+        for X in seq:
+            if X == EPS:
+                continue
+            if X not in G:
+                result.add(X)
+                break
+            result |= self.first[X]
+            if X not in self.nullable:
+                break
+        else:
+            result.add(EPS)
+            return result
+        result.discard(EPS)
+        return result
+
+    def _calcula_first(self):
+        G = self.gramatica
+        FIRST = self.first
+        nullable = self.nullable
+
+        # dependentes[X] = produções cujo FIRST pode mudar quando FIRST(X) muda
+        dependentes = {nt: [] for nt in G}
+        for k, (A, _, prod) in enumerate(self._prods):
+            for X in prod:
+                if X in G:
+                    dependentes[X].append(k)
+
+        fila = deque(range(len(self._prods)))
+        na_fila = [True] * len(self._prods)
+
+        while fila:
+            k = fila.popleft()
+            na_fila[k] = False
+            A, _, prod = self._prods[k]
+
+            antes = len(FIRST[A])
+            anulavel = True
+            for X in prod:
+                if X not in G:
+                    FIRST[A].add(X)
+                    anulavel = False
+                    break
+                FIRST[A] |= FIRST[X]
+                if X not in nullable:
+                    anulavel = False
+                    break
+
+            mudou = len(FIRST[A]) != antes
+            if anulavel and A not in nullable:
+                nullable.add(A)
+                mudou = True
+
+            if mudou:
+                for d in dependentes[A]:
+                    if not na_fila[d]:
+                        na_fila[d] = True
+                        fila.append(d)
+
+        for A, i, prod in self._prods:
+            self.first_prod[(A, i)] = frozenset(self.first_of(prod))
+
+        # Mantém o formato antigo: ε aparece em FIRST(A) quando A é anulável
+        for A in nullable:
+            FIRST[A].add(EPS)
+
+    def _calcula_follow(self):
+        G = self.gramatica
+        FOLLOW = self.follow
+        FOLLOW[self.start_symbol].add("EOF")
+
+        # arestas[A] = não-terminais B com FOLLOW(A) ⊆ FOLLOW(B)
+        arestas = {nt: set() for nt in G}
+
+        for A, _, prod in self._prods:
+            # FIRST do sufixo à direita de cada posição, da direita para a esquerda
+            resto_first = set()
+            resto_anulavel = True
+            for X in reversed(prod):
+                if X in G:
+                    FOLLOW[X] |= resto_first
+                    if resto_anulavel and X != A:
+                        arestas[A].add(X)
+                    if X in self.nullable:
+                        resto_first = resto_first | (self.first[X] - {EPS})
                     else:
-                        # X é não-terminal → copia FIRST(X) sem epsilon
-                        novos = FIRST[X] - {EPS}
-                        if not novos.issubset(FIRST[A]):
-                            FIRST[A] |= novos
-                            changed = True
-
-                        # Se FIRST(X) não contém epsilon, para
-                        if EPS not in FIRST[X]:
-                            break
+                        resto_first = self.first[X] - {EPS}
+                        resto_anulavel = False
                 else:
-                    # Todos continham epsilon → adiciona epsilon
-                    if EPS not in FIRST[A]:
-                        FIRST[A].add(EPS)
-                        changed = True
+                    resto_first = {X}
+                    resto_anulavel = False
+
+        fila = deque(G)
+        na_fila = set(G)
+        while fila:
+            A = fila.popleft()
+            na_fila.discard(A)
+            for B in arestas[A]:
+                if not FOLLOW[A] <= FOLLOW[B]:
+                    FOLLOW[B] |= FOLLOW[A]
+                    if B not in na_fila:
+                        na_fila.add(B)
+                        fila.append(B)
+
+
+def analyze(G, start_symbol=None):
+    """
+    Devolve a GrammarAnalysis de G, calculada uma vez e memorizada pela
+    identidade do dicionário (não altere a gramática depois de analisá-la).
+    """
+    if start_symbol is None:
+        start_symbol = next(iter(G))
+    chave = (id(G), start_symbol)
+    item = _analises.get(chave)
+    if item is not None and item[0] is G:
+        return item[1]
 
-    return FIRST
+    analise = GrammarAnalysis(G, start_symbol)
+    if len(_analises) >= _MAX_ANALISES:
+        del _analises[next(iter(_analises))]
+    # guarda G junto para que o id não seja reaproveitado enquanto a entrada existir
+    _analises[chave] = (G, analise)
+    return analise
+
+
+def all_firsts(G):
+    """
+    Calcula FIRST(X) para TODOS os não-terminais.
+    """
+    return {nt: set(s) for nt, s in analyze(G).first.items()}
 
 
 def first(simbolo, G):
     """
     FIRST de um único símbolo.
     """
-    FIRST = all_firsts(G)
     if simbolo not in G:
         return {simbolo}
-    return FIRST[simbolo]
+    return set(analyze(G).first[simbolo])
 
 
 def first_seq(seq, FIRST):
@@ -182,48 +268,6 @@ def first_seq(seq, FIRST):
 
 def follow(nao_terminal, grammar, start_symbol):
     """
-    Implementação completa de FOLLOW(X).
+    FOLLOW(X), consultado na análise memorizada da gramática.
     """
-    EPS = "ε"
-    FIRST = all_firsts(grammar)
-    FOLLOW = {nt: set() for nt in grammar}
-
-    # EOF pertence ao símbolo inicial
-    FOLLOW[start_symbol].add("EOF")
-
-    changed = True
-    while changed:
-        changed = False
-
-        # Percorre toda a gramática
-        for A, producoes in grammar.items():
-            for prod in producoes:
-                for i, simbolo in enumerate(prod):
-                    if simbolo in grammar:  # é não-terminal
-                        resto = prod[i + 1:]
-
-                        # Caso exista sequência à direita
-                        if resto:
-                            first_resto = first_seq(resto, FIRST)
-
-                            # Adiciona FIRST(resto) - epsilon
-                            for t in first_resto - {EPS}:
-                                if t not in FOLLOW[simbolo]:
-                                    FOLLOW[simbolo].add(t)
-                                    changed = True
-
-                            # Se resto produz epsilon → FOLLOW(A) também pertence
-                            if EPS in first_resto:
-                                for t in FOLLOW[A]:
-                                    if t not in FOLLOW[simbolo]:
-                                        FOLLOW[simbolo].add(t)
-                                        changed = True
-
-                        else:
-                            # Não há resto → FOLLOW(A) pertence a FOLLOW(simbolo)
-                            for t in FOLLOW[A]:
-                                if t not in FOLLOW[simbolo]:
-                                    FOLLOW[simbolo].add(t)
-                                    changed = True
-
-    return FOLLOW[nao_terminal]
+    return set(analyze(grammar, start_symbol).follow[nao_terminal])
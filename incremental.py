@@ -0,0 +1,319 @@
+# incremental.py — Reanálise léxica e LL(1) incremental após pequenas edições
+#
+# Uso típico (editor):
+#     inc = AnalisadorIncremental(AnalisadorSintaticoLL1(grammar, tabelas.ll1))
+#     estado = inc.analisar(codigo)
+#     estado = inc.editar(estado, deslocamento, removidos, "texto inserido")
+#     estado.diagnosticos
+from array import array
+from bisect import bisect_left, bisect_right
+
+from diagnosticos import Diagnostico
+from ll1_parser import DESCARTE_MAXIMO, mensagem_descarte_esgotado
+from scanner import (_MARGEM, _PADRAO, ID_TIPO, TIPOS_TOKEN, TokenBuffer, _caractere_invalido,
+                     analisador_lexico_buffer, diagnostico_lexico, tipo_token)
+
+# Distância (em tokens casados) entre dois pontos de controle da pilha LL(1)
+INTERVALO_PADRAO = 64
+
+
+def relexar(buffer, deslocamento, removidos, inseridos, diagnosticos=None):
+    """
+    Aplica a edição (troca `removidos` caracteres a partir de `deslocamento`
+    por `inseridos`) e reanalisa só a região danificada.
+
+    A análise recomeça no fim do último token que não pode ter mudado (o
+    token e os _MARGEM caracteres que o scanner olha depois dele estão antes
+    da edição) e para quando um token novo começa, depois da edição, no
+    mesmo ponto em que começava um token antigo: dali em diante o texto e
+    o scanner são os mesmos, então os tokens também são.
+
+    Devolve (novo_buffer, inicio, fim_antigo, fim_novo): os tokens
+    antigos [inicio:fim_antigo] viraram os novos [inicio:fim_novo].
+
+    Como no scanner, caracteres inválidos geram RuntimeError, a menos que
+    `diagnosticos` seja uma lista: aí cada um é ignorado e anotado nela
+    como (deslocamento no novo fonte, Diagnostico). Só os do trecho
+    reanalisado, entre o fim do token `inicio - 1` e o começo de `fim_novo`.
+    """
+    fonte = buffer.fonte
+    if not 0 <= deslocamento <= deslocamento + removidos <= len(fonte):
+        raise ValueError("edição fora do texto")
+
+    nova_fonte = fonte[:deslocamento] + inseridos + fonte[deslocamento + removidos:]
+    delta = len(inseridos) - removidos
+    fim_edicao = deslocamento + len(inseridos)
+
+    inicios = buffer.inicios
+    comprimentos = buffer.comprimentos
+    n = len(buffer.tipos)
+
+    # primeiro token que pode ter mudado
+    inicio = bisect_right(inicios, max(deslocamento - _MARGEM, 0)) - 1
+    while inicio >= 0 and inicios[inicio] + comprimentos[inicio] + _MARGEM > deslocamento:
+        inicio -= 1
+    inicio += 1
+    retomada = inicios[inicio - 1] + comprimentos[inicio - 1] if inicio else 0
+
+    # uma aspa sem par (caractere inválido, anotado nos diagnósticos) pode
+    # abrir uma cadeia com a aspa que a edição trouxer: a reanálise começa
+    # na primeira delas. Aspas sem par só aparecem depois da última que
+    # está dentro de um token, então a busca para nessa
+    aspa = fonte.rfind('"', 0, retomada)
+    while aspa >= 0:
+        j = bisect_right(inicios, aspa) - 1
+        if j >= 0 and inicios[j] + comprimentos[j] > aspa:
+            break
+        inicio = j + 1
+        retomada = inicios[j] + comprimentos[j] if j >= 0 else 0
+        aspa = fonte.rfind('"', 0, aspa)
+
+    novos_tipos = array("B")
+    novos_inicios = array("I")
+    novos_comprimentos = array("I")
+    novas_linhas = array("I")
+    invalidos = []
+    fim_antigo = n - 1  # sem ressincronizar: só o EOF antigo é aproveitado
+    fim_relexado = len(nova_fonte)
+
+    for correspondencia in _PADRAO.finditer(nova_fonte, retomada):
+        classe = correspondencia.lastgroup
+        if classe == "NOVA_LINHA":
+            novas_linhas.append(correspondencia.end())
+            continue
+        elif classe == "INCOMPAT":
+            if diagnosticos is None:
+                _caractere_invalido(correspondencia.group(classe), None, None)  # RuntimeError
+            invalidos.append(correspondencia.start(classe))
+            continue
+
+        # o token é o grupo (a correspondência inclui os espaços antes dele)
+        comeco, fim = correspondencia.span(classe)
+        if comeco >= fim_edicao:
+            j = bisect_left(inicios, comeco - delta)
+            if j < n and inicios[j] == comeco - delta:
+                fim_antigo = j
+                fim_relexado = comeco
+                break
+        novos_tipos.append(ID_TIPO[tipo_token(correspondencia)])
+        novos_inicios.append(comeco)
+        novos_comprimentos.append(fim - comeco)
+
+    novo = TokenBuffer(nova_fonte)
+    novo.tipos = buffer.tipos[:inicio] + novos_tipos + buffer.tipos[fim_antigo:]
+    novo.comprimentos = buffer.comprimentos[:inicio] + novos_comprimentos + buffer.comprimentos[fim_antigo:]
+    novo.inicios = inicios[:inicio] + novos_inicios + _deslocar(inicios[fim_antigo:], delta)
+
+    # linhas: quebras dentro de cadeias não contam, então as do trecho
+    # reanalisado vêm do scanner; as de depois dele só andam `delta`
+    linhas = buffer.inicios_linha
+    antes = linhas[:bisect_right(linhas, retomada)]
+    depois = linhas[bisect_right(linhas, fim_relexado - delta):]
+    novo.inicios_linha = antes + novas_linhas + _deslocar(depois, delta)
+
+    for posicao in invalidos:
+        diagnosticos.append((posicao, _diagnostico_lexico(novo, posicao)))
+    return novo, inicio, fim_antigo, inicio + len(novos_tipos)
+
+
+def _diagnostico_lexico(tokens, posicao):
+    # mesmo Diagnostico do scanner, com a linha tirada do deslocamento
+    return diagnostico_lexico(tokens.fonte[posicao], bisect_right(tokens.inicios_linha, posicao))
+
+
+def _deslocar(coluna, delta):
+    if not delta:
+        return coluna
+    return array(coluna.typecode, map(delta.__add__, coluna))
+
+
+class EstadoIncremental:
+    """
+    Resultado de uma análise incremental:
+    `tokens` (TokenBuffer), `ids` (ids de terminal do LL(1)), `pontos`
+    ({posição do token: pilha} gravados depois de cada casamento em
+    múltiplos do intervalo), `erros` (lista de (posição, Diagnostico)) e
+    `lexicos` (lista de (deslocamento no fonte, Diagnostico) dos caracteres
+    inválidos, que o scanner ignorou). `relexados` e `passos` dizem quanto
+    trabalho a última operação fez.
+    """
+
+    __slots__ = ("tokens", "ids", "pontos", "erros", "lexicos", "relexados", "passos")
+
+    def __init__(self, tokens, ids, pontos, erros, relexados, passos, lexicos=()):
+        self.tokens = tokens
+        self.ids = ids
+        self.pontos = pontos
+        self.erros = erros
+        self.lexicos = list(lexicos)
+        self.relexados = relexados
+        self.passos = passos
+
+    @property
+    def diagnosticos(self):
+        # como na análise em lote: os léxicos antes dos sintáticos
+        return [d for _, d in self.lexicos] + [d for _, d in self.erros]
+
+    @property
+    def aceito(self):
+        return not self.erros and not self.lexicos
+
+
+class AnalisadorIncremental:
+    """
+    Envolve um AnalisadorSintaticoLL1 e mantém pontos de controle da pilha
+    para reanalisar só o trecho afetado por uma edição.
+
+    A análise LL(1) sem rastro depende apenas da pilha e dos tokens que
+    faltam. Depois de uma edição ela recomeça do último ponto de controle
+    antes dos tokens alterados e, passada a região alterada, para no
+    primeiro ponto antigo cuja pilha é igual à atual: o resto seria idêntico
+    e é reaproveitado (erros e pontos antigos só mudam de posição).
+    """
+
+    def __init__(self, parser, intervalo=INTERVALO_PADRAO):
+        self.parser = parser
+        self.intervalo = intervalo
+        tab = parser.compilada
+        self._traducao = [tab.ids.get(nome, tab.desconhecido) for nome in TIPOS_TOKEN]
+
+    def analisar(self, codigo):
+        """
+        Análise completa de `codigo`; o estado devolvido serve de base para editar().
+        """
+        diagnosticos = []
+        tokens = analisador_lexico_buffer(codigo, diagnosticos)
+        lexicos = []
+        if diagnosticos:
+            # o scanner não guarda onde estava cada caractere ignorado: só
+            # neste caso raro o fonte é percorrido de novo para achá-los
+            invalidos = (c.start("INCOMPAT") for c in _PADRAO.finditer(codigo) if c.lastgroup == "INCOMPAT")
+            lexicos = list(zip(invalidos, diagnosticos))
+        tab = self.parser.compilada
+        ids = [self._traducao[t] for t in tokens.tipos]
+
+        pilha = [tab.eof, tab.inicial]
+        pontos = {0: tuple(pilha)}
+        erros = []
+        passos = self._executar(tokens, ids, pilha, 0, pontos, erros)[1]
+        return EstadoIncremental(tokens, ids, pontos, erros, len(tokens), passos, lexicos)
+
+    def editar(self, estado, deslocamento, removidos, inseridos):
+        """
+        Aplica a edição ao estado anterior e devolve um novo estado
+        (o anterior não é alterado).
+        """
+        novos_lexicos = []
+        tokens, inicio, fim_antigo, fim_novo = relexar(estado.tokens, deslocamento, removidos, inseridos,
+                                                       novos_lexicos)
+        variacao = fim_novo - fim_antigo
+
+        # erros léxicos: os de antes do trecho reanalisado ficam, os de
+        # dentro dele são os novos e os de depois só andam com o texto
+        anteriores = estado.tokens
+        inicio_trecho = anteriores.inicios[inicio - 1] + anteriores.comprimentos[inicio - 1] if inicio else 0
+        fim_trecho = anteriores.inicios[fim_antigo]
+        delta = len(tokens.fonte) - len(anteriores.fonte)
+        lexicos = [(p, d) for p, d in estado.lexicos if p < inicio_trecho] + novos_lexicos
+        lexicos.extend((p + delta, _diagnostico_lexico(tokens, p + delta))
+                       for p, _ in estado.lexicos if p >= fim_trecho)
+
+        trecho = [self._traducao[t] for t in tokens.tipos[inicio:fim_novo]]
+        ids = estado.ids[:inicio] + trecho + estado.ids[fim_antigo:]
+
+        # último ponto de controle antes do primeiro token alterado
+        posicoes = list(estado.pontos)
+        retomada = posicoes[bisect_right(posicoes, inicio) - 1]
+
+        pontos = {p: pilha for p, pilha in estado.pontos.items() if p <= retomada}
+        erros = [(p, d) for p, d in estado.erros if p < retomada]
+
+        antigos = {p: pilha for p, pilha in estado.pontos.items() if p >= fim_antigo}
+        sincronia, passos = self._executar(tokens, ids, list(pontos[retomada]), retomada,
+                                           pontos, erros, antigos, fim_novo, variacao)
+
+        if sincronia is not None:
+            # a partir daqui a análise antiga vale, com posições deslocadas
+            for p, pilha in antigos.items():
+                if p >= sincronia:
+                    pontos[p + variacao] = pilha
+            for p, d in estado.erros:
+                if p >= sincronia:
+                    novo = p + variacao
+                    erros.append((novo, d._replace(linha=tokens.linha(min(novo, len(tokens) - 1)))))
+
+        return EstadoIncremental(tokens, ids, pontos, erros, fim_novo - inicio, passos, lexicos)
+
+    def _erro(self, tokens, pos, mensagem):
+        linha = tokens.linha(min(pos, len(tokens) - 1))
+        return (pos, Diagnostico("ll1", linha, mensagem))
+
+    def _executar(self, tokens, ids, pilha, pos, pontos, erros, antigos=None, limite=0, variacao=0):
+        """
+        Mesmo laço de AnalisadorSintaticoLL1.analisar (sem rastro), retomado
+        de (pilha, pos). Grava pontos de controle e, se `antigos` for dado,
+        para assim que, em uma posição >= `limite`, a pilha coincidir com a
+        do ponto antigo correspondente.
+        Devolve (posição antiga da sincronia ou None, passos executados).
+        """
+        tab = self.parser.compilada
+        nomes = tab.simbolos
+        n_colunas = tab.n_colunas
+        celulas = tab.celulas
+        invertidas = tab.invertidas
+        intervalo = self.intervalo
+
+        n = len(ids)
+        ttoken = ids[pos]
+        passos = 0
+
+        while pilha:
+            topo = pilha.pop()
+            passos += 1
+
+            if topo == ttoken:
+                pos += 1
+                if pos < n:
+                    ttoken = ids[pos]
+
+                if antigos is not None and pos >= limite:
+                    pilha_antiga = antigos.get(pos - variacao)
+                    if pilha_antiga is not None and len(pilha_antiga) == len(pilha) \
+                            and pilha_antiga == tuple(pilha):
+                        return pos - variacao, passos
+                if pos % intervalo == 0:
+                    pontos[pos] = tuple(pilha)
+                continue
+
+            elif topo >= n_colunas:
+                regra = celulas[(topo - n_colunas) * n_colunas + ttoken]
+
+                if not regra:
+                    tnome = tokens.tipo(min(pos, n - 1))
+                    erros.append(self._erro(
+                        tokens, pos, f"esperado {tab.esperados[topo - n_colunas]}, encontrado '{tnome}'"))
+
+                    # os ids mudam a cada edição: busca sem converter para bytes
+                    novo = tab.proximo_sincronia(topo, ids, None, pos, min(n, pos + DESCARTE_MAXIMO))
+                    passos += novo - pos
+                    pos = novo
+                    if pos < n:
+                        ttoken = ids[pos]
+                    if not tab.sincronia[topo - n_colunas][ttoken]:
+                        erros.append(self._erro(tokens, pos, mensagem_descarte_esgotado(tokens.tipo(min(pos, n - 1)))))
+                    continue
+
+                pilha.extend(invertidas[regra - 1])
+                continue
+
+            else:
+                tnome = tokens.tipo(min(pos, n - 1))
+                erros.append(self._erro(tokens, pos, f"encontrado '{tnome}', esperado '{nomes[topo]}'"))
+
+                pos += 1
+                if pos < n:
+                    ttoken = ids[pos]
+                else:
+                    break
+
+        return None, passos
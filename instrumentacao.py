@@ -0,0 +1,266 @@
+# instrumentacao.py — Tempos por etapa, picos de memória e contadores dos analisadores
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from rastro import Rastro, criar_rastro
+
+
+class RastroContador(Rastro):
+    """
+    Rastro que agrega contadores a partir dos eventos do analisador e,
+    se houver, repassa cada evento ao rastro `interno` (que continua
+    responsável pelas linhas exibidas). Só existe quando a instrumentação
+    está ligada: desligada, os analisadores nem montam eventos.
+    """
+
+    def __init__(self, interno=None):
+        super().__init__()
+        self.interno = interno = None if interno is None else criar_rastro(interno)
+        self.profundidade_maxima = 0
+        if interno is not None and interno.registrar is not None:
+            self.eventos = interno.eventos
+            self._repassar = interno.registrar
+        else:
+            self._repassar = None
+        self.registrar = self._registrar
+
+    @property
+    def completo(self):
+        return self.interno.completo if self.interno is not None else True
+
+    def vincular(self, renderizador):
+        super().vincular(renderizador)
+        if self.interno is not None:
+            self.interno.vincular(renderizador)
+
+    def limpar(self):
+        super().limpar()
+        if self.interno is not None:
+            self.interno.limpar()
+        self.profundidade_maxima = 0
+
+    def linhas(self, inicio=0, fim=None):
+        if self.interno is None or self._repassar is None:
+            return iter(())
+        return self.interno.linhas(inicio, fim)
+
+    def _registrar(self, evento):
+        self._contar(evento)
+        if self._repassar is not None:
+            self._repassar(evento)
+
+
+class ContadoresLL1(RastroContador):
+    """
+    Eventos do LL(1): (passo, tipo, argumento, posição, profundidade).
+    Com `otimizada` (GramaticaOtimizada), o resumo também traz as
+    expansões traduzidas para as produções da gramática original.
+    """
+
+    def __init__(self, analisador, interno=None, otimizada=None):
+        # o ll1_parser já está carregado quando há um analisador
+        from ll1_parser import EXPANDIR, TIPOS_EVENTO
+
+        super().__init__(interno)
+        self.analisador = analisador
+        self.otimizada = otimizada
+        self.tipos = [0] * TIPOS_EVENTO
+        self.producoes = Counter()
+        self._expandir = EXPANDIR
+
+    def limpar(self):
+        super().limpar()
+        self.tipos = [0] * len(self.tipos)
+        self.producoes = Counter()
+
+    def _contar(self, evento):
+        tipo = evento[1]
+        self.tipos[tipo] += 1
+        if tipo == self._expandir:
+            self.producoes[evento[2]] += 1
+        if evento[4] > self.profundidade_maxima:
+            self.profundidade_maxima = evento[4]
+
+    def resumo(self):
+        from ll1_parser import CASAR, DESCARTE, ERRO, ERRO_TERMINAL, EXPANDIR
+
+        tab = self.analisador.compilada
+        vazias = sum(n for p, n in self.producoes.items() if not tab.producoes[p])
+        resumo = {
+            "expansoes": self.tipos[EXPANDIR],
+            "casamentos": self.tipos[CASAR],
+            "expansoes_vazias": vazias,
+            "erros": self.tipos[ERRO] + self.tipos[ERRO_TERMINAL],
+            "descartes_panico": self.tipos[DESCARTE],
+            # profundidade da pilha antes de cada desempilhamento, + o topo
+            "profundidade_maxima": self.profundidade_maxima + 1,
+            "expansoes_por_producao": {
+                _texto_producao(tab.simbolos[tab.cabecas[p]], tab.originais[p]): n
+                for p, n in self.producoes.most_common()
+            },
+        }
+        if self.otimizada is not None:
+            resumo["expansoes_por_producao_original"] = _traduzir(self.otimizada, {
+                (tab.simbolos[tab.cabecas[p]], tuple(tab.originais[p])): n for p, n in self.producoes.items()
+            })
+        return resumo
+
+
+class ContadoresSLR(RastroContador):
+    """
+    Eventos do SLR/LALR: (passo, tipo, valor, posição, pilha, profundidade).
+    `otimizada` como em ContadoresLL1, para as reduções.
+    """
+
+    def __init__(self, interno=None, otimizada=None):
+        super().__init__(interno)
+        self.otimizada = otimizada
+        self.tipos = Counter()
+        self.reducoes = Counter()
+        self.descartes = 0
+
+    def _contar(self, evento):
+        tipo = evento[1]
+        self.tipos[tipo] += 1
+        if tipo == "reduce":
+            self.reducoes[evento[2]] += 1
+        elif tipo == "recuperado":
+            self.descartes += evento[2][1]
+        if evento[5] > self.profundidade_maxima:
+            self.profundidade_maxima = evento[5]
+
+    def resumo(self):
+        resumo = {
+            "shifts": self.tipos["shift"],
+            "reduces": self.tipos["reduce"],
+            "erros": self.tipos["erro"],
+            "descartes_panico": self.descartes,
+            "profundidade_maxima": self.profundidade_maxima,
+            "reduces_por_producao": {
+                _texto_producao(A, prod): n for (A, prod), n in self.reducoes.most_common()
+            },
+        }
+        if self.otimizada is not None:
+            resumo["reduces_por_producao_original"] = _traduzir(self.otimizada, self.reducoes)
+        return resumo
+
+
+def _texto_producao(cabeca, producao):
+    corpo = [x for x in producao if x != "ε"]
+    return f"{cabeca} → {' '.join(corpo) if corpo else 'ε'}"
+
+
+def _traduzir(otimizada, contagem):
+    traduzida = Counter(otimizada.traduzir_contagem(contagem))
+    return {_texto_producao(A, prod): n for (A, prod), n in traduzida.most_common()}
+
+
+class Instrumentacao:
+    """
+    Coleta, por etapa, tempo de parede (perf_counter), tempo de CPU
+    (process_time) e, com `memoria=True`, o pico de memória alocada
+    (tracemalloc). `contadores_ll1`/`contadores_slr` embrulham o rastro
+    de cada analisador para contar os passos.
+
+    `relatorio()` devolve tudo como dicionário; `finalizar()` também grava
+    o JSON em `caminho` e chama `ao_terminar(relatorio)`, se dados.
+    """
+
+    ligada = True
+
+    def __init__(self, memoria=False, caminho=None, ao_terminar=None):
+        self.memoria = memoria
+        self.caminho = caminho
+        self.ao_terminar = ao_terminar
+        self.etapas = {}
+        self._contadores = {}
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def etapa(self, nome):
+        if self.memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            medida = {
+                "parede": time.perf_counter() - inicio,
+                "cpu": time.process_time() - inicio_cpu,
+            }
+            if self.memoria:
+                medida["pico_memoria"] = tracemalloc.get_traced_memory()[1] - base
+            self.etapas[nome] = medida
+
+    def contadores_ll1(self, analisador, interno=None, otimizada=None):
+        contador = self._contadores["ll1"] = ContadoresLL1(analisador, interno, otimizada)
+        return contador
+
+    def contadores_slr(self, interno=None, nome="slr", otimizada=None):
+        contador = self._contadores[nome] = ContadoresSLR(interno, otimizada)
+        return contador
+
+    def contadores_prontos(self, nome, resumo):
+        """
+        Resumo de contadores feitos em outro processo (paralelo.py).
+        """
+        self._contadores[nome] = resumo
+
+    def relatorio(self):
+        return {
+            "etapas": self.etapas,
+            "contadores": {nome: c if isinstance(c, dict) else c.resumo() for nome, c in self._contadores.items()},
+            "total": {
+                "parede": time.perf_counter() - self._inicio,
+                "cpu": time.process_time() - self._inicio_cpu,
+            },
+        }
+
+    def finalizar(self):
+        relatorio = self.relatorio()
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if self.caminho:
+            with open(self.caminho, "w", encoding="utf-8") as f:
+                json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        if self.ao_terminar is not None:
+            self.ao_terminar(relatorio)
+        return relatorio
+
+
+class InstrumentacaoDesligada:
+    """
+    Mesma interface, sem custo: etapas são um contexto vazio e os
+    rastros passam direto, sem embrulho.
+    """
+
+    ligada = False
+    _vazio = nullcontext()
+
+    def etapa(self, nome):
+        return self._vazio
+
+    def contadores_ll1(self, analisador, interno=None, otimizada=None):
+        return interno
+
+    def contadores_slr(self, interno=None, nome="slr", otimizada=None):
+        return interno
+
+    def contadores_prontos(self, nome, resumo):
+        pass
+
+    def relatorio(self):
+        return None
+
+    def finalizar(self):
+        return None
+
+
+DESLIGADA = InstrumentacaoDesligada()
@@ -1,150 +1,446 @@
 # ll1_parser.py
-from grammar import grammar, first, follow
-from tabulate import tabulate
+import re
+from array import array
+
+from arvore import NENHUM
+from grammar import grammar, analyze
+from diagnosticos import Diagnostico
+from rastro import COMPLETO, criar_rastro
+from scanner import TIPOS_TOKEN, TokenBuffer
+
+# Terminais que, além do FOLLOW, encerram o descarte do modo pânico
+SINCRONIA_EXTRA = ()
+
+# Máximo de tokens descartados em um único erro (limita o trabalho por erro)
+DESCARTE_MAXIMO = 1000
+
+# Tipos de evento gravados no rastro: (passo, tipo, argumento, posição do token, profundidade da pilha)
+# O argumento é o símbolo desempilhado, ou o id da produção em EXPANDIR.
+# DESCARTE_ESGOTADO fecha o modo pânico no lugar de RECUPERADO quando os
+# DESCARTE_MAXIMO tokens acabam sem chegar a um token de sincronia.
+CASAR, EXPANDIR, ERRO, DESCARTE, RECUPERADO, ERRO_TERMINAL, DESCARTE_ESGOTADO = range(7)
+TIPOS_EVENTO = 7
+
+
+def mensagem_descarte_esgotado(tnome):
+    """
+    Diagnóstico do modo pânico que parou pelo limite de descarte, e não
+    num token de sincronia (também usado por incremental.py e pelo
+    analisador gerado).
+    """
+    return f"descarte máximo atingido ({DESCARTE_MAXIMO} tokens) sem token de sincronia; retomando em '{tnome}'"
+
+
+class TabelaLL1Compilada:
+    """
+    Tabela LL(1) com símbolos internados como inteiros.
+
+    Terminais recebem os ids 0..n_terminais-1 e a coluna n_terminais é
+    reservada para tokens que a gramática não conhece. Não-terminais vêm
+    em seguida, a partir de n_colunas; assim `x < n_colunas` já diz se o
+    símbolo é terminal. A tabela é uma matriz densa em um único array,
+    indexada por (nt - n_colunas) * n_colunas + terminal, e guarda o
+    id da produção + 1 (0 = erro).
+    """
+
+    def __init__(self, gramatica, tabela, simbolo_inicial):
+        terminais = []
+        vistos = set()
+        for producoes in gramatica.values():
+            for producao in producoes:
+                for simbolo in producao:
+                    if simbolo not in gramatica and simbolo != "ε" and simbolo not in vistos:
+                        vistos.add(simbolo)
+                        terminais.append(simbolo)
+        for terminal in ["EOF"] + [t for (_, t) in tabela]:
+            if terminal not in vistos:
+                vistos.add(terminal)
+                terminais.append(terminal)
+
+        self.n_terminais = len(terminais)
+        self.n_colunas = self.n_terminais + 1
+        self.simbolos = terminais + ["?"] + list(gramatica)
+        self.ids = {s: i for i, s in enumerate(self.simbolos)}
+        self.desconhecido = self.n_terminais
+        self.inicial = self.ids[simbolo_inicial]
+        self.eof = self.ids["EOF"]
+
+        # produções como tuplas de ids (sem ε); `invertidas` já na ordem de empilhar
+        self.cabecas = []
+        self.producoes = []
+        self.invertidas = []
+        self.originais = []
+        indice = {}
+        for cabeca, producoes in gramatica.items():
+            for producao in producoes:
+                indice[(cabeca, tuple(producao))] = len(self.producoes)
+                ids = tuple(self.ids[x] for x in producao if x != "ε")
+                self.cabecas.append(self.ids[cabeca])
+                self.producoes.append(ids)
+                self.invertidas.append(ids[::-1])
+                self.originais.append(producao)
+
+        tipo = "H" if len(self.producoes) < 0xFFFF else "I"
+        self.celulas = array(tipo, bytes(array(tipo).itemsize * len(gramatica) * self.n_colunas))
+        for (cabeca, terminal), producao in tabela.items():
+            celula = (self.ids[cabeca] - self.n_colunas) * self.n_colunas + self.ids[terminal]
+            self.celulas[celula] = indice[(cabeca, tuple(producao))] + 1
+
+    def definir_sincronia(self, tabela, follow, extras=()):
+        """
+        Pré-calcula, por não-terminal, o que o modo pânico consulta:
+        `esperados` (terminais com entrada na tabela, na ordem da tabela),
+        `sincronia` (bytearray indexado por terminal: 1 se está no FOLLOW,
+        nos `extras` ou é o EOF) e a expressão que acha o próximo token de
+        sincronia na sequência de ids (bytes) sem laço em Python.
+        """
+        n_nt = len(self.simbolos) - self.n_colunas
+        self.esperados = [[] for _ in range(n_nt)]
+        for (cabeca, terminal) in tabela:
+            self.esperados[self.ids[cabeca] - self.n_colunas].append(terminal)
+
+        self.sincronia = []
+        self.busca_sincronia = []
+        for k in range(n_nt):
+            nome = self.simbolos[self.n_colunas + k]
+            marcas = bytearray(self.n_colunas)
+            for terminal in list(follow.get(nome, ())) + list(extras) + ["EOF"]:
+                if terminal in self.ids and self.ids[terminal] < self.n_colunas:
+                    marcas[self.ids[terminal]] = 1
+            self.sincronia.append(marcas)
+            classe = b"".join(re.escape(bytes([t])) for t in range(self.n_colunas) if marcas[t])
+            self.busca_sincronia.append(re.compile(b"[" + classe + b"]") if self.n_colunas <= 256 else None)
+
+    def proximo_sincronia(self, nt, ids, ids_bytes, pos, limite):
+        """
+        Primeira posição em [pos, limite) com token de sincronia de `nt`,
+        ou `limite` se não houver.
+        """
+        busca = self.busca_sincronia[nt - self.n_colunas]
+        if busca is not None and ids_bytes is not None:
+            achado = busca.search(ids_bytes, pos, limite)
+            return achado.start() if achado else limite
+        marcas = self.sincronia[nt - self.n_colunas]
+        while pos < limite and not marcas[ids[pos]]:
+            pos += 1
+        return pos
+
+    def ids_tokens(self, tokens):
+        """
+        Converte os tipos dos tokens (lista de tuplas ou TokenBuffer)
+        para ids de terminal.
+        """
+        ids = self.ids
+        desconhecido = self.desconhecido
+        if isinstance(tokens, TokenBuffer):
+            # traduz a coluna de tipos do scanner sem montar tuplas
+            traducao = [ids.get(nome, desconhecido) for nome in TIPOS_TOKEN]
+            return [traducao[t] for t in tokens.tipos]
+        return [ids.get(tk[0], desconhecido) for tk in tokens]
+
+    def producao(self, nt, terminal):
+        """
+        Id da produção para (nt, terminal) ou -1 se a célula é erro.
+        """
+        return self.celulas[(nt - self.n_colunas) * self.n_colunas + terminal] - 1
+
+
+class RenderizadorLL1:
+    """
+    Gera as linhas [Passo, Pilha, Entrada, Ação] a partir dos eventos do LL(1).
+
+    A pilha de cada passo não é guardada no evento: ela é reconstruída
+    reaplicando os eventos a partir da pilha inicial (rastro completo) ou
+    desfazendo-os a partir da pilha final (anel com os últimos passos).
+    """
+
+    _DESEMPILHAM = (CASAR, EXPANDIR, ERRO, ERRO_TERMINAL)
+
+    def __init__(self, analisador, tokens, pilha_final):
+        self.analisador = analisador
+        self.tab = analisador.compilada
+        self.tokens = tokens
+        self.pilha_final = list(pilha_final)
+
+    def _aplica(self, pilha, evento):
+        tipo = evento[1]
+        if tipo in self._DESEMPILHAM:
+            pilha.pop()
+            if tipo == EXPANDIR:
+                pilha.extend(self.tab.invertidas[evento[2]])
+
+    def _desfaz(self, pilha, evento):
+        tipo, arg = evento[1], evento[2]
+        if tipo == EXPANDIR:
+            tamanho = len(self.tab.producoes[arg])
+            if tamanho:
+                del pilha[-tamanho:]
+            pilha.append(self.tab.cabecas[arg])
+        elif tipo in self._DESEMPILHAM:
+            pilha.append(arg)
+
+    def linhas(self, eventos, inicio, fim, completo):
+        tab = self.tab
+        if completo and inicio <= len(eventos) - fim:
+            pilha = [tab.eof, tab.inicial]
+            for k in range(inicio):
+                self._aplica(pilha, eventos[k])
+        else:
+            pilha = list(self.pilha_final)
+            for k in range(len(eventos) - 1, inicio - 1, -1):
+                self._desfaz(pilha, eventos[k])
+
+        for k in range(inicio, fim):
+            evento = eventos[k]
+            yield self._linha(evento, pilha)
+            self._aplica(pilha, evento)
+
+    def _linha(self, evento, pilha):
+        num, tipo, arg, pos, _ = evento
+        nomes = self.tab.simbolos
+
+        visivel = pilha[:-1] if tipo in self._DESEMPILHAM else pilha
+        pilha_visivel = " ".join([nomes[x] for x in reversed(visivel)])
+        tnome = self.tokens[min(pos, len(self.tokens) - 1)][0]
+
+        if tipo == CASAR:
+            acao = f"casar '{tnome}'"
+        elif tipo == EXPANDIR:
+            producao = self.tab.originais[arg]
+            acao = f"expandir {nomes[self.tab.cabecas[arg]]} → {' '.join(producao) if producao else 'ε'}"
+        elif tipo == ERRO:
+            esperados = self.tab.esperados[arg - self.tab.n_colunas]
+            acao = f"ERRO – esperado {esperados}, encontrado '{tnome}' → entrando em modo pânico"
+        elif tipo == DESCARTE:
+            acao = f"descartando token '{tnome}' (modo pânico)"
+        elif tipo == RECUPERADO:
+            acao = f"recuperação concluída — token '{tnome}' está no FOLLOW({nomes[arg]})"
+        elif tipo == DESCARTE_ESGOTADO:
+            acao = (f"descarte máximo atingido ({DESCARTE_MAXIMO} tokens) — retomando em '{tnome}', "
+                    f"fora do FOLLOW({nomes[arg]})")
+        else:
+            acao = f"ERRO – encontrado '{tnome}', esperado '{nomes[arg]}'"
+
+        return [num, pilha_visivel, tnome, acao]
+
 
 class AnalisadorSintaticoLL1:
 
-    def __init__(self, gramatica):
+    def __init__(self, gramatica, tabela=None, sincronia_extra=SINCRONIA_EXTRA):
         self.gramatica = gramatica
         self.simbolo_inicial = "PROGRAMA_G"
-        self.analiseTabela = self.TabelaLL1()
+        # tabela pronta (ex.: vinda do cache_tabelas) evita reconstruí-la
+        self.analiseTabela = tabela if tabela is not None else self.TabelaLL1()
+        self.compilada = TabelaLL1Compilada(gramatica, self.analiseTabela, self.simbolo_inicial)
+        # esperados e conjuntos de sincronia do modo pânico, uma vez só
+        follow = analyze(gramatica, self.simbolo_inicial).follow
+        self.compilada.definir_sincronia(self.analiseTabela, follow, sincronia_extra)
 
     def TabelaLL1(self):
         tabela = {}
+        analise = analyze(self.gramatica, self.simbolo_inicial)
 
         for cabeca, producoes in self.gramatica.items():
-            for producao in producoes:
-                conjPrimeiro = set()
-                encontrou_vazio = True
-
-                for simbolo in producao:
-                    primeiros = first(simbolo, self.gramatica)
-                    conjPrimeiro |= (primeiros - {"ε"})
-                    if "ε" not in primeiros:
-                        encontrou_vazio = False
-                        break
-
-                if encontrou_vazio:
-                    conjPrimeiro.add("ε")
+            for i, producao in enumerate(producoes):
+                conjPrimeiro = analise.first_prod[(cabeca, i)]
 
                 for simbolo in conjPrimeiro - {"ε"}:
                     tabela[(cabeca, simbolo)] = producao
 
                 if "ε" in conjPrimeiro:
-                    for simbolo in follow(cabeca, self.gramatica, self.simbolo_inicial):
+                    for simbolo in analise.follow[cabeca]:
                         tabela[(cabeca, simbolo)] = producao
 
         return tabela
-    def analisar(self, tokens):
-
-        passos = []       
-        Contador = 1      
-
-        pilha = ["EOF", self.simbolo_inicial]
+    def esperados(self, nao_terminal):
+        """
+        Terminais com entrada na tabela para o não-terminal.
+        """
+        return list(self.compilada.esperados[self.compilada.ids[nao_terminal] - self.compilada.n_colunas])
+
+    def _diagnostico(self, tokens, pos, mensagem):
+        linha = tokens[min(pos, len(tokens) - 1)][2]
+        return Diagnostico("ll1", linha, mensagem)
+
+    def analisar(self, tokens, rastro=COMPLETO, diagnosticos=None, exibir=True, arvore=None):
+        """
+        Analisa a lista de tokens. `rastro` é um nível ("desligado", "anel",
+        "completo") ou um objeto Rastro; o rastro preenchido é devolvido e
+        se comporta como a lista de passos [Passo, Pilha, Entrada, Ação].
+        Se `diagnosticos` for uma lista, cada erro sintático é anexado a ela
+        como Diagnostico; `exibir=False` não imprime nada.
+        Se `arvore` for uma ArvoreSintatica, ela recebe a árvore concreta.
+        """
+        rastro = criar_rastro(rastro)
+        registrar = rastro.registrar
+        Contador = 1
+
+        tab = self.compilada
+        nomes = tab.simbolos
+        n_colunas = tab.n_colunas
+        celulas = tab.celulas
+        invertidas = tab.invertidas
+        eof = tab.eof
+
+        ids = tab.ids_tokens(tokens)
+        n = len(tokens)
+
+        # tabelas do modo pânico; os ids viram bytes só no primeiro erro
+        esperados = tab.esperados
+        sincronia = tab.sincronia
+        ids_bytes = None
+
+        pilha = [eof, tab.inicial]
         pos = 0
-        ttoken = tokens[pos][0]
+        ttoken = ids[pos]
+
+        # pilha de nós paralela à de símbolos (o EOF do fundo não tem nó)
+        nos = None
+        if arvore is not None:
+            arvore.reiniciar(nomes, tokens)
+            arvore.raiz = arvore.novo(tab.inicial)
+            nos = [NENHUM, arvore.raiz]
+            no_tipo, no_filho, no_irmao = arvore.tipo, arvore.filho, arvore.irmao
+            no_token, no_producao = arvore.token, arvore.producao
+            producoes = tab.producoes
+            vazios = [array("i", [NENHUM]) * len(p) for p in producoes]
 
         while pilha:
             topo = pilha.pop()
-            entrada_atual = ttoken
-            pilha_visivel = " ".join(pilha[::-1])
-            acao = ""
 
             # Caso 1: casamento de token
             if topo == ttoken:
-                acao = f"casar '{ttoken}'"
-                passos.append([Contador, pilha_visivel, entrada_atual, acao])
+                if registrar:
+                    registrar((Contador, CASAR, topo, pos, len(pilha)))
+                if nos is not None:
+                    no = nos.pop()
+                    if no >= 0:
+                        no_token[no] = pos
 
                 pos += 1
-                if pos < len(tokens):
-                    ttoken = tokens[pos][0]
-
-                # print(f"{Contador} - {pilha}")
+                if pos < n:
+                    ttoken = ids[pos]
 
                 Contador += 1
                 continue
 
             # Caso 2: topo é não-terminal
-            elif topo in self.gramatica:
-                regra = self.analiseTabela.get((topo, ttoken))
+            elif topo >= n_colunas:
+                regra = celulas[(topo - n_colunas) * n_colunas + ttoken]
 
                 # ERRO SINTÁTICO
                 if not regra:
-                    esperados = [k[1] for k in self.analiseTabela if k[0] == topo]
-                    acao = f"ERRO – esperado {esperados}, encontrado '{ttoken}' → entrando em modo pânico"
-                    passos.append([Contador, pilha_visivel, entrada_atual, acao])
-                    # print(f"{Contador} - {pilha}")
+                    if registrar:
+                        registrar((Contador, ERRO, topo, pos, len(pilha)))
+                    if nos is not None:
+                        nos.pop()
+                    if diagnosticos is not None:
+                        tnome = tokens[min(pos, n - 1)][0]
+                        diagnosticos.append(self._diagnostico(
+                            tokens, pos, f"esperado {esperados[topo - n_colunas]}, encontrado '{tnome}'"))
                     Contador += 1
 
-                    follow_topo = follow(topo, self.gramatica, self.simbolo_inicial)
-
-                    while ttoken not in follow_topo and ttoken != "EOF":
-                        acao = f"descartando token '{ttoken}' (modo pânico)"
-                        passos.append([Contador, pilha_visivel, entrada_atual, acao])
-
-                        pos += 1
-                        if pos < len(tokens):
-                            ttoken = tokens[pos][0]
-                            entrada_atual = ttoken
-                        else:
-                            break
-
-                        # print(f"{Contador} - {pilha}")
-
-                        Contador += 1
-
-                    acao = f"recuperação concluída — token '{ttoken}' está no FOLLOW({topo})"
-                    passos.append([Contador, pilha_visivel, entrada_atual, acao])
+                    # descarta até um token de sincronia de `topo` (FOLLOW,
+                    # extras ou EOF), no máximo DESCARTE_MAXIMO tokens
+                    fim = min(n, pos + DESCARTE_MAXIMO)
+                    marcas = sincronia[topo - n_colunas]
+                    if registrar:
+                        while pos < fim and not marcas[ttoken]:
+                            registrar((Contador, DESCARTE, topo, pos, len(pilha)))
+                            pos += 1
+                            if pos < n:
+                                ttoken = ids[pos]
+                            Contador += 1
+                    else:
+                        if ids_bytes is None and n_colunas <= 256:
+                            ids_bytes = bytes(ids)
+                        novo = tab.proximo_sincronia(topo, ids, ids_bytes, pos, fim)
+                        Contador += novo - pos
+                        pos = novo
+                        if pos < n:
+                            ttoken = ids[pos]
+
+                    # o EOF é de sincronia: sem ela aqui, o limite parou o descarte
+                    esgotado = not marcas[ttoken]
+                    if esgotado and diagnosticos is not None:
+                        diagnosticos.append(self._diagnostico(
+                            tokens, pos, mensagem_descarte_esgotado(tokens[min(pos, n - 1)][0])))
+                    if registrar:
+                        registrar((Contador, DESCARTE_ESGOTADO if esgotado else RECUPERADO, topo, pos, len(pilha)))
                     Contador += 1
                     continue
 
                 # EXPANSÃO DE REGRA
-                acao = f"expandir {topo} → {' '.join(regra) if regra else 'ε'}"
-                passos.append([Contador, pilha_visivel, entrada_atual, acao])
-
-                for simbolo in reversed(regra):
-                    if simbolo != "ε":
-                        pilha.append(simbolo)
-
-                # print(f"{Contador} - {pilha}")
-
-                Contador += 1
-                continue
+                if registrar:
+                    registrar((Contador, EXPANDIR, regra - 1, pos, len(pilha)))
+
+                pilha.extend(invertidas[regra - 1])
+                if nos is not None:
+                    # filhos criados lado a lado no fim da arena
+                    no = nos.pop()
+                    no_producao[no] = regra - 1
+                    filhos = producoes[regra - 1]
+                    if filhos:
+                        primeiro = len(no_tipo)
+                        ultimo = primeiro + len(filhos)
+                        vazio = vazios[regra - 1]
+                        no_filho[no] = primeiro
+                        no_tipo.extend(filhos)
+                        no_filho.extend(vazio)
+                        no_token.extend(vazio)
+                        no_producao.extend(vazio)
+                        no_irmao.extend(range(primeiro + 1, ultimo))
+                        no_irmao.append(NENHUM)
+                        nos.extend(range(ultimo - 1, primeiro - 1, -1))
 
-            # Caso 3: topo é epsilon
-            elif topo == "ε":
-                acao = "produz ε"
-                passos.append([Contador, pilha_visivel, entrada_atual, acao])
-                # print(f"{Contador} - {pilha}")
                 Contador += 1
                 continue
 
-            # Caso 4: erro inesperado
+            # Caso 3: erro inesperado (terminal no topo diferente da entrada)
             else:
-                acao = f"ERRO – encontrado '{ttoken}', esperado '{topo}'"
-                passos.append([Contador, pilha_visivel, entrada_atual, acao])
+                if registrar:
+                    registrar((Contador, ERRO_TERMINAL, topo, pos, len(pilha)))
+                if nos is not None:
+                    nos.pop()
+                if diagnosticos is not None:
+                    tnome = tokens[min(pos, n - 1)][0]
+                    diagnosticos.append(self._diagnostico(
+                        tokens, pos, f"encontrado '{tnome}', esperado '{nomes[topo]}'"))
 
                 pos += 1
-                if pos < len(tokens):
-                    ttoken = tokens[pos][0]
+                if pos < n:
+                    ttoken = ids[pos]
                 else:
                     break
 
-                # print(f"{Contador} - {pilha}")
-
                 Contador += 1
                 continue
 
-        estadosFinais = passos[-25:] if len(passos) > 25 else passos
+        if registrar:
+            rastro.vincular(RenderizadorLL1(self, tokens, pilha))
+
+        if exibir:
+            exibir_resultado(rastro)
+
+        return rastro
 
+
+def exibir_resultado(rastro):
+    """
+    Imprime os últimos 25 passos (se o rastro está ligado) e a conclusão
+    da análise; usado também pelo analisador gerado (gerador_descendente.py).
+    """
+    if rastro.registrar:
+        # tabulate só é carregado quando a tabela é exibida
+        from tabulate import tabulate
+
+        # só as linhas exibidas são convertidas em texto
         print("\n=== TABELA DO PROCESSO DA ANÁLISE LL(1) — ÚLTIMOS 25 PASSOS ===\n")
         print(tabulate(
-            estadosFinais,
+            rastro[-25:],
             headers=["Passo", "Pilha", "Entrada", "Ação"],
             tablefmt="fancy_grid",
             maxcolwidths=[6, 40, 12, 50]
         ))
 
-        print("\nAnálise sintática concluída (modo pânico ativo).")
-
-        return passos
\ No newline at end of file
+    print("\nAnálise sintática concluída (modo pânico ativo).")
@@ -0,0 +1,170 @@
+# lote.py — Compilação em lote de vários arquivos .br em um pool de processos
+#
+# Uso: python lote.py <diretório ou glob> [--processos N] [--metodo slr|lalr] [--json resumo.json]
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_tabelas import obter_tabelas
+from diagnosticos import formatar
+from grammar import grammar
+
+# Contexto de cada processo: tabelas já prontas (herdadas no fork ou
+# desserializadas uma vez no inicializador do processo).
+_contexto = None
+
+
+class _Contexto:
+    def __init__(self, tabelas, metodo):
+        from ll1_parser import AnalisadorSintaticoLL1
+
+        self.parser = AnalisadorSintaticoLL1(grammar, tabelas.ll1)
+        self.tabelas_lr = tabelas.lr(metodo)
+        self.metodo = metodo
+
+
+def _inicializar(payload):
+    global _contexto
+    if payload is not None:
+        tabelas, metodo = pickle.loads(payload)
+        _contexto = _Contexto(tabelas, metodo)
+
+
+def listar_fontes(entrada):
+    """
+    Arquivos .br de um diretório (recursivo) ou de um padrão glob, em ordem.
+    """
+    if os.path.isdir(entrada):
+        padrao = os.path.join(entrada, "**", "*.br")
+    else:
+        padrao = entrada
+    return sorted(c for c in glob.glob(padrao, recursive=True) if os.path.isfile(c))
+
+
+def compilar_arquivo(caminho, contexto=None):
+    """
+    Análise léxica, LL(1) e LR de um arquivo, sem rastro e sem impressão.
+    Devolve um dicionário com contagem de tokens, aceitação, erros e tempos.
+    """
+    from scanner import analisador_lexico_buffer
+    from slr_parser import analisar_slr
+
+    contexto = contexto or _contexto
+    resultado = {"arquivo": caminho, "tokens": 0, "ll1_aceito": False, "lr_aceito": False,
+                 "erros": [], "tempos": {}}
+    inicio = time.perf_counter()
+
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            codigo = f.read()
+
+        diagnosticos = []
+        t = time.perf_counter()
+        tokens = analisador_lexico_buffer(codigo, diagnosticos)
+        resultado["tempos"]["lexico"] = time.perf_counter() - t
+        resultado["tokens"] = len(tokens)
+        n_lexico = len(diagnosticos)
+
+        t = time.perf_counter()
+        contexto.parser.analisar(tokens, "desligado", diagnosticos, exibir=False)
+        resultado["tempos"]["ll1"] = time.perf_counter() - t
+        n_ll1 = len(diagnosticos)
+        resultado["ll1_aceito"] = n_ll1 == 0
+
+        t = time.perf_counter()
+        analisar_slr(tokens, grammar, contexto.tabelas_lr, "desligado",
+                     diagnosticos=diagnosticos, exibir=False)
+        resultado["tempos"][contexto.metodo] = time.perf_counter() - t
+        resultado["lr_aceito"] = n_lexico == 0 and len(diagnosticos) == n_ll1
+
+        resultado["erros"] = [formatar(d) for d in diagnosticos]
+    except (OSError, UnicodeDecodeError) as erro:
+        resultado["erros"].append(f"[{type(erro).__name__}] {erro}")
+
+    resultado["tempos"]["total"] = time.perf_counter() - inicio
+    return resultado
+
+
+def compilar_lote(entrada, processos=None, metodo="slr"):
+    """
+    Compila todos os .br de `entrada` (diretório, glob ou lista de caminhos).
+
+    As tabelas são obtidas uma vez (cache em disco) no processo principal.
+    Com fork os processos filhos as herdam sem cópia explícita; nos demais
+    métodos de início elas vão serializadas uma vez por processo.
+    Devolve o resumo com os resultados na ordem dos arquivos.
+    """
+    global _contexto
+
+    arquivos = listar_fontes(entrada) if isinstance(entrada, str) else list(entrada)
+    processos = processos or os.cpu_count() or 1
+    tabelas = obter_tabelas(grammar)
+
+    inicio = time.perf_counter()
+    if processos == 1 or len(arquivos) <= 1:
+        contexto = _Contexto(tabelas, metodo)
+        resultados = [compilar_arquivo(c, contexto) for c in arquivos]
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            _contexto = _Contexto(tabelas, metodo)
+            mp, payload = multiprocessing.get_context("fork"), None
+        else:
+            mp = multiprocessing.get_context()
+            payload = pickle.dumps((tabelas, metodo), protocol=pickle.HIGHEST_PROTOCOL)
+
+        # blocos de arquivos por tarefa: menos idas e voltas com arquivos pequenos
+        bloco = max(1, len(arquivos) // (processos * 4))
+        with ProcessPoolExecutor(processos, mp_context=mp, initializer=_inicializar,
+                                 initargs=(payload,)) as executor:
+            resultados = list(executor.map(compilar_arquivo, arquivos, chunksize=bloco))
+    tempo = time.perf_counter() - inicio
+
+    total_tokens = sum(r["tokens"] for r in resultados)
+    return {
+        "arquivos": resultados,
+        "total": len(resultados),
+        "aceitos": sum(1 for r in resultados if r["ll1_aceito"] and r["lr_aceito"]),
+        "rejeitados": sum(1 for r in resultados if not (r["ll1_aceito"] and r["lr_aceito"])),
+        "tokens": total_tokens,
+        "processos": processos,
+        "metodo": metodo,
+        "tempo": tempo,
+        "tokens_por_segundo": total_tokens / tempo if tempo else 0.0,
+    }
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Compila vários arquivos Brick em paralelo.")
+    args.add_argument("entrada", help="diretório (busca *.br recursivamente) ou padrão glob")
+    args.add_argument("--processos", type=int, default=None, help="tamanho do pool (padrão: nº de CPUs)")
+    args.add_argument("--metodo", choices=["slr", "lalr"], default="slr")
+    args.add_argument("--json", help="grava o resumo completo neste arquivo")
+    opcoes = args.parse_args(argv)
+
+    resumo = compilar_lote(opcoes.entrada, opcoes.processos, opcoes.metodo)
+
+    for r in resumo["arquivos"]:
+        estado = "OK  " if r["ll1_aceito"] and r["lr_aceito"] else "ERRO"
+        print(f"{estado} {r['arquivo']} ({r['tokens']} tokens, {r['tempos']['total'] * 1000:.1f} ms)")
+        for erro in r["erros"]:
+            print(f"     {erro}")
+
+    print(f"\n{resumo['total']} arquivos, {resumo['aceitos']} aceitos, {resumo['rejeitados']} rejeitados; "
+          f"{resumo['tokens']} tokens em {resumo['tempo']:.2f} s "
+          f"({resumo['tokens_por_segundo']:,.0f} tokens/s, {resumo['processos']} processos)")
+
+    if opcoes.json:
+        with open(opcoes.json, "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+
+    return 0 if resumo["rejeitados"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,250 @@
-from scanner import analisador_lexico
-from ll1_parser import AnalisadorSintaticoLL1
-from slr_parser import analisar_slr
-from grammar import grammar, first, follow
-from tabela import exibicao  
-from pdf_exporter import gerar_pdf
+# main.py — Linha de comando do compilador Brick
+#
+# Uso: python main.py [arquivo.br] [--etapas lex,ll1,slr,relatorio] [--silencioso] [--formato jsonl|csv|html|pdf]
+#
+# Os módulos de cada etapa (e tabulate, fpdf2, fontTools) só são importados
+# quando a etapa roda; etapas fora de --etapas não fazem trabalho algum.
+# Sai com 1 quando alguma etapa reporta diagnósticos.
+import argparse
+import sys
 
-def execucaoAnalisador(caminho_arquivo: str):
-    with open(caminho_arquivo, "r", encoding="utf-8") as f:
-        codigo = f.read()
+from instrumentacao import DESLIGADA
+from rastro import ANEL, COMPLETO, DESLIGADO, MARCADOR_A_CADA
 
-    print("\n=== ETAPA 1: ANÁLISE LÉXICA ===")
-    tokens = analisador_lexico(codigo)
-    exibicao(tokens)
+ETAPAS = ("lex", "ll1", "slr", "relatorio")
+FORMATOS = ("jsonl", "csv", "html", "pdf")
 
-    print("=== ETAPA 2: FIRST & FOLLOW ===")
-    print("FIRST(PROGRAMA_G):", first("PROGRAMA_G", grammar))
-    print("FOLLOW(PROGRAMA_G):", follow("PROGRAMA_G", grammar, "PROGRAMA_G"))
 
-    print("\n=== ETAPA 3: ANÁLISE SINTÁTICA ===")
-    parser = AnalisadorSintaticoLL1(grammar)
-    passos_ll1 = parser.analisar(tokens)
+def execucaoAnalisador(caminho_arquivo: str, instrumentacao=None, rastro_pdf=None,
+                       marcador_a_cada=MARCADOR_A_CADA, formato="jsonl", saida="relatorio_compilador",
+                       rastro_completo=False, etapas=ETAPAS, silencioso=False, paralelo=None,
+                       descendente=False, otimizar=False, semantica=False):
+    """
+    Executa as `etapas` pedidas sobre o arquivo e devolve os diagnósticos.
+    LL(1) e SLR dependem da léxica, que roda sempre que um deles roda;
+    "relatorio" exporta o que as outras produziram. `silencioso` não
+    imprime tabelas nem rastros, só os diagnósticos.
+
+    Com uma `Instrumentacao`, mede cada etapa e conta os passos dos
+    analisadores (JSON em `instrumentacao.caminho` e/ou `ao_terminar`).
+    Com `rastro_pdf`, guarda o rastro completo dos dois analisadores e
+    o grava nesse PDF (em fluxo, com um marcador a cada `marcador_a_cada` passos).
+    O relatório sai em `formato` com o nome `saida` + extensão; os passos
+    exportados são os últimos 25, ou todos com `rastro_completo`.
+    Com `paralelo` ("processos", "threads" ou "auto"), LL(1) e SLR rodam
+    ao mesmo tempo sobre os mesmos tokens; a saída não muda.
+    Com `descendente`, o LL(1) usa o analisador descendente recursivo
+    gerado da gramática (gerador_descendente.py) no lugar da tabela.
+    Com `otimizar`, os analisadores usam a gramática transformada por
+    otimizacao_gramatica.py (tabelas menores, menos passos por token) e
+    os contadores do perfil também trazem as produções originais.
+    Com `semantica`, o SLR verifica escopos, declarações, aridade e tipos
+    nas próprias reduções (semantica.py); liga a etapa "slr" e não
+    combina com `otimizar` (as ações são das produções do brick.bnf).
+    """
+    if semantica and otimizar:
+        raise ValueError("a análise semântica usa as produções do brick.bnf: não combina com otimizar")
+    etapas = set(etapas)
+    if semantica:
+        etapas.add("slr")
+    if etapas & {"ll1", "slr"}:
+        etapas.add("lex")
+    perfil = instrumentacao or DESLIGADA
+    exibir = not silencioso
+    # sem rastro completo, os relatórios trazem só os últimos 25 passos: basta um anel
+    nivel_rastro = COMPLETO if rastro_pdf or rastro_completo else ANEL
+    if silencioso and not (rastro_pdf or "relatorio" in etapas):
+        nivel_rastro = DESLIGADO
+
+    with perfil.etapa("leitura"):
+        with open(caminho_arquivo, "r", encoding="utf-8") as f:
+            codigo = f.read()
+
+    # erros de todas as etapas, reportados juntos no fim
+    diagnosticos = []
+    tokens, passos_ll1, passos_slr, gram_convertida = [], [], [], {}
+
+    if "lex" in etapas:
+        from scanner import analisador_lexico_buffer
+
+        if exibir:
+            print("\n=== ETAPA 1: ANÁLISE LÉXICA ===")
+        with perfil.etapa("lexico"):
+            tokens = analisador_lexico_buffer(codigo, diagnosticos)
+        if exibir:
+            from tabela import exibicao
+
+            exibicao(tokens)
+
+    otimizada = None
+    if etapas & {"ll1", "slr"}:
+        from cache_tabelas import obter_tabelas
+        from grammar import grammar
+
+        if otimizar:
+            from otimizacao_gramatica import otimizar as otimizar_gramatica
+            from slr_parser import SINCRONIA_SLR
+
+            with perfil.etapa("otimizacao"):
+                otimizada = otimizar_gramatica(grammar, preservar=SINCRONIA_SLR)
+                grammar = otimizada.gramatica
+        # tabelas LL(1) e SLR(1) vêm do cache em disco quando a gramática não mudou
+        with perfil.etapa("tabelas"):
+            tabelas = obter_tabelas(grammar)
+
+    # analisadores que ainda rodam um depois do outro
+    sintaticas = etapas & {"ll1", "slr"}
+    if paralelo and sintaticas == {"ll1", "slr"}:
+        passos_ll1, gram_convertida, passos_slr = _analisar_em_paralelo(
+            tokens, tabelas, grammar, otimizada, paralelo, perfil, nivel_rastro, diagnosticos, exibir, semantica)
+        sintaticas = set()
+
+    if "ll1" in sintaticas:
+        _exibir_first_follow(perfil, exibir)
+        with perfil.etapa("ll1"):
+            if descendente:
+                from gerador_descendente import obter_descendente
+
+                # o módulo gerado tem o mesmo analisar() e a mesma `compilada`
+                parser = obter_descendente(grammar, tabela=tabelas.ll1)
+            else:
+                from ll1_parser import AnalisadorSintaticoLL1
+
+                parser = AnalisadorSintaticoLL1(grammar, tabelas.ll1)
+            passos_ll1 = parser.analisar(tokens, perfil.contadores_ll1(parser, nivel_rastro, otimizada),
+                                         diagnosticos, exibir=exibir)
+
+    if "slr" in sintaticas:
+        from slr_parser import analisar_slr
+
+        analise = None
+        if semantica:
+            from semantica import AnalisadorSemantico
+
+            analise = AnalisadorSemantico()
+        if exibir:
+            print("\n=== ETAPA 4: ANÁLISE SINTÁTICA SLR(1) ===")
+        with perfil.etapa("slr"):
+            gram_convertida, passos_slr = analisar_slr(tokens, grammar, tabelas.lr("slr"),
+                                                       perfil.contadores_slr(nivel_rastro, otimizada=otimizada),
+                                                       diagnosticos=diagnosticos, exibir=exibir, semantica=analise)
+
+    if diagnosticos:
+        from diagnosticos import formatar
+
+        if exibir:
+            print(f"\n=== DIAGNÓSTICOS ({len(diagnosticos)}) ===")
+        for d in diagnosticos:
+            print(formatar(d))
+
+    if "relatorio" in etapas and formato:
+        from exportadores import exportar
+
+        with perfil.etapa("relatorio"):
+            arquivos = exportar(formato, tokens, passos_ll1, passos_slr, gram_convertida, saida)
+        if exibir:
+            print(f"\nRelatório ({formato}): {', '.join(arquivos)}")
+    if rastro_pdf:
+        from pdf_rastro import gerar_pdf_rastro
+
+        with perfil.etapa("pdf_rastro"):
+            paginas = gerar_pdf_rastro(passos_ll1 if "ll1" in etapas else None,
+                                       passos_slr if "slr" in etapas else None, rastro_pdf, marcador_a_cada)
+        if exibir:
+            print(f"\nPDF do rastro completo gerado: {rastro_pdf} ({paginas} páginas)\n")
+    perfil.finalizar()
+    return diagnosticos
+
+
+def _exibir_first_follow(perfil, exibir):
+    from grammar import first, follow, grammar
+
+    if exibir:
+        print("=== ETAPA 2: FIRST & FOLLOW ===")
+        with perfil.etapa("first_follow"):
+            print("FIRST(PROGRAMA_G):", first("PROGRAMA_G", grammar))
+            print("FOLLOW(PROGRAMA_G):", follow("PROGRAMA_G", grammar, "PROGRAMA_G"))
+        print("\n=== ETAPA 3: ANÁLISE SINTÁTICA ===")
+
+
+def _analisar_em_paralelo(tokens, tabelas, gramatica, otimizada, modo, perfil, nivel_rastro, diagnosticos, exibir,
+                          semantica):
+    """
+    LL(1) e SLR ao mesmo tempo (paralelo.py). A saída de cada um é
+    capturada e impressa, como os diagnósticos, na ordem da execução em
+    sequência. O pool fica aberto para as próximas chamadas.
+    """
+    from paralelo import modo_padrao, obter_analisador
+
+    modo = modo_padrao() if modo == "auto" else modo
+    analisador = obter_analisador(tabelas, modo=modo, gramatica=gramatica)
+    with perfil.etapa("ll1_slr_paralelo"):
+        (saida_ll1, diag_ll1, passos_ll1), (saida_slr, diag_slr, passos_slr, G) = analisador.analisar(
+            tokens, nivel_rastro, nivel_rastro, exibir, semantica, perfil, otimizada)
+
+    _exibir_first_follow(perfil, exibir)
+    sys.stdout.write(saida_ll1)
+    if exibir:
+        print("\n=== ETAPA 4: ANÁLISE SINTÁTICA SLR(1) ===")
+    sys.stdout.write(saida_slr)
+    diagnosticos.extend(diag_ll1)
+    diagnosticos.extend(diag_slr)
+    return passos_ll1, G, passos_slr
+
+
+def _lista_etapas(texto):
+    etapas = [e.strip() for e in texto.split(",") if e.strip()]
+    desconhecidas = [e for e in etapas if e not in ETAPAS]
+    if desconhecidas:
+        raise argparse.ArgumentTypeError(f"etapa desconhecida: {', '.join(desconhecidas)} "
+                                         f"(use {','.join(ETAPAS)})")
+    return etapas
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Compilador Brick: análise léxica, LL(1) e SLR(1).")
+    args.add_argument("arquivo", nargs="?", default="app.br")
+    args.add_argument("--etapas", "--stages", type=_lista_etapas, default=list(ETAPAS), metavar="LISTA",
+                      help=f"etapas a executar, separadas por vírgula (padrão: {','.join(ETAPAS)})")
+    args.add_argument("-q", "--silencioso", "--quiet", action="store_true",
+                      help="não imprime tabelas nem rastros; só os diagnósticos")
+    args.add_argument("--formato", choices=FORMATOS + ("nenhum",), default="jsonl",
+                      help="formato do relatório (padrão: jsonl; o PDF é o mais lento)")
+    args.add_argument("--saida", default="relatorio_compilador", help="nome do relatório, sem extensão")
+    args.add_argument("--rastro-completo", action="store_true",
+                      help="exporta todos os passos dos analisadores, não só os últimos 25")
+    args.add_argument("--perfil", metavar="JSON",
+                      help="grava tempos por etapa e contadores dos analisadores neste arquivo")
+    args.add_argument("--perfil-memoria", action="store_true",
+                      help="inclui no perfil o pico de memória de cada etapa (tracemalloc, mais lento)")
+    args.add_argument("--rastro-pdf", metavar="PDF",
+                      help="grava neste PDF o rastro completo do LL(1) e do SLR(1)")
+    args.add_argument("--marcador-a-cada", type=int, default=MARCADOR_A_CADA, metavar="N",
+                      help="passos entre os marcadores do PDF do rastro")
+    args.add_argument("--paralelo", nargs="?", const="auto", choices=["auto", "processos", "threads"],
+                      help="roda LL(1) e SLR ao mesmo tempo (auto: threads sem GIL, senão processos)")
+    args.add_argument("--descendente", action="store_true",
+                      help="LL(1) pelo analisador descendente recursivo gerado da gramática (mais rápido)")
+    args.add_argument("--otimizar", action="store_true",
+                      help="analisa com a gramática otimizada (tabelas menores, menos passos por token)")
+    args.add_argument("--semantica", action="store_true",
+                      help="verifica escopos, declarações, aridade e tipos durante a análise SLR")
+    opcoes = args.parse_args(argv)
+    if opcoes.semantica and opcoes.otimizar:
+        args.error("--semantica usa as produções do brick.bnf: não combina com --otimizar")
+
+    instrumentacao = None
+    if opcoes.perfil:
+        from instrumentacao import Instrumentacao
+
+        instrumentacao = Instrumentacao(memoria=opcoes.perfil_memoria, caminho=opcoes.perfil)
+    formato = None if opcoes.formato == "nenhum" else opcoes.formato
+    diagnosticos = execucaoAnalisador(opcoes.arquivo, instrumentacao, opcoes.rastro_pdf, opcoes.marcador_a_cada,
+                                      formato, opcoes.saida, opcoes.rastro_completo, opcoes.etapas,
+                                      opcoes.silencioso, opcoes.paralelo, opcoes.descendente,
+                                      opcoes.otimizar, opcoes.semantica)
+    return 1 if diagnosticos else 0
 
-    print("\n=== ETAPA 4: ANÁLISE SINTÁTICA SLR(1) ===")
-    gram_convertida, passos_slr = analisar_slr(tokens, grammar)
 
-    gerar_pdf(tokens, passos_ll1, passos_slr, gram_convertida)
 if __name__ == "__main__":
-    execucaoAnalisador("app.br")
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# otimizacao_gramatica.py — Passes que transformam a gramática antes da construção das tabelas LL(1) e SLR
+#
+# Uso: python otimizacao_gramatica.py [--passes inuteis,unitarias,...] [--mostrar]
+#
+# Cada passe recebe e devolve a gramática no formato interno
+# {A: [(corpo, origem), ...]}: `corpo` é a tupla de símbolos (sem ε) e
+# `origem` a tupla de produções ORIGINAIS (A0, corpo0) que aquela produção
+# representa, na ordem em que o LL(1) original as expandiria. É assim que
+# os relatórios traduzem uma expansão/redução da gramática otimizada de
+# volta para as produções do brick.bnf. Todos os passes preservam a
+# linguagem e a propriedade LL(1) da gramática.
+import argparse
+import sys
+
+from grammar import EPS, grammar
+
+
+def _interna(G):
+    return {A: [(tuple(x for x in p if x != EPS), ((A, tuple(x for x in p if x != EPS)),)) for p in prods]
+            for A, prods in G.items()}
+
+
+def _externa(R):
+    return {A: [list(corpo) if corpo else [EPS] for corpo, _ in prods] for A, prods in R.items()}
+
+
+def _sem_repetidas(prods):
+    vistos = set()
+    unicas = []
+    for corpo, origem in prods:
+        if corpo not in vistos:
+            vistos.add(corpo)
+            unicas.append((corpo, origem))
+    return unicas
+
+
+def _usos(R):
+    # não-terminal -> tamanho de cada corpo em que aparece (uma entrada por ocorrência)
+    usos = {}
+    for prods in R.values():
+        for corpo, _ in prods:
+            for x in corpo:
+                if x in R:
+                    usos.setdefault(x, []).append(len(corpo))
+    return usos
+
+
+def _novo_nome(R, base):
+    k = 1
+    while f"{base}{k}" in R:
+        k += 1
+    return f"{base}{k}"
+
+
+def remover_inuteis(R, inicial, preservar=()):
+    """
+    Tira não-terminais que não geram nenhuma cadeia de terminais (e as
+    produções que os usam) e depois os inalcançáveis a partir de `inicial`.
+    """
+    geradores = set()
+    mudou = True
+    while mudou:
+        mudou = False
+        for A, prods in R.items():
+            if A not in geradores and any(all(x not in R or x in geradores for x in corpo) for corpo, _ in prods):
+                geradores.add(A)
+                mudou = True
+    R = {A: [(corpo, origem) for corpo, origem in prods if all(x not in R or x in geradores for x in corpo)]
+         for A, prods in R.items() if A in geradores}
+
+    alcancaveis = [inicial] + [A for A in preservar if A in R and A != inicial]
+    vistos = set(alcancaveis)
+    for A in alcancaveis:
+        for corpo, _ in R.get(A, ()):
+            for x in corpo:
+                if x in R and x not in vistos:
+                    vistos.add(x)
+                    alcancaveis.append(x)
+    return {A: prods for A, prods in R.items() if A in vistos}
+
+
+def remover_recursao_esquerda(R, inicial, preservar=()):
+    """
+    Recursão à esquerda direta (A → A α | β vira A → β A', A' → α A' | ε)
+    e indireta (algoritmo de Paull, só nos não-terminais envolvidos).
+    Recursão escondida atrás de prefixos anuláveis não é tratada.
+    A produção A' → α A' representa a original A → A α.
+    """
+    # não-terminais que podem começar por si mesmos (ciclos do grafo "primeiro símbolo")
+    primeiros = {A: {corpo[0] for corpo, _ in prods if corpo and corpo[0] in R} for A, prods in R.items()}
+    recursivos = []
+    for A in R:
+        pilha, vistos = list(primeiros[A]), set()
+        while pilha:
+            B = pilha.pop()
+            if B == A:
+                recursivos.append(A)
+                break
+            if B not in vistos:
+                vistos.add(B)
+                pilha.extend(primeiros[B])
+    if not recursivos:
+        return R
+
+    R = dict(R)
+    for i, Ai in enumerate(recursivos):
+        # Ai → Aj γ (j < i) recebe as alternativas de Aj
+        for Aj in recursivos[:i]:
+            novas = []
+            for corpo, origem in R[Ai]:
+                if corpo and corpo[0] == Aj:
+                    novas.extend((corpo_j + corpo[1:], origem + origem_j) for corpo_j, origem_j in R[Aj])
+                else:
+                    novas.append((corpo, origem))
+            R[Ai] = _sem_repetidas(novas)
+
+        diretas = [(corpo[1:], origem) for corpo, origem in R[Ai] if corpo and corpo[0] == Ai]
+        if not diretas:
+            continue
+        linha = _novo_nome(R, f"{Ai}_REC")
+        R[Ai] = [(corpo + (linha,), origem) for corpo, origem in R[Ai] if not (corpo and corpo[0] == Ai)]
+        R[linha] = [(alfa + (linha,), origem) for alfa, origem in diretas] + [((), ())]
+    return R
+
+
+def fatorar_esquerda(R, inicial, preservar=()):
+    """
+    Alternativas com prefixo comum α (A → α β1 | α β2) viram A → α A'
+    e A' → β1 | β2. A produção A → α A' não representa nenhuma original:
+    quem representa A → α βi é A' → βi. Repete até não haver prefixos.
+    """
+    R = dict(R)
+    pendentes = list(R)
+    while pendentes:
+        A = pendentes.pop(0)
+        grupos = {}
+        for corpo, origem in R[A]:
+            grupos.setdefault(corpo[:1], []).append((corpo, origem))
+        if all(len(g) == 1 or not chave for chave, g in grupos.items()):
+            continue
+
+        novas = []
+        feitos = set()
+        for corpo, origem in R[A]:
+            chave = corpo[:1]
+            grupo = grupos[chave]
+            if len(grupo) == 1 or not chave:
+                novas.append((corpo, origem))
+                continue
+            if chave in feitos:
+                continue
+            feitos.add(chave)
+            prefixo = list(grupo[0][0])
+            for outro, _ in grupo[1:]:
+                k = 0
+                while k < min(len(prefixo), len(outro)) and prefixo[k] == outro[k]:
+                    k += 1
+                del prefixo[k:]
+            linha = _novo_nome(R, f"{A}_FAT")
+            R[linha] = _sem_repetidas([(outro[len(prefixo):], origem) for outro, origem in grupo])
+            novas.append((tuple(prefixo) + (linha,), ()))
+            pendentes.append(linha)
+        R[A] = novas
+    return R
+
+
+def eliminar_unitarias(R, inicial, preservar=()):
+    """
+    A → B (B não-terminal) é trocada pelas alternativas de B, na mesma
+    posição (a ordem das alternativas decide conflitos nas tabelas). Só
+    quando todo uso de B é unitário: se B aparece em outro corpo, copiar
+    as alternativas duplicaria itens e aumentaria o autômato LR.
+    Ciclos A → B → A se resolvem pelo fecho. Alvos em `preservar` ficam.
+    """
+    unitarios = _usos(R)
+    alvos = {B for B, usos in unitarios.items()
+             if B != inicial and B not in preservar and all(n == 1 for n in usos)}
+
+    def expandir(prods, visitados, prefixo):
+        for corpo, origem in prods:
+            if len(corpo) == 1 and corpo[0] in alvos:
+                if corpo[0] not in visitados:
+                    yield from expandir(R[corpo[0]], visitados | {corpo[0]}, prefixo + origem)
+            else:
+                yield corpo, prefixo + origem
+
+    return {A: _sem_repetidas(expandir(prods, {A}, ())) for A, prods in R.items()}
+
+
+def incorporar(R, inicial, preservar=()):
+    """
+    Não-terminal B com uma única produção B → β (|β| = k), sem recursão
+    nela mesma, é substituído por β onde aparece. Com u usos, o autômato
+    LR(0) perde os k + 1 itens de B e ganha k - 1 em cada uso, então só
+    se incorpora quando u·(k - 1) < k + 1: as tabelas nunca crescem, e
+    cada uso custa uma expansão/redução a menos.
+    """
+    R = dict(R)
+    while True:
+        usos = _usos(R)
+        for B, prods in R.items():
+            if B == inicial or B in preservar or len(prods) != 1 or B not in usos:
+                continue
+            corpo_b, origem_b = prods[0]
+            k = len(corpo_b)
+            if B in corpo_b or len(usos[B]) * (k - 1) >= k + 1:
+                continue
+            del R[B]
+            for A, prods_a in R.items():
+                novas = []
+                for corpo, origem in prods_a:
+                    while B in corpo:
+                        i = corpo.index(B)
+                        corpo = corpo[:i] + corpo_b + corpo[i + 1:]
+                        origem = origem + origem_b
+                    novas.append((corpo, origem))
+                R[A] = novas
+            break
+        else:
+            return R
+
+
+# Nome -> passe, na ordem em que rodam por padrão
+PASSES = {
+    "inuteis": remover_inuteis,
+    "recursao_esquerda": remover_recursao_esquerda,
+    "fatoracao": fatorar_esquerda,
+    "unitarias": eliminar_unitarias,
+    "incorporacao": incorporar,
+}
+
+
+class GramaticaOtimizada:
+    """
+    Resultado de `otimizar`: `gramatica` no formato de grammar.grammar
+    (pronta para o AnalisadorSintaticoLL1, cache_tabelas e analisar_slr),
+    `origem[(A, corpo)]` com as produções originais representadas por cada
+    produção (corpo sem ε) e `historico` com (passe, produções, não-terminais)
+    depois de cada passe.
+    """
+
+    def __init__(self, gramatica, origem, historico):
+        self.gramatica = gramatica
+        self.origem = origem
+        self.historico = historico
+
+    def originais(self, A, corpo):
+        """
+        Produções originais (A0, corpo0) representadas pela produção A → corpo.
+        """
+        return self.origem.get((A, tuple(x for x in corpo if x != EPS)), ())
+
+    def traduzir_contagem(self, contagem):
+        """
+        {(A, corpo): n} da gramática otimizada -> {(A0, corpo0): n} original.
+        """
+        traduzida = {}
+        for (A, corpo), n in contagem.items():
+            for original in self.originais(A, corpo):
+                traduzida[original] = traduzida.get(original, 0) + n
+        return traduzida
+
+
+def otimizar(G, passes=tuple(PASSES), preservar=()):
+    """
+    Aplica os `passes` (nomes de PASSES) em ordem, removendo depois de
+    cada um o que ficou inútil. O símbolo inicial e os não-terminais em
+    `preservar` (ex.: os de sincronia do modo pânico) não somem.
+    """
+    inicial = next(iter(G))
+    R = _interna(G)
+    historico = [("original", sum(map(len, R.values())), len(R))]
+    for nome in passes:
+        R = remover_inuteis(PASSES[nome](R, inicial, preservar), inicial, preservar)
+        historico.append((nome, sum(map(len, R.values())), len(R)))
+
+    origem = {(A, corpo): origem for A, prods in R.items() for corpo, origem in prods}
+    return GramaticaOtimizada(_externa(R), origem, historico)
+
+
+def _lista_passes(texto):
+    passes = [p.strip() for p in texto.split(",") if p.strip()]
+    desconhecidos = [p for p in passes if p not in PASSES]
+    if desconhecidos:
+        raise argparse.ArgumentTypeError(f"passe desconhecido: {', '.join(desconhecidos)} (use {','.join(PASSES)})")
+    return passes
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Otimiza a gramática Brick e mostra o efeito de cada passe.")
+    args.add_argument("--passes", type=_lista_passes, default=list(PASSES), metavar="LISTA",
+                      help=f"passes em ordem (padrão: {','.join(PASSES)})")
+    args.add_argument("--mostrar", action="store_true", help="imprime a gramática otimizada")
+    opcoes = args.parse_args(argv)
+
+    from slr_parser import SINCRONIA_SLR
+
+    otimizada = otimizar(grammar, opcoes.passes, SINCRONIA_SLR)
+    for nome, producoes, nao_terminais in otimizada.historico:
+        print(f"{nome:>18}: {producoes:>3} produções, {nao_terminais:>3} não-terminais")
+    if opcoes.mostrar:
+        for A, prods in otimizada.gramatica.items():
+            for p in prods:
+                origem = "; ".join(f"{B} → {' '.join(c) or 'ε'}" for B, c in otimizada.originais(A, p))
+                print(f"{A} → {' '.join(p)}    [{origem}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
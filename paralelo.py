@@ -0,0 +1,291 @@
+# paralelo.py — Análises LL(1) e SLR ao mesmo tempo sobre o mesmo TokenBuffer
+import io
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+from grammar import grammar
+from scanner import TokenBuffer
+
+PROCESSOS = "processos"
+THREADS = "threads"
+
+# contexto dos processos de trabalho: analisador e tabelas, criados uma vez
+_contexto = None
+
+# AnalisadorParalelo reaproveitado por obter_analisador (um pool por processo)
+_compartilhado = None
+
+
+def gil_ativo():
+    # CPython 3.13 sem GIL (free-threaded) expõe sys._is_gil_enabled()
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def modo_padrao():
+    """
+    Threads quando o interpretador roda sem GIL; senão, processos.
+    """
+    return PROCESSOS if gil_ativo() else THREADS
+
+
+class _SaidaPorThread:
+    """
+    sys.stdout que desvia o que cada thread imprime para o buffer dela
+    (quando definido), para a saída de cada analisador não se misturar.
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self.local = threading.local()
+
+    def write(self, texto):
+        return (getattr(self.local, "buffer", None) or self.original).write(texto)
+
+    def flush(self):
+        (getattr(self.local, "buffer", None) or self.original).flush()
+
+    def __getattr__(self, nome):
+        return getattr(self.original, nome)
+
+
+class _Contexto:
+    def __init__(self, tabelas, metodo, gramatica):
+        from ll1_parser import AnalisadorSintaticoLL1
+
+        self.gramatica = gramatica
+        self.parser = AnalisadorSintaticoLL1(gramatica, tabelas.ll1)
+        self.tabelas_lr = tabelas.lr(metodo)
+
+
+def _executar(contexto, qual, tokens, rastro, exibir, semantica=False):
+    """
+    Roda um dos analisadores capturando o que ele imprime; com
+    `semantica`, o SLR também faz a análise semântica (semantica.py).
+    Devolve (saída impressa, diagnósticos, rastro, gramática convertida ou None).
+    """
+    from slr_parser import analisar_slr
+
+    diagnosticos = []
+    saida = io.StringIO()
+    local = sys.stdout.local if isinstance(sys.stdout, _SaidaPorThread) else None
+    anterior = sys.stdout
+    if local is not None:
+        local.buffer = saida
+    else:
+        sys.stdout = saida
+    try:
+        if qual == "ll1":
+            G = None
+            passos = contexto.parser.analisar(tokens, rastro, diagnosticos, exibir=exibir)
+        else:
+            analise = None
+            if semantica:
+                from semantica import AnalisadorSemantico
+
+                analise = AnalisadorSemantico()
+            G, passos = analisar_slr(tokens, contexto.gramatica, contexto.tabelas_lr, rastro,
+                                     diagnosticos=diagnosticos, exibir=exibir, semantica=analise)
+    finally:
+        if local is not None:
+            local.buffer = None
+        else:
+            sys.stdout = anterior
+    return saida.getvalue(), diagnosticos, passos, G
+
+
+# ---------- TokenBuffer em memória compartilhada (modo processos) ----------
+def _alinhar(n):
+    return (n + 7) & ~7
+
+
+def _codificar(fonte):
+    # largura fixa por caractere, para a posição no fonte dar a posição no
+    # bloco: Latin-1 (1 byte) quando cabe, senão UTF-32 (4 bytes)
+    try:
+        return fonte.encode("latin-1"), "latin-1"
+    except UnicodeEncodeError:
+        return fonte.encode("utf-32-le"), "utf-32-le"
+
+
+class _FonteCompartilhada:
+    """
+    Fonte lido direto do bloco compartilhado: só o trecho fatiado (o
+    lexema de um token, como em TokenBuffer.lexema) é decodificado.
+    """
+
+    __slots__ = ("dados", "codificacao", "largura")
+
+    def __init__(self, dados, codificacao):
+        self.dados = dados
+        self.codificacao = codificacao
+        self.largura = 1 if codificacao == "latin-1" else 4
+
+    def __len__(self):
+        return len(self.dados) // self.largura
+
+    def __getitem__(self, indice):
+        largura = self.largura
+        if isinstance(indice, slice):
+            inicio, fim, _ = indice.indices(len(self))
+            return str(self.dados[inicio * largura:fim * largura], self.codificacao)
+        return self[indice:indice + 1 or None]
+
+
+def publicar_tokens(tokens):
+    """
+    Copia o fonte (codificado com largura fixa) e as colunas do TokenBuffer
+    para um bloco de memória compartilhada. É a única cópia: devolve
+    (bloco, descritor), e o descritor é o que vai para os processos, que
+    leem colunas e lexemas direto do bloco.
+    """
+    fonte, codificacao = _codificar(tokens.fonte)
+    colunas = (tokens.tipos, tokens.inicios, tokens.comprimentos, tokens.inicios_linha)
+    partes = [(memoryview(fonte), "B")] + [(memoryview(c).cast("B"), c.typecode) for c in colunas]
+
+    posicoes = []
+    total = 0
+    for dados, _ in partes:
+        posicoes.append(total)
+        total = _alinhar(total + len(dados))
+    bloco = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    for (dados, _), inicio in zip(partes, posicoes):
+        bloco.buf[inicio:inicio + len(dados)] = dados
+    descritor = (bloco.name, codificacao,
+                 [(inicio, len(dados), tipo) for (dados, tipo), inicio in zip(partes, posicoes)])
+    return bloco, descritor
+
+
+def _anexar_tokens(descritor):
+    nome, codificacao, partes = descritor
+    # os processos do pool usam o mesmo resource_tracker de quem criou o
+    # bloco: anexar não muda quem o remove (o processo principal, no fim)
+    bloco = shared_memory.SharedMemory(name=nome)
+    vistas = [bloco.buf[inicio:inicio + tamanho].cast(tipo) for inicio, tamanho, tipo in partes]
+    tokens = TokenBuffer.__new__(TokenBuffer)
+    tokens.fonte = _FonteCompartilhada(vistas[0], codificacao)
+    tokens.tipos, tokens.inicios, tokens.comprimentos, tokens.inicios_linha = vistas[1:]
+    return bloco, vistas, tokens
+
+
+def _inicializar(tabelas, metodo, gramatica):
+    global _contexto
+    _contexto = _Contexto(tabelas, metodo, gramatica)
+    sys.stdout = _SaidaPorThread(sys.stdout)
+
+
+def _analisar_no_processo(qual, descritor, rastro, exibir, semantica, contar, otimizada):
+    """
+    Roda o analisador no processo de trabalho. Com `contar`, o rastro é
+    embrulhado nos contadores do perfil (instrumentacao.py) e o resumo
+    deles volta junto, já que o objeto não sai do processo.
+    """
+    if contar:
+        from instrumentacao import ContadoresLL1, ContadoresSLR
+
+        if qual == "ll1":
+            rastro = ContadoresLL1(_contexto.parser, rastro, otimizada)
+        else:
+            rastro = ContadoresSLR(rastro, otimizada=otimizada)
+    bloco, vistas, tokens = _anexar_tokens(descritor)
+    try:
+        saida, diagnosticos, passos, G = _executar(_contexto, qual, tokens, rastro, exibir, semantica)
+        # as linhas do rastro são geradas aqui, enquanto as colunas existem
+        linhas = list(passos)
+        resumo = passos.resumo() if contar else None
+        del passos, tokens
+    finally:
+        for vista in vistas:
+            vista.release()
+        bloco.close()
+    return saida, diagnosticos, linhas, G, resumo
+
+
+class AnalisadorParalelo:
+    """
+    Executa LL(1) e SLR sobre os mesmos tokens ao mesmo tempo, em duas
+    threads (CPython sem GIL) ou em dois processos. Com processos, o
+    fonte e as colunas do TokenBuffer são copiados uma vez para memória
+    compartilhada e os processos leem dali (lexemas decodificados só
+    quando pedidos), sem serializar tokens; os rastros voltam como
+    listas de linhas. O pool é criado uma vez: use obter_analisador para
+    reaproveitá-lo entre arquivos.
+
+    `analisar` devolve sempre na mesma ordem, como na execução em
+    sequência: (saída, diagnósticos, passos) do LL(1) e (saída,
+    diagnósticos, passos, gramática convertida) do SLR. `gramatica` é a
+    das `tabelas` (a otimizada, se as tabelas vieram dela).
+    """
+
+    def __init__(self, tabelas, metodo="slr", modo=None, gramatica=grammar):
+        self.modo = modo or modo_padrao()
+        self.tabelas, self.metodo, self.gramatica = tabelas, metodo, gramatica
+        if self.modo == THREADS:
+            self.contexto = _Contexto(tabelas, metodo, gramatica)
+            self.executor = ThreadPoolExecutor(2)
+        else:
+            metodos = multiprocessing.get_all_start_methods()
+            mp = multiprocessing.get_context("fork" if "fork" in metodos else None)
+            self.executor = ProcessPoolExecutor(2, mp_context=mp, initializer=_inicializar,
+                                                initargs=(tabelas, metodo, gramatica))
+
+    def analisar(self, tokens, rastro_ll1="anel", rastro_slr="anel", exibir=True, semantica=False,
+                 perfil=None, otimizada=None):
+        """
+        Nos processos, os rastros são níveis ("desligado", "anel",
+        "completo"); com threads também podem ser objetos Rastro.
+        Com `semantica`, o SLR faz também a análise semântica. Com um
+        `perfil` ligado (Instrumentacao), os passos de cada analisador são
+        contados nos dois modos, com a `otimizada` como em main.py.
+        """
+        contar = perfil is not None and perfil.ligada
+        if self.modo == THREADS:
+            if contar:
+                rastro_ll1 = perfil.contadores_ll1(self.contexto.parser, rastro_ll1, otimizada)
+                rastro_slr = perfil.contadores_slr(rastro_slr, otimizada=otimizada)
+            original = sys.stdout
+            sys.stdout = _SaidaPorThread(original)
+            try:
+                ll1 = self.executor.submit(_executar, self.contexto, "ll1", tokens, rastro_ll1, exibir)
+                slr = self.executor.submit(_executar, self.contexto, "slr", tokens, rastro_slr, exibir, semantica)
+                resultado_ll1, resultado_slr = ll1.result(), slr.result()
+            finally:
+                sys.stdout = original
+        else:
+            bloco, descritor = publicar_tokens(tokens)
+            try:
+                ll1 = self.executor.submit(_analisar_no_processo, "ll1", descritor, rastro_ll1, exibir, False,
+                                           contar, otimizada)
+                slr = self.executor.submit(_analisar_no_processo, "slr", descritor, rastro_slr, exibir, semantica,
+                                           contar, otimizada)
+                resultado_ll1, resultado_slr = ll1.result(), slr.result()
+            finally:
+                bloco.close()
+                bloco.unlink()
+            if contar:
+                perfil.contadores_prontos("ll1", resultado_ll1[4])
+                perfil.contadores_prontos("slr", resultado_slr[4])
+        return resultado_ll1[:3], resultado_slr[:4]
+
+    def fechar(self):
+        self.executor.shutdown()
+
+
+def obter_analisador(tabelas, metodo="slr", modo=None, gramatica=grammar):
+    """
+    AnalisadorParalelo guardado entre chamadas: com as mesmas tabelas,
+    método, modo e gramática, o pool (e o contexto dos processos) é o
+    mesmo; com outros, o anterior é fechado e um novo é criado.
+    """
+    global _compartilhado
+    modo = modo or modo_padrao()
+    atual = _compartilhado
+    if (atual is not None and atual.tabelas is tabelas and atual.metodo == metodo and atual.modo == modo
+            and atual.gramatica is gramatica):
+        return atual
+    if atual is not None:
+        atual.fechar()
+    _compartilhado = AnalisadorParalelo(tabelas, metodo, modo, gramatica)
+    return _compartilhado
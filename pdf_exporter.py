@@ -156,5 +156,6 @@ def gerar_pdf(tokens, passos_ll1, passos_slr, gram_convertida, caminho="relatori
 
     draw_table(pdf, slr_data, [20, 40, 60, 20, 50], pilha_cols=[2])
 
+    # quem chama decide se avisa (main.py imprime o caminho fora do -q)
     pdf.output(caminho)
-    print(f"\nPDF gerado com sucesso: {caminho}\n")
+    return caminho
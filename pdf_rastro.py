@@ -0,0 +1,471 @@
+# pdf_rastro.py — Rastro completo do LL(1) e do SLR(1) em PDF, gerado em fluxo
+import io
+import os
+import zlib
+from array import array
+
+from rastro import MARCADOR_A_CADA
+
+FONTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "DejaVuSans.ttf")
+
+# Página A4 em pontos; margens de 10 mm
+LARGURA_PAGINA, ALTURA_PAGINA = 595.28, 841.89
+MARGEM = 28.35
+
+TAMANHO_FONTE = 7
+ALTURA_LINHA = 8.5
+RESPIRO = 2.0            # espaço vertical entre o texto e a borda da célula
+LINHAS_POR_CELULA = 3    # células maiores são cortadas com "..."
+
+# (título, fração da largura útil)
+COLUNAS_LL1 = (("Passo", 0.08), ("Pilha", 0.44), ("Entrada", 0.14), ("Ação", 0.34))
+COLUNAS_SLR = (("Passo", 0.08), ("Estados", 0.22), ("Símbolos", 0.32), ("Entrada", 0.12), ("Ação", 0.26))
+
+# limite do cache de palavras medidas (os passos repetem os mesmos símbolos)
+_CACHE_MAXIMO = 4096
+
+
+class MetricasFonte:
+    """
+    Métricas de uma fonte TrueType lidas uma única vez: glifo e largura
+    (em milésimos do corpo) de cada caractere e, em cache, de cada palavra
+    já medida. `usados` guarda os glifos que entraram no PDF, para as
+    larguras (/W) e o mapa de texto (/ToUnicode) escritos no fim.
+    """
+
+    def __init__(self, caminho=FONTE):
+        # fontTools já vem com o fpdf2; só é carregado quando o PDF é gerado
+        from fontTools.ttLib import TTFont
+
+        fonte = TTFont(caminho, lazy=True)
+        self.escala = 1000 / fonte["head"].unitsPerEm
+        self._cmap = fonte.getBestCmap()
+        self._metricas = fonte["hmtx"].metrics
+        self._glifo_id = fonte.getGlyphID
+
+        cabecalho, hhea = fonte["head"], fonte["hhea"]
+        self.caixa = [round(v * self.escala) for v in
+                      (cabecalho.xMin, cabecalho.yMin, cabecalho.xMax, cabecalho.yMax)]
+        self.ascendente = round(hhea.ascent * self.escala)
+        self.descendente = round(hhea.descent * self.escala)
+        self.altura_maiusculas = round(getattr(fonte["OS/2"], "sCapHeight", hhea.ascent) * self.escala)
+        self.nome = fonte["name"].getDebugName(6) or "DejaVuSans"
+
+        self.caracteres = {}   # caractere -> (glifo, largura)
+        self.palavras = {}     # palavra -> (largura, hex)
+        self.usados = {}       # glifo -> (largura, caractere)
+        self.espaco, self.hex_espaco = self.medir(" ")
+
+    def glifo(self, caractere):
+        medida = self.caracteres.get(caractere)
+        if medida is None:
+            nome = self._cmap.get(ord(caractere), ".notdef")
+            glifo = self._glifo_id(nome)
+            medida = self.caracteres[caractere] = (glifo, round(self._metricas[nome][0] * self.escala))
+            self.usados.setdefault(glifo, (medida[1], caractere))
+        return medida
+
+    def medir(self, palavra):
+        """
+        (largura em milésimos do corpo, glifos em hex para o operador Tj).
+        """
+        medida = self.palavras.get(palavra)
+        if medida is None:
+            glifo = self.glifo
+            largura = 0
+            partes = []
+            for c in palavra:
+                g, w = glifo(c)
+                largura += w
+                partes.append("%04X" % g)
+            if len(self.palavras) >= _CACHE_MAXIMO:
+                self.palavras.clear()
+            medida = self.palavras[palavra] = (largura, "".join(partes))
+        return medida
+
+    def cortar(self, palavra, largura):
+        """
+        Maior prefixo de `palavra` que, seguido de "...", cabe em `largura`.
+        """
+        limite = largura - self.medir("...")[0]
+        total = 0
+        for i, c in enumerate(palavra):
+            total += self.glifo(c)[1]
+            if total > limite:
+                return self.medir(palavra[:i] + "...")
+        return self.medir(palavra)
+
+
+class EscritorPDF:
+    """
+    Escreve objetos PDF direto no arquivo, na ordem em que ficam prontos.
+    Da estrutura só ficam em memória a posição de cada objeto (tabela
+    xref) e o número de cada página: alguns bytes por página.
+    """
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.posicao = 0
+        self.posicoes = array("Q", [0])  # objeto 0 é o início da lista livre
+        self._escrever(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _escrever(self, dados):
+        self.arquivo.write(dados)
+        self.posicao += len(dados)
+
+    def reservar(self):
+        self.posicoes.append(0)
+        return len(self.posicoes) - 1
+
+    def objeto(self, numero, corpo, fluxo=None, **extras):
+        """
+        Escreve o objeto `numero`. Com `fluxo`, `corpo` é ignorado e vira
+        um stream comprimido (FlateDecode) com as entradas `extras`.
+        """
+        self.posicoes[numero] = self.posicao
+        if fluxo is not None:
+            comprimido = zlib.compress(fluxo)
+            entradas = "".join(f" /{k} {v}" for k, v in extras.items())
+            corpo = f"<< /Length {len(comprimido)} /Filter /FlateDecode{entradas} >>\nstream\n".encode()
+            self._escrever(f"{numero} 0 obj\n".encode() + corpo)
+            self._escrever(comprimido + b"\nendstream\nendobj\n")
+        else:
+            self._escrever(f"{numero} 0 obj\n{corpo}\nendobj\n".encode())
+
+    def fechar(self, catalogo):
+        inicio_xref = self.posicao
+        linhas = [f"xref\n0 {len(self.posicoes)}\n", "0000000000 65535 f \n"]
+        linhas.extend(f"{p:010d} 00000 n \n" for p in self.posicoes[1:])
+        linhas.append(f"trailer\n<< /Size {len(self.posicoes)} /Root {catalogo} 0 R >>\n")
+        linhas.append(f"startxref\n{inicio_xref}\n%%EOF\n")
+        self._escrever("".join(linhas).encode())
+
+
+def _texto_pdf(texto):
+    # string de texto do PDF em UTF-16BE (títulos dos marcadores)
+    return "<FEFF" + texto.encode("utf-16-be").hex().upper() + ">"
+
+
+class Marcadores:
+    """
+    Marcadores em dois níveis (seção > intervalo de passos). Cada item
+    só é escrito quando o próximo irmão aparece (precisa de /Next), então
+    no máximo um item por nível fica pendente na memória.
+    """
+
+    def __init__(self, pdf, raiz):
+        self.pdf = pdf
+        self.raiz = raiz
+        self.secoes = []       # seções prontas, escritas em fechar()
+        self.secao = None
+        self.item = None
+
+    def nova_secao(self, titulo, pagina, y):
+        self._fechar_secao()
+        self.secao = {"numero": self.pdf.reservar(), "titulo": titulo, "destino": (pagina, y),
+                      "primeiro": None, "ultimo": None, "total": 0}
+
+    def novo_item(self, pagina, y, passo):
+        secao = self.secao
+        item = {"numero": self.pdf.reservar(), "destino": (pagina, y), "primeiro_passo": passo,
+                "anterior": self.item["numero"] if self.item else None}
+        self._escrever_item(proximo=item["numero"])
+        self.item = item
+        if secao["primeiro"] is None:
+            secao["primeiro"] = item["numero"]
+        secao["ultimo"] = item["numero"]
+        secao["total"] += 1
+
+    def ultimo_passo(self, passo):
+        if self.item is not None:
+            self.item["ultimo_passo"] = passo
+
+    def _escrever_item(self, proximo=None):
+        item = self.item
+        if item is None:
+            return
+        titulo = f"Passos {item['primeiro_passo']}–{item.get('ultimo_passo', item['primeiro_passo'])}"
+        self.pdf.objeto(item["numero"], _item_marcador(titulo, self.secao["numero"], item["destino"],
+                                                       item["anterior"], proximo))
+        self.item = None
+
+    def _fechar_secao(self):
+        if self.secao is not None:
+            self._escrever_item()
+            self.secoes.append(self.secao)
+            self.secao = None
+
+    def fechar(self):
+        self._fechar_secao()
+        secoes = self.secoes
+        for i, secao in enumerate(secoes):
+            anterior = secoes[i - 1]["numero"] if i > 0 else None
+            proximo = secoes[i + 1]["numero"] if i + 1 < len(secoes) else None
+            filhos = ""
+            if secao["total"]:
+                # seções começam fechadas: contagem negativa
+                filhos = f" /First {secao['primeiro']} 0 R /Last {secao['ultimo']} 0 R /Count {-secao['total']}"
+            self.pdf.objeto(secao["numero"], _item_marcador(secao["titulo"], self.raiz, secao["destino"],
+                                                            anterior, proximo, filhos))
+        corpo = "<< /Type /Outlines"
+        if secoes:
+            corpo += f" /First {secoes[0]['numero']} 0 R /Last {secoes[-1]['numero']} 0 R /Count {len(secoes)}"
+        self.pdf.objeto(self.raiz, corpo + " >>")
+
+
+def _item_marcador(titulo, pai, destino, anterior, proximo, extras=""):
+    pagina, y = destino
+    corpo = f"<< /Title {_texto_pdf(titulo)} /Parent {pai} 0 R /Dest [{pagina} 0 R /XYZ 0 {y:.2f} 0]"
+    if anterior is not None:
+        corpo += f" /Prev {anterior} 0 R"
+    if proximo is not None:
+        corpo += f" /Next {proximo} 0 R"
+    return corpo + extras + " >>"
+
+
+class PaginadorRastro:
+    """
+    Dispõe as linhas de um rastro em páginas de tabela, uma linha por vez:
+    larguras das colunas calculadas uma vez por seção, palavras medidas
+    pelo cache de MetricasFonte e cada página escrita (e descartada) assim
+    que enche. A memória não cresce com o número de passos.
+    """
+
+    def __init__(self, pdf, metricas, fonte, marcadores, marcador_a_cada=MARCADOR_A_CADA):
+        self.pdf = pdf
+        self.metricas = metricas
+        self.fonte = fonte
+        self.marcadores = marcadores
+        self.marcador_a_cada = marcador_a_cada
+        self.paginas = array("I")
+        self.celulas = {}
+        self.pagina = None
+        self.texto = []
+        self.graficos = []
+        self.y = 0.0
+
+    # ---------- páginas ----------
+    def _abrir_pagina(self):
+        self.pagina = self.pdf.reservar()
+        self.paginas.append(self.pagina)
+        self.texto = [f"BT /F1 {TAMANHO_FONTE} Tf"]
+        self.graficos = ["0.5 w"]
+        self.y = ALTURA_PAGINA - MARGEM
+        self._escrever(MARGEM, self.y - 10, self.titulo, 10)
+        self._escrever(LARGURA_PAGINA - MARGEM - 40, MARGEM - 12, f"página {len(self.paginas)}",
+                       TAMANHO_FONTE)
+        self.y -= 18
+        self._linha(self.cabecalho, cinza=True)
+
+    def _fechar_pagina(self):
+        if self.pagina is None:
+            return
+        self.texto.append("ET")
+        conteudo = "\n".join(self.graficos) + "\nS\n" + "\n".join(self.texto)
+        numero_conteudo = self.pdf.reservar()
+        self.pdf.objeto(numero_conteudo, None, conteudo.encode("ascii"))
+        self.pdf.objeto(self.pagina, f"<< /Type /Page /Parent {self.raiz_paginas} 0 R "
+                                     f"/MediaBox [0 0 {LARGURA_PAGINA} {ALTURA_PAGINA}] "
+                                     f"/Resources << /Font << /F1 {self.fonte} 0 R >> >> "
+                                     f"/Contents {numero_conteudo} 0 R >>")
+        self.pagina = None
+
+    def _escrever(self, x, y, texto, tamanho):
+        hex_texto = self.metricas.hex_espaco.join(self.metricas.medir(p)[1] for p in texto.split())
+        self.texto.append(f"/F1 {tamanho} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm <{hex_texto}> Tj /F1 {TAMANHO_FONTE} Tf")
+
+    # ---------- tabela ----------
+    def _quebrar(self, texto, largura):
+        """
+        Linhas (hex dos glifos) da célula, no máximo LINHAS_POR_CELULA;
+        o excesso vira "..." no fim da última. Células repetidas (entrada,
+        ação) vêm do cache.
+        """
+        chave = (texto, largura)
+        linhas = self.celulas.get(chave)
+        if linhas is None:
+            if len(self.celulas) >= _CACHE_MAXIMO:
+                self.celulas.clear()
+            linhas = self.celulas[chave] = self._quebrar_texto(texto, largura)
+        return linhas
+
+    def _quebrar_texto(self, texto, largura):
+        medir = self.metricas.medir
+        espaco = self.metricas.espaco
+        linhas = []
+        atual, usada = [], 0
+        cortada = False
+        for palavra in texto.split():
+            w, h = medir(palavra)
+            if w > largura:
+                w, h = self.metricas.cortar(palavra, largura)
+            if atual and usada + espaco + w > largura:
+                linhas.append((atual, usada))
+                if len(linhas) == LINHAS_POR_CELULA:
+                    cortada = True
+                    break
+                atual, usada = [], 0
+            if atual:
+                usada += espaco
+            atual.append((w, h))
+            usada += w
+        if not cortada and atual:
+            linhas.append((atual, usada))
+
+        if cortada:
+            ultima, usada = linhas[-1]
+            reticencias = medir("...")[0] + espaco
+            while len(ultima) > 1 and usada + reticencias > largura:
+                usada -= ultima.pop()[0] + espaco
+            ultima.append(medir("..."))
+        return [self.metricas.hex_espaco.join(h for _, h in linha) for linha, _ in linhas]
+
+    def _linha(self, celulas, cinza=False):
+        # larguras em milésimos do corpo para comparar com as métricas
+        escala = 1000 / TAMANHO_FONTE
+        quebradas = [self._quebrar(str(c), (w - 2 * RESPIRO) * escala) for c, w in zip(celulas, self.larguras)]
+        altura = max(1, max(map(len, quebradas))) * ALTURA_LINHA + 2 * RESPIRO
+
+        if self.y - altura < MARGEM:
+            self._fechar_pagina()
+            self._abrir_pagina()
+
+        topo = self.y
+        base = topo - altura
+        graficos, texto = self.graficos, self.texto
+        if cinza:
+            graficos.append(f"0.9 g {MARGEM:.2f} {base:.2f} {self.largura_util:.2f} {altura:.2f} re f 0 g")
+        x = MARGEM
+        for linhas, w in zip(quebradas, self.larguras):
+            graficos.append(f"{x:.2f} {base:.2f} {w:.2f} {altura:.2f} re")
+            y = topo - RESPIRO - TAMANHO_FONTE
+            for hex_linha in linhas:
+                texto.append(f"1 0 0 1 {x + RESPIRO:.2f} {y:.2f} Tm <{hex_linha}> Tj")
+                y -= ALTURA_LINHA
+            x += w
+        self.y = base
+        return topo
+
+    def secao(self, titulo, colunas, linhas):
+        """
+        Nova seção (nova página) com as `linhas` do iterável, cada uma uma
+        sequência com uma célula por coluna.
+        """
+        self._fechar_pagina()
+        self.titulo = titulo
+        self.cabecalho = [nome for nome, _ in colunas]
+        self.largura_util = LARGURA_PAGINA - 2 * MARGEM
+        self.larguras = [self.largura_util * fracao for _, fracao in colunas]
+        self._abrir_pagina()
+        self.marcadores.nova_secao(titulo, self.pagina, ALTURA_PAGINA)
+
+        a_cada = self.marcador_a_cada
+        for i, linha in enumerate(linhas):
+            if a_cada and i % a_cada == 0:
+                # o marcador aponta para a linha: abre página antes, se ela não couber
+                topo = self._linha(linha)
+                self.marcadores.novo_item(self.pagina, topo, linha[0])
+            else:
+                self._linha(linha)
+            if a_cada:
+                self.marcadores.ultimo_passo(linha[0])
+        self._fechar_pagina()
+
+
+def _subconjunto_fonte(caminho, glifos):
+    """
+    Bytes da fonte TrueType só com os `glifos` usados. Os demais ficam
+    vazios mas mantêm o número (retain_gids): com Identity-H o código no
+    texto é o número do glifo, que não pode mudar.
+    """
+    from fontTools.subset import Options, Subsetter
+    from fontTools.ttLib import TTFont
+
+    opcoes = Options()
+    opcoes.retain_gids = True
+    opcoes.notdef_outline = True
+    opcoes.drop_tables += ["FFTM"]  # carimbo do FontForge, que o fontTools não sabe cortar
+    opcoes.layout_features = []   # o PDF posiciona cada glifo; GSUB/GPOS não são lidos
+    fonte = TTFont(caminho)
+    subconjunto = Subsetter(opcoes)
+    subconjunto.populate(gids=glifos)
+    subconjunto.subset(fonte)
+    saida = io.BytesIO()
+    fonte.save(saida)
+    return saida.getvalue()
+
+
+def _objetos_fonte(pdf, metricas, fonte, caminho):
+    """
+    Subconjunto da fonte TrueType (só os glifos usados) como CIDFontType2
+    (Identity-H: o código de cada caractere no texto é o número do glifo),
+    com larguras e /ToUnicode dos mesmos glifos.
+    """
+    descendente, descritor, para_unicode = pdf.reservar(), pdf.reservar(), pdf.reservar()
+    arquivo_fonte = pdf.reservar()
+    # prefixo de 6 maiúsculas que marca a fonte como subconjunto (PDF 1.4, 5.5.3)
+    marca = zlib.crc32(repr(sorted(metricas.usados)).encode())
+    prefixo = "".join(chr(65 + (marca >> (5 * i)) % 26) for i in range(6))
+    nome = prefixo + "+" + metricas.nome.replace(" ", "")
+
+    larguras = " ".join(f"{g} [{w}]" for g, (w, _) in sorted(metricas.usados.items()))
+    pares = [(g, c) for g, (_, c) in sorted(metricas.usados.items()) if g]
+    blocos = []
+    for i in range(0, len(pares), 100):
+        bloco = pares[i:i + 100]
+        blocos.append(f"{len(bloco)} beginbfchar\n" +
+                      "\n".join(f"<{g:04X}> <{c.encode('utf-16-be').hex().upper()}>" for g, c in bloco) +
+                      "\nendbfchar")
+    cmap = ("/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+            "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n" + "\n".join(blocos) +
+            "\nendcmap\nCMapName currentdict /CMap defineresource pop\nend\nend")
+
+    pdf.objeto(fonte, f"<< /Type /Font /Subtype /Type0 /BaseFont /{nome} /Encoding /Identity-H "
+                      f"/DescendantFonts [{descendente} 0 R] /ToUnicode {para_unicode} 0 R >>")
+    pdf.objeto(descendente, f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{nome} "
+                            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                            f"/FontDescriptor {descritor} 0 R /DW {metricas.espaco} /W [{larguras}] "
+                            f"/CIDToGIDMap /Identity >>")
+    pdf.objeto(descritor, f"<< /Type /FontDescriptor /FontName /{nome} /Flags 32 "
+                          f"/FontBBox [{' '.join(map(str, metricas.caixa))}] /ItalicAngle 0 "
+                          f"/Ascent {metricas.ascendente} /Descent {metricas.descendente} "
+                          f"/CapHeight {metricas.altura_maiusculas} /StemV 80 /FontFile2 {arquivo_fonte} 0 R >>")
+    pdf.objeto(para_unicode, None, cmap.encode("ascii"))
+    dados_fonte = _subconjunto_fonte(caminho, sorted(metricas.usados))
+    pdf.objeto(arquivo_fonte, None, dados_fonte, Length1=len(dados_fonte))
+
+
+def gerar_pdf_rastro(passos_ll1, passos_slr, caminho="rastro_completo.pdf", marcador_a_cada=MARCADOR_A_CADA,
+                     fonte=FONTE):
+    """
+    PDF com todos os passos do LL(1) e do SLR(1). `passos_ll1`/`passos_slr`
+    são consumidos como iteradores de linhas (um Rastro completo gera cada
+    linha só quando ela é lida); None omite a seção. Há um marcador a cada
+    `marcador_a_cada` passos, agrupado por seção. Devolve o número de
+    páginas; a mensagem fica com quem chama (main.py respeita -q).
+    """
+    metricas = MetricasFonte(fonte)
+    with open(caminho, "wb") as arquivo:
+        pdf = EscritorPDF(arquivo)
+        catalogo, raiz_paginas, raiz_marcadores = pdf.reservar(), pdf.reservar(), pdf.reservar()
+        objeto_fonte = pdf.reservar()
+
+        marcadores = Marcadores(pdf, raiz_marcadores)
+        paginador = PaginadorRastro(pdf, metricas, objeto_fonte, marcadores, marcador_a_cada)
+        paginador.raiz_paginas = raiz_paginas
+        if passos_ll1 is not None:
+            paginador.secao("Rastro completo do LL(1)", COLUNAS_LL1, passos_ll1)
+        if passos_slr is not None:
+            paginador.secao("Rastro completo do SLR(1)", COLUNAS_SLR, passos_slr)
+        marcadores.fechar()
+
+        paginas = paginador.paginas
+        pdf.objeto(raiz_paginas, f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in paginas)}] "
+                                 f"/Count {len(paginas)} >>")
+        _objetos_fonte(pdf, metricas, objeto_fonte, fonte)
+        pdf.objeto(catalogo, f"<< /Type /Catalog /Pages {raiz_paginas} 0 R /Outlines {raiz_marcadores} 0 R "
+                             f"/PageMode /UseOutlines >>")
+        pdf.fechar(catalogo)
+    return len(paginas)
@@ -0,0 +1,135 @@
+# rastro.py — Registro configurável dos passos das análises LL(1) e SLR(1)
+from collections import deque
+
+# Níveis de rastro
+DESLIGADO = "desligado"
+ANEL = "anel"          # só os últimos N passos
+COMPLETO = "completo"  # todos os passos
+
+# Um marcador (bookmark) a cada N passos no PDF do rastro (pdf_rastro.py).
+# Fica aqui para o main.py não carregar o escritor de PDF só pelo padrão.
+MARCADOR_A_CADA = 1000
+
+
+class Rastro:
+    """
+    Guarda os passos de uma análise como eventos crus (tuplas pequenas,
+    montadas pelo analisador) e só gera o texto das linhas quando elas são
+    lidas. Comporta-se como uma sequência de linhas: len(), iteração e
+    fatias como `rastro[-25:]` funcionam como na antiga lista `passos`.
+
+    O analisador grava com `rastro.registrar(evento)` (append direto, O(1))
+    e, ao terminar, chama `vincular(renderizador)`. O renderizador recebe
+    os eventos e produz as linhas; `completo` indica se eles começam no
+    primeiro passo da análise.
+    """
+
+    nivel = COMPLETO
+    completo = True
+
+    def __init__(self):
+        self.eventos = []
+        self.registrar = self.eventos.append
+        self._renderizador = None
+
+    def vincular(self, renderizador):
+        self._renderizador = renderizador
+
+    def limpar(self):
+        """
+        Descarta os eventos gravados (a análise vai recomeçar do início).
+        """
+        self.eventos.clear()
+
+    def __len__(self):
+        return len(self.eventos)
+
+    def __bool__(self):
+        return len(self.eventos) > 0
+
+    def __iter__(self):
+        return self.linhas()
+
+    def linhas(self, inicio=0, fim=None):
+        """
+        Gera as linhas dos eventos [inicio:fim] (índices já normalizados).
+        """
+        total = len(self.eventos)
+        fim = total if fim is None else fim
+        if self._renderizador is None or inicio >= fim:
+            return iter(())
+        return self._renderizador.linhas(self.eventos, inicio, fim, self.completo)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            passos = range(*indice.indices(len(self.eventos)))
+            if not passos:
+                return []
+            # gera só o trecho coberto pela fatia, em ordem crescente
+            menor = min(passos[0], passos[-1])
+            linhas = list(self.linhas(menor, max(passos[0], passos[-1]) + 1))
+            if passos.step == 1:
+                return linhas
+            return [linhas[i - menor] for i in passos]
+
+        total = len(self.eventos)
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise IndexError("índice de passo fora do rastro")
+        return next(self.linhas(indice, indice + 1))
+
+
+class RastroCompleto(Rastro):
+    """Guarda todos os passos."""
+
+
+class RastroAnel(Rastro):
+    """Guarda só os últimos `tamanho` passos (buffer circular)."""
+
+    nivel = ANEL
+
+    def __init__(self, tamanho=25):
+        super().__init__()
+        self.tamanho = tamanho
+        self.eventos = deque(maxlen=tamanho)
+        self.registrar = self.eventos.append
+
+    @property
+    def completo(self):
+        # o anel ainda contém o primeiro passo enquanto não transbordou
+        return len(self.eventos) < self.tamanho
+
+    def linhas(self, inicio=0, fim=None):
+        # deque não aceita fatias: copia o anel (no máximo N eventos)
+        eventos = self.eventos
+        fim = len(eventos) if fim is None else fim
+        if self._renderizador is None or inicio >= fim:
+            return iter(())
+        return self._renderizador.linhas(list(eventos), inicio, fim, self.completo)
+
+
+class RastroDesligado(Rastro):
+    """Não guarda nada; os analisadores nem chegam a montar eventos."""
+
+    nivel = DESLIGADO
+
+    def __init__(self):
+        super().__init__()
+        self.registrar = None
+
+
+def criar_rastro(nivel=COMPLETO, tamanho=25):
+    """
+    Cria um rastro a partir do nível ("desligado", "anel" ou "completo").
+    Se `nivel` já for um Rastro, devolve o próprio objeto.
+    """
+    if isinstance(nivel, Rastro):
+        return nivel
+    if nivel is None or nivel == DESLIGADO:
+        return RastroDesligado()
+    if nivel == ANEL:
+        return RastroAnel(tamanho)
+    if nivel == COMPLETO:
+        return RastroCompleto()
+    raise ValueError(f"nível de rastro desconhecido: {nivel!r}")
@@ -1,57 +1,297 @@
 import re
+from array import array
+from bisect import bisect_right
+
+from diagnosticos import Diagnostico
+# Palavras reservadas. O scanner casa o identificador inteiro e só depois
+# o procura aqui, então "sequencia" e "inteiro" continuam sendo IDENT.
+PALAVRAS_CHAVE = {
+    "principal": "PRINCIPAL",
+    "funcao": "FUNCAO",
+    "int": "TIPO_VAR", "real": "TIPO_VAR", "cadeia": "TIPO_VAR",
+    "car": "TIPO_VAR", "booleano": "TIPO_VAR", "vazio": "TIPO_VAR",
+    "senao": "SENAO",
+    "se": "SE",
+    "enquanto": "ENQUANTO",
+    "faca": "FACA",
+    "para": "PARA",
+    "retornar": "RETORNO",
+    "verdadeiro": "BOOLEANO", "falso": "BOOLEANO",
+}
+
+# Operadores e pontuação: o lexema inteiro decide o tipo
+SIMBOLOS = {
+    "<": "COMPAR", ">": "COMPAR", "<=": "COMPAR", ">=": "COMPAR", "==": "COMPAR", "!=": "COMPAR",
+    "+": "OPER_ARIT", "-": "OPER_ARIT", "*": "OPER_ARIT", "/": "OPER_ARIT", "%": "OPER_ARIT",
+    "!": "OPER_LOGI_UN",
+    "&&": "OPER_LOGI_BIN", "||": "OPER_LOGI_BIN",
+    "=": "ATRIB",
+    "(": "LPAREN", ")": "RPAREN",
+    "{": "LCHAVE", "}": "RCHAVE",
+    ",": "VIRGULA",
+    ";": "PONTOVIRG",
+}
+
+# Classes da expressão mestra. Cada uma começa por caracteres que nenhuma
+# outra usa, então o motor descarta as demais no primeiro caractere, sem
+# voltar atrás; o tipo do token sai depois (PALAVRAS_CHAVE, SIMBOLOS e
+# "." para NUMERO_REAL). Espaços e tabulações antes do token entram na
+# mesma correspondência: o token é o grupo, não a correspondência toda.
+# INCOMPAT não aceita espaço nem tabulação: brancos no fim do fonte (sem
+# token depois) ficam sem correspondência e são pulados, em vez de o
+# prefixo voltar atrás e o branco virar "caractere inesperado".
 lexemas = [
-    ("PRINCIPAL",       r'principal'),
-    ("FUNCAO",          r'funcao'),
-    ("TIPO_VAR",        r'int|real|cadeia|car|booleano|vazio'),
-    ("SENAO",           r'senao'),
-    ("SE",              r'se'),
-    ("ENQUANTO",        r'enquanto'),
-    ("FACA",            r'faca'),
-    ("PARA",            r'para'),
-    ("RETORNO",         r'retornar'),
-    ("BOOLEANO",        r'verdadeiro|falso'),
-    ("NUMERO_REAL",     r'\d+\.\d+'),
-    ("NUMERO_INT",      r'\d+'),
-    ("CARACTERE",       r'\'.\''),
-    ("PALAVRA",         r'"(?:\\.|[^"\\])*"'),
     ("IDENT",           r'[a-zA-Z_]\w*'),
-    ("COMPAR",          r'[<>]=?|==|!='),
-    ("OPER_ARIT",       r'[+\-*/%]'),
-    ("OPER_LOGI_UN",    r'!'),
-    ("OPER_LOGI_BIN",   r'&&|\|\|'),
-    ("ATRIB",           r'='),
-    ("LPAREN",          r'\('),
-    ("RPAREN",          r'\)'),
-    ("LCHAVE",          r'\{'),
-    ("RCHAVE",          r'\}'),
-    ("VIRGULA",         r','),
-    ("PONTOVIRG",       r';'),
+    ("SIMBOLO",         r'[<>=!]=?|&&|\|\||[-+*/%(){},;]'),
+    ("NUMERO",          r'\d+(?:\.\d+)?'),
     ("NOVA_LINHA",      r'\n'),
-    ("IGNORAR",         r'[ \t]+'),
-    ("INCOMPAT",        r'.'),
+    ("PALAVRA",         r'"(?:\\.|[^"\\])*"'),
+    ("CARACTERE",       r'\'.\''),
+    ("INCOMPAT",        r'[^ \t]'),
 ]
-def analisador_lexico(codigo_fonte):
-    cadeiaTokens = []
+# Expressão mestra compilada uma única vez, na importação
+_PADRAO = re.compile(r"[ \t]*(?:" + "|".join(f"(?P<{nome}>{expressao})" for nome, expressao in lexemas) + ")")
+_GRUPO = _PADRAO.groupindex
+
+
+def tipo_token(correspondencia):
+    """
+    Nome do tipo do token casado pela expressão mestra (NOVA_LINHA e
+    INCOMPAT são devolvidos como estão).
+    """
+    classe = correspondencia.lastgroup
+    if classe == "IDENT":
+        return PALAVRAS_CHAVE.get(correspondencia.group(classe), "IDENT")
+    if classe == "SIMBOLO":
+        return SIMBOLOS[correspondencia.group(classe)]
+    if classe == "NUMERO":
+        return "NUMERO_REAL" if "." in correspondencia.group(classe) else "NUMERO_INT"
+    return classe
+
+
+# Quantos caracteres além do fim de um token podem mudar o resultado
+# (ex.: "12" seguido de ".5" vira NUMERO_REAL). Tokens que terminam nessa
+# margem do bloco esperam o próximo bloco antes de serem emitidos.
+_MARGEM = 3
+
+TAMANHO_BLOCO = 1 << 16
+
+# Na leitura em blocos, uma aspa sem fechamento segura o texto seguinte até
+# a aspa que fecha. Passado este tamanho, ela é dada como cadeia não
+# terminada (como no fonte inteiro) e a leitura segue depois dela: a memória
+# fica limitada mesmo com uma aspa perdida no começo de um arquivo grande.
+MAXIMO_CADEIA = 1 << 20
+
+
+def diagnostico_lexico(caractere, linha):
+    if caractere == '"':
+        # a expressão de PALAVRA não casou: nenhuma aspa fecha esta cadeia
+        return Diagnostico("lexico", linha, "Cadeia sem aspas de fechamento")
+    return Diagnostico("lexico", linha, f"Caractere inesperado encontrado: {caractere}")
+
+
+def _caractere_invalido(caractere, linha, diagnosticos):
+    """
+    Sem lista de diagnósticos o erro léxico interrompe a análise (RuntimeError);
+    com ela o caractere é anotado e ignorado.
+    """
+    diagnostico = diagnostico_lexico(caractere, linha)
+    if diagnosticos is None:
+        raise RuntimeError(diagnostico.mensagem)
+    diagnosticos.append(diagnostico)
+
+
+def _tokens_de_blocos(blocos, diagnosticos=None):
+    """
+    Gera (tipo, lexema, linha) a partir de uma sequência de pedaços de texto.
+    Um token que pode continuar no próximo pedaço (perto do fim do bloco ou
+    uma cadeia ainda sem aspas de fechamento) é guardado e reanalisado junto
+    com o pedaço seguinte. Pedaços sem aspas não fecham a cadeia: só são
+    guardados, até MAXIMO_CADEIA caracteres.
+    """
     linha = 1
-    expressaoRegular = ""
-    for Tokennome, expressao in lexemas:
-        expressaoRegular += f"(?P<{Tokennome}>{expressao})|"
-    expressaoRegular = expressaoRegular[:-1]
+    resto = ""
+    aberta = False    # `resto` começa numa aspa sem fechamento
+    pendentes = []    # pedaços guardados atrás dela, ainda não reanalisados
+    guardados = 0
+    blocos = iter(blocos)
+    fim = False
+
+    while not fim:
+        bloco = next(blocos, None)
+        if bloco is None:
+            fim = True
+            bloco = ""
+        elif aberta and '"' not in bloco and len(resto) + guardados + len(bloco) <= MAXIMO_CADEIA:
+            pendentes.append(bloco)
+            guardados += len(bloco)
+            continue
+        texto = "".join([resto, *pendentes, bloco]) if pendentes else resto + bloco
+        # cadeia aberta longa demais: a aspa do início é dada como não terminada
+        desistir = aberta and len(texto) > MAXIMO_CADEIA
+        pendentes, guardados, aberta = [], 0, False
+
+        limite = len(texto) - _MARGEM
+        pos = 0
+        for correspondencia in _PADRAO.finditer(texto):
+            classe = correspondencia.lastgroup
+
+            if classe == "INCOMPAT" and correspondencia.group(classe) == '"' and not fim:
+                if not desistir:
+                    aberta = True
+                    break
+                desistir = False
+            elif not fim and correspondencia.end() > limite:
+                break
+            pos = correspondencia.end()
+
+            if classe == "NOVA_LINHA":
+                linha += 1
+                continue
+            elif classe == "INCOMPAT":
+                _caractere_invalido(correspondencia.group(classe), linha, diagnosticos)
+                continue
+            yield (tipo_token(correspondencia), correspondencia.group(classe), linha)
+
+        resto = texto[pos:]
+
+    yield ("EOF", None, linha)
 
-    correspondencias = re.finditer(expressaoRegular, codigo_fonte)
 
-    for correspondencia in correspondencias:
-        tipo_token = correspondencia.lastgroup
-        vtoken = correspondencia.group()
+def gerar_tokens(codigo_fonte, diagnosticos=None):
+    """
+    Versão preguiçosa de analisador_lexico: gera os tokens um a um.
+    """
+    return _tokens_de_blocos((codigo_fonte,), diagnosticos)
 
-        if tipo_token == "NOVA_LINHA":
-            linha += 1
+
+def gerar_tokens_arquivo(arquivo, tamanho_bloco=TAMANHO_BLOCO, diagnosticos=None):
+    """
+    Gera os tokens de um arquivo .br lendo-o em blocos de `tamanho_bloco`
+    caracteres, sem carregar o fonte inteiro na memória.
+    `arquivo` pode ser um caminho ou um arquivo de texto já aberto.
+    """
+    if hasattr(arquivo, "read"):
+        yield from _tokens_de_blocos(iter(lambda: arquivo.read(tamanho_bloco), ""), diagnosticos)
+        return
+
+    with open(arquivo, "r", encoding="utf-8") as f:
+        yield from _tokens_de_blocos(iter(lambda: f.read(tamanho_bloco), ""), diagnosticos)
+
+
+def analisador_lexico(codigo_fonte, diagnosticos=None):
+    """
+    Lista de tokens (tipo, lexema, linha). Se `diagnosticos` for uma lista,
+    caracteres inválidos são anotados nela e ignorados em vez de gerar
+    RuntimeError.
+    """
+    return list(_tokens_de_blocos((codigo_fonte,), diagnosticos))
+
+
+# Tipos de token que chegam ao analisador sintático, com ids de 0..N-1
+TIPOS_TOKEN = [
+    "PRINCIPAL", "FUNCAO", "TIPO_VAR", "SENAO", "SE", "ENQUANTO", "FACA", "PARA", "RETORNO", "BOOLEANO",
+    "NUMERO_REAL", "NUMERO_INT", "CARACTERE", "PALAVRA", "IDENT", "COMPAR", "OPER_ARIT", "OPER_LOGI_UN",
+    "OPER_LOGI_BIN", "ATRIB", "LPAREN", "RPAREN", "LCHAVE", "RCHAVE", "VIRGULA", "PONTOVIRG", "EOF",
+]
+ID_TIPO = {nome: i for i, nome in enumerate(TIPOS_TOKEN)}
+_ID_PALAVRA_CHAVE = {lexema: ID_TIPO[tipo] for lexema, tipo in PALAVRAS_CHAVE.items()}
+_ID_SIMBOLO = {lexema: ID_TIPO[tipo] for lexema, tipo in SIMBOLOS.items()}
+
+
+class TokenBuffer:
+    """
+    Tokens em colunas paralelas em vez de uma tupla por token:
+    `tipos` (array 'B' com ids de TIPOS_TOKEN), `inicios` e `comprimentos`
+    (array 'I' com deslocamentos no fonte). O lexema é fatiado do fonte
+    só quando pedido e a linha sai de busca binária na tabela
+    `inicios_linha` (deslocamento onde começa cada linha).
+
+    Também se comporta como a antiga lista de tuplas: `buffer[i]` devolve
+    (tipo, lexema, linha), então pode ser passado a exibicao, gerar_pdf e
+    aos analisadores sintáticos.
+    """
+
+    __slots__ = ("fonte", "tipos", "inicios", "comprimentos", "inicios_linha")
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.tipos = array("B")
+        self.inicios = array("I")
+        self.comprimentos = array("I")
+        self.inicios_linha = array("I", [0])
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def tipo(self, i):
+        return TIPOS_TOKEN[self.tipos[i]]
+
+    def lexema(self, i):
+        if self.tipos[i] == ID_TIPO["EOF"]:
+            return None
+        inicio = self.inicios[i]
+        return self.fonte[inicio:inicio + self.comprimentos[i]]
+
+    def linha(self, i):
+        return bisect_right(self.inicios_linha, self.inicios[i])
+
+    def coluna(self, i):
+        inicio = self.inicios[i]
+        return inicio - self.inicios_linha[bisect_right(self.inicios_linha, inicio) - 1] + 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self.tipos)))]
+        if i < 0:
+            i += len(self.tipos)
+        return (self.tipo(i), self.lexema(i), self.linha(i))
+
+    def __iter__(self):
+        for i in range(len(self.tipos)):
+            yield (self.tipo(i), self.lexema(i), self.linha(i))
+
+
+def analisador_lexico_buffer(codigo_fonte, diagnosticos=None):
+    """
+    Mesma análise de analisador_lexico, mas devolve um TokenBuffer.
+    """
+    buffer = TokenBuffer(codigo_fonte)
+    tipos = buffer.tipos.append
+    inicios = buffer.inicios.append
+    comprimentos = buffer.comprimentos.append
+    linhas = buffer.inicios_linha.append
+
+    # classes comparadas pelo índice do grupo, da mais frequente à mais rara
+    ident, simbolo, numero = _GRUPO["IDENT"], _GRUPO["SIMBOLO"], _GRUPO["NUMERO"]
+    nova_linha, incompat = _GRUPO["NOVA_LINHA"], _GRUPO["INCOMPAT"]
+    id_ident, id_real, id_int = ID_TIPO["IDENT"], ID_TIPO["NUMERO_REAL"], ID_TIPO["NUMERO_INT"]
+    id_palavra_chave = _ID_PALAVRA_CHAVE.get
+    id_classe = {_GRUPO["PALAVRA"]: ID_TIPO["PALAVRA"], _GRUPO["CARACTERE"]: ID_TIPO["CARACTERE"]}
+
+    for correspondencia in _PADRAO.finditer(codigo_fonte):
+        classe = correspondencia.lastindex
+
+        if classe == ident:
+            tipos(id_palavra_chave(correspondencia.group(classe), id_ident))
+        elif classe == simbolo:
+            tipos(_ID_SIMBOLO[correspondencia.group(classe)])
+        elif classe == nova_linha:
+            linhas(correspondencia.end())
             continue
-        if tipo_token == "IGNORAR":
+        elif classe == numero:
+            tipos(id_real if "." in correspondencia.group(classe) else id_int)
+        elif classe == incompat:
+            _caractere_invalido(correspondencia.group(classe), len(buffer.inicios_linha), diagnosticos)
             continue
-        elif tipo_token == "INCOMPAT":
-            raise RuntimeError(f"Caractere inesperado encontrado: {vtoken}")
-        cadeiaTokens.append((tipo_token, vtoken, linha))
-    cadeiaTokens.append(("EOF", None, linha))
+        else:
+            tipos(id_classe[classe])
+
+        inicio, fim = correspondencia.span(classe)
+        inicios(inicio)
+        comprimentos(fim - inicio)
 
-    return cadeiaTokens
+    tipos(ID_TIPO["EOF"])
+    inicios(len(codigo_fonte))
+    comprimentos(0)
+    return buffer
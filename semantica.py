@@ -0,0 +1,443 @@
+# semantica.py — Análise semântica em uma passada, executada nas reduções do SLR
+#
+# Uso: analisar_slr(tokens, grammar, tabelas, semantica=AnalisadorSemantico())
+#      ou python main.py app.br --semantica
+#
+# Não há árvore nem segunda travessia: o analisar_slr chama `empilhar` a
+# cada shift e `reduzir` a cada reduce, e o AnalisadorSemantico mantém uma
+# pilha de valores paralela à de estados (posição do token para
+# terminais, tipo da expressão ou listas de parâmetros/argumentos para
+# não-terminais). As ações ficam em ACOES, indexadas pelas produções do
+# brick.bnf. Escopos abrem e fecham nos shifts de "{" / "}" (e de "para",
+# cujo escopo fecha na redução do comando), porque é ali que o parser
+# entra e sai do bloco.
+#
+# Tipo None é "desconhecido" (já houve erro na subexpressão): não gera
+# novos erros, para não reportar a mesma falha em cascata.
+from collections import namedtuple
+
+from diagnosticos import Diagnostico
+from scanner import TIPOS_TOKEN, TokenBuffer
+
+# escopo: profundidade em que foi declarado (1 = bloco mais externo)
+Simbolo = namedtuple("Simbolo", ["nome", "tipo", "linha", "escopo"])
+# parametros: tupla com o tipo de cada parâmetro, em ordem
+Assinatura = namedtuple("Assinatura", ["nome", "retorno", "parametros", "linha"])
+
+NUMERICOS = ("int", "real")
+
+# tipo de cada literal
+TIPO_LITERAL = {
+    "NUMERO_INT": "int",
+    "NUMERO_REAL": "real",
+    "PALAVRA": "cadeia",
+    "CARACTERE": "car",
+    "BOOLEANO": "booleano",
+}
+
+
+class TabelaSimbolos:
+    """
+    Escopos aninhados sobre um único dicionário nome -> pilha de Simbolo
+    (o mais interno no fim); `escopos` guarda os nomes declarados em cada
+    nível, para desfazer ao fechar. Buscar um nome é uma consulta só,
+    qualquer que seja a profundidade.
+    """
+
+    def __init__(self):
+        self.simbolos = {}
+        self.escopos = [[]]
+
+    @property
+    def profundidade(self):
+        return len(self.escopos)
+
+    def abrir(self):
+        self.escopos.append([])
+
+    def fechar(self):
+        for nome in self.escopos.pop():
+            pilha = self.simbolos[nome]
+            pilha.pop()
+            if not pilha:
+                del self.simbolos[nome]
+
+    def declarar(self, nome, tipo, linha):
+        """
+        Declara `nome` no escopo atual. Se já existe nele, não declara e
+        devolve o Simbolo anterior; senão devolve None.
+        """
+        pilha = self.simbolos.setdefault(nome, [])
+        if pilha and pilha[-1].escopo == len(self.escopos):
+            return pilha[-1]
+        pilha.append(Simbolo(nome, tipo, linha, len(self.escopos)))
+        self.escopos[-1].append(nome)
+        return None
+
+    def buscar(self, nome):
+        pilha = self.simbolos.get(nome)
+        return pilha[-1] if pilha else None
+
+
+def compativel(destino, origem):
+    """
+    Valor do tipo `origem` pode ir para `destino` (int alarga para real).
+    """
+    return origem is None or destino is None or destino == origem or (destino == "real" and origem == "int")
+
+
+class AnalisadorSemantico:
+    """
+    Tabela de símbolos com escopos, tabela de assinaturas de funções e
+    verificação de declarações, aridade e tipos básicos, tudo durante a
+    análise SLR. Depois da análise, `funcoes` tem as assinaturas
+    (nome -> Assinatura) e `erros` o número de erros semânticos.
+
+    Funções precisam ser declaradas antes do uso (o cabeçalho é
+    registrado assim que seus parâmetros são reduzidos, o que já permite
+    recursão). No primeiro erro sintático a pilha de valores deixa de
+    corresponder à de estados: o parser chama `abandonar` e a verificação
+    para ali.
+    """
+
+    def __init__(self):
+        self.funcoes = {}
+        self.erros = 0
+        self.abandonada = False
+
+    def iniciar(self, tokens, producoes, diagnosticos=None):
+        """
+        Prepara uma análise. `producoes` é a lista (A, corpo) da tabela LR,
+        na ordem dos ids de produção que chegam em `reduzir`.
+        """
+        self.tokens = tokens
+        self.diagnosticos = diagnosticos if diagnosticos is not None else []
+        self.simbolos = TabelaSimbolos()
+        self.funcoes = {}
+        self.erros = 0
+        self.abandonada = False
+        self.valores = []
+        self.ausentes = set()
+        self.tipo_declarado = None
+        # cabeçalho (Assinatura, parâmetros) esperando a "{" do corpo e
+        # pilha de (profundidade do corpo, Assinatura) das funções abertas
+        self.cabecalho = None
+        self.funcoes_abertas = []
+
+        if isinstance(tokens, TokenBuffer):
+            self.tipos, nomes = tokens.tipos, TIPOS_TOKEN
+            self.lexema, self.linha = tokens.lexema, tokens.linha
+        else:
+            self.tipos, nomes = range(len(tokens)), [tk[0] for tk in tokens]
+            self.lexema, self.linha = (lambda i: tokens[i][1]), (lambda i: tokens[i][2])
+        ao_empilhar = {
+            "TIPO_VAR": self._tipo_var,
+            "LCHAVE": self._abrir_bloco,
+            "RCHAVE": self._fechar_bloco,
+            "PARA": self._abrir_para,
+        }
+        self.nomes = nomes
+        self.ao_empilhar = [ao_empilhar.get(nome) for nome in nomes]
+        self.acoes = [getattr(self, ACOES[(A, tuple(corpo))]) if (A, tuple(corpo)) in ACOES else None
+                      for A, corpo in producoes]
+
+    def abandonar(self):
+        self.abandonada = True
+
+    # ---------- chamadas do parser ----------
+    def empilhar(self, pos):
+        self.valores.append(pos)
+        acao = self.ao_empilhar[self.tipos[pos]]
+        if acao is not None:
+            acao(pos)
+
+    def reduzir(self, producao, tamanho):
+        valores = self.valores
+        acao = self.acoes[producao]
+        if tamanho:
+            filhos = valores[-tamanho:]
+            del valores[-tamanho:]
+        else:
+            filhos = ()
+        valores.append(acao(filhos) if acao is not None else None)
+
+    # ---------- diagnósticos ----------
+    def _erro(self, pos, mensagem):
+        self.erros += 1
+        self.diagnosticos.append(Diagnostico("semantica", self.linha(pos), mensagem))
+
+    def _nao_declarado(self, pos, categoria, nome):
+        # uma mensagem por nome, não uma por uso
+        if (categoria, nome) not in self.ausentes:
+            self.ausentes.add((categoria, nome))
+            self._erro(pos, f"{categoria} '{nome}' não declarada")
+
+    # ---------- shifts ----------
+    def _tipo_var(self, pos):
+        self.tipo_declarado = self.lexema(pos)
+
+    def _abrir_bloco(self, pos):
+        self.simbolos.abrir()
+        if self.cabecalho is not None:
+            assinatura, parametros = self.cabecalho
+            self.cabecalho = None
+            self.funcoes_abertas.append((self.simbolos.profundidade, assinatura))
+            for tipo, pos_nome in parametros:
+                self._declarar(pos_nome, tipo, "parâmetro")
+
+    def _fechar_bloco(self, pos):
+        if self.funcoes_abertas and self.funcoes_abertas[-1][0] == self.simbolos.profundidade:
+            self.funcoes_abertas.pop()
+        self.simbolos.fechar()
+
+    def _abrir_para(self, pos):
+        # a variável declarada no "para" vale só dentro dele
+        self.simbolos.abrir()
+
+    # ---------- declarações ----------
+    def _declarar(self, pos, tipo, categoria):
+        nome = self.lexema(pos)
+        if tipo == "vazio":
+            self._erro(pos, f"{categoria} '{nome}' não pode ser do tipo vazio")
+            tipo = None
+        anterior = self.simbolos.declarar(nome, tipo, self.linha(pos))
+        if anterior is not None:
+            self._erro(pos, f"'{nome}' já declarada neste escopo (linha {anterior.linha})")
+
+    def _parametros(self, filhos):
+        # PARAMS_G → TIPO_VAR IDENT PARAMS_RESTO_G
+        parametros = ((self.lexema(filhos[0]), filhos[1]),) + filhos[2]
+        self._cabecalho_funcao(parametros)
+        return parametros
+
+    def _sem_parametros(self, filhos):
+        self._cabecalho_funcao(())
+        return ()
+
+    def _mais_parametros(self, filhos):
+        # PARAMS_RESTO_G → VIRGULA TIPO_VAR IDENT PARAMS_RESTO_G
+        return ((self.lexema(filhos[1]), filhos[2]),) + filhos[3]
+
+    def _cabecalho_funcao(self, parametros):
+        # pilha: ... FUNCAO TIPO_VAR IDENT LPAREN (os parâmetros acabaram de sair)
+        pos_tipo, pos_nome = self.valores[-3], self.valores[-2]
+        nome = self.lexema(pos_nome)
+        assinatura = Assinatura(nome, self.lexema(pos_tipo), tuple(t for t, _ in parametros), self.linha(pos_nome))
+        anterior = self.funcoes.get(nome)
+        if anterior is not None:
+            self._erro(pos_nome, f"função '{nome}' já declarada (linha {anterior.linha})")
+        else:
+            self.funcoes[nome] = assinatura
+        self.cabecalho = (assinatura, parametros)
+
+    def _declaracao(self, filhos):
+        # DECLARACOES_ATRIB_G → ATRIB EXPRESSAO_G | ε; o IDENT declarado está logo abaixo
+        pos_nome = self.valores[-1]
+        tipo = self.tipo_declarado
+        self._declarar(pos_nome, tipo, "variável")
+        if filhos and tipo != "vazio" and not compativel(tipo, filhos[1]):
+            self._erro(filhos[0], f"'{self.lexema(pos_nome)}' é {tipo}, inicializada com {filhos[1]}")
+
+    # ---------- comandos ----------
+    def _comando_ident(self, filhos):
+        # COMANDO_G → IDENT ELEMENTO_IDENT_G PONTOVIRG
+        forma, valor = filhos[1]
+        if forma == "(":
+            self._chamada(filhos[0], valor)
+        else:
+            self._atribuicao(filhos[0], valor)
+
+    def _atribuicao_para(self, filhos):
+        # ATRIBUICAO_G → IDENT ATRIB EXPRESSAO_G
+        self._atribuicao(filhos[0], filhos[2])
+
+    def _atribuicao(self, pos_nome, tipo):
+        nome = self.lexema(pos_nome)
+        simbolo = self.simbolos.buscar(nome)
+        if simbolo is None:
+            self._nao_declarado(pos_nome, "variável", nome)
+        elif not compativel(simbolo.tipo, tipo):
+            self._erro(pos_nome, f"'{nome}' é {simbolo.tipo}, recebe {tipo}")
+
+    def _elemento_atribuicao(self, filhos):
+        return ("=", filhos[1])
+
+    def _elemento_chamada(self, filhos):
+        return ("(", filhos[1])
+
+    def _condicao(self, pos, tipo, comando):
+        if tipo is not None and tipo != "booleano":
+            self._erro(pos, f"condição do '{comando}' deve ser booleano, não {tipo}")
+
+    def _se(self, filhos):
+        self._condicao(filhos[0], filhos[2], "se")
+
+    def _enquanto(self, filhos):
+        self._condicao(filhos[0], filhos[2], "enquanto")
+
+    def _faca(self, filhos):
+        self._condicao(filhos[4], filhos[6], "faca")
+
+    def _para(self, filhos):
+        self._condicao(filhos[0], filhos[4], "para")
+        self.simbolos.fechar()
+
+    def _retorno(self, filhos):
+        if not self.funcoes_abertas:
+            return
+        funcao = self.funcoes_abertas[-1][1]
+        tipo = filhos[1]
+        if funcao.retorno == "vazio":
+            self._erro(filhos[0], f"função '{funcao.nome}' é vazio e não retorna valor")
+        elif not compativel(funcao.retorno, tipo):
+            self._erro(filhos[0], f"função '{funcao.nome}' retorna {funcao.retorno}, não {tipo}")
+
+    # ---------- chamadas ----------
+    def _chamada(self, pos_nome, argumentos):
+        nome = self.lexema(pos_nome)
+        funcao = self.funcoes.get(nome)
+        if funcao is None:
+            self._nao_declarado(pos_nome, "função", nome)
+            return None
+        if len(argumentos) != len(funcao.parametros):
+            self._erro(pos_nome, f"'{nome}' espera {len(funcao.parametros)} argumento(s), recebeu {len(argumentos)}")
+        else:
+            for k, (esperado, tipo) in enumerate(zip(funcao.parametros, argumentos), 1):
+                if not compativel(esperado, tipo):
+                    self._erro(pos_nome, f"argumento {k} de '{nome}' deve ser {esperado}, não {tipo}")
+        return funcao.retorno
+
+    def _argumentos(self, filhos):
+        # ARGUMENTOS_G → EXPRESSAO_G ARGUMENTOS_RESTO_G
+        return (filhos[0],) + filhos[1]
+
+    def _mais_argumentos(self, filhos):
+        # ARGUMENTOS_RESTO_G → VIRGULA EXPRESSAO_G ARGUMENTOS_RESTO_G
+        return (filhos[1],) + filhos[2]
+
+    # ---------- expressões ----------
+    def _vazia(self, filhos):
+        return ()
+
+    def _repassar(self, filhos):
+        return filhos[0]
+
+    def _parenteses(self, filhos):
+        return filhos[1]
+
+    def _literal(self, filhos):
+        return TIPO_LITERAL[self.nomes[self.tipos[filhos[0]]]]
+
+    def _nao(self, filhos):
+        tipo = filhos[1]
+        if tipo is not None and tipo != "booleano":
+            self._erro(filhos[0], f"'!' exige booleano, não {tipo}")
+            return None
+        return tipo
+
+    def _fator_ident(self, filhos):
+        # FATOR_G → IDENT FATOR_IDENT_G: variável (ε) ou chamada (argumentos)
+        if filhos[1] is not None:
+            return self._chamada(filhos[0], filhos[1])
+        nome = self.lexema(filhos[0])
+        simbolo = self.simbolos.buscar(nome)
+        if simbolo is None:
+            self._nao_declarado(filhos[0], "variável", nome)
+            return None
+        return simbolo.tipo
+
+    def _resto(self, filhos):
+        # *_RESTO_G → OPERADOR operando *_RESTO_G: encadeado (operador, tipo, resto)
+        return tuple(filhos)
+
+    def _dobrar(self, filhos, operacao):
+        # X → operando X_RESTO_G: aplica os operadores da esquerda para a direita
+        tipo, resto = filhos
+        while resto is not None:
+            pos, direita, resto = resto
+            tipo = operacao(pos, tipo, direita)
+        return tipo
+
+    def _aritmetica(self, filhos):
+        return self._dobrar(filhos, self._operacao_aritmetica)
+
+    def _comparacao(self, filhos):
+        return self._dobrar(filhos, self._operacao_comparacao)
+
+    def _logica(self, filhos):
+        return self._dobrar(filhos, self._operacao_logica)
+
+    def _operacao_aritmetica(self, pos, esquerda, direita):
+        if esquerda is None or direita is None:
+            return None
+        if esquerda in NUMERICOS and direita in NUMERICOS:
+            return "real" if "real" in (esquerda, direita) else "int"
+        operador = self.lexema(pos)
+        if operador == "+" and esquerda == direita == "cadeia":
+            return "cadeia"
+        self._erro(pos, f"'{operador}' não se aplica a {esquerda} e {direita}")
+        return None
+
+    def _operacao_comparacao(self, pos, esquerda, direita):
+        if esquerda is None or direita is None:
+            return "booleano"
+        operador = self.lexema(pos)
+        if esquerda in NUMERICOS and direita in NUMERICOS:
+            return "booleano"
+        if esquerda == direita and operador in ("==", "!="):
+            return "booleano"
+        self._erro(pos, f"'{operador}' não compara {esquerda} com {direita}")
+        return "booleano"
+
+    def _operacao_logica(self, pos, esquerda, direita):
+        if esquerda is None or direita is None:
+            return None
+        if esquerda == direita == "booleano":
+            return "booleano"
+        self._erro(pos, f"'{self.lexema(pos)}' exige booleano, não {esquerda} e {direita}")
+        return None
+
+
+# Produção do brick.bnf (corpo sem ε) -> método do AnalisadorSemantico.
+# Produções sem ação (listas de comandos, blocos...) deixam None na pilha.
+ACOES = {
+    ("PARAMS_G", ("TIPO_VAR", "IDENT", "PARAMS_RESTO_G")): "_parametros",
+    ("PARAMS_G", ()): "_sem_parametros",
+    ("PARAMS_RESTO_G", ("VIRGULA", "TIPO_VAR", "IDENT", "PARAMS_RESTO_G")): "_mais_parametros",
+    ("PARAMS_RESTO_G", ()): "_vazia",
+    ("COMANDO_G", ("IDENT", "ELEMENTO_IDENT_G", "PONTOVIRG")): "_comando_ident",
+    ("COMANDO_G", ("SE", "LPAREN", "EXPRESSAO_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE", "SENAO_G")): "_se",
+    ("COMANDO_G", ("ENQUANTO", "LPAREN", "EXPRESSAO_G", "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE")): "_enquanto",
+    ("COMANDO_G", ("FACA", "LCHAVE", "COMANDOS_G", "RCHAVE", "ENQUANTO", "LPAREN", "EXPRESSAO_G", "RPAREN",
+                   "PONTOVIRG")): "_faca",
+    ("COMANDO_G", ("PARA", "LPAREN", "DECL_OU_ATRIB_G", "PONTOVIRG", "EXPRESSAO_G", "PONTOVIRG", "ATRIBUICAO_G",
+                   "RPAREN", "LCHAVE", "COMANDOS_G", "RCHAVE")): "_para",
+    ("COMANDO_G", ("RETORNO", "EXPRESSAO_G", "PONTOVIRG")): "_retorno",
+    ("DECLARACOES_ATRIB_G", ("ATRIB", "EXPRESSAO_G")): "_declaracao",
+    ("DECLARACOES_ATRIB_G", ()): "_declaracao",
+    ("ATRIBUICAO_G", ("IDENT", "ATRIB", "EXPRESSAO_G")): "_atribuicao_para",
+    ("ELEMENTO_IDENT_G", ("ATRIB", "EXPRESSAO_G")): "_elemento_atribuicao",
+    ("ELEMENTO_IDENT_G", ("LPAREN", "ARGUMENTOS_G", "RPAREN")): "_elemento_chamada",
+    ("ARGUMENTOS_G", ("EXPRESSAO_G", "ARGUMENTOS_RESTO_G")): "_argumentos",
+    ("ARGUMENTOS_G", ()): "_vazia",
+    ("ARGUMENTOS_RESTO_G", ("VIRGULA", "EXPRESSAO_G", "ARGUMENTOS_RESTO_G")): "_mais_argumentos",
+    ("ARGUMENTOS_RESTO_G", ()): "_vazia",
+    ("EXPRESSAO_G", ("EXPR_LOGICA_G",)): "_repassar",
+    ("EXPR_LOGICA_G", ("EXPR_COMPAR_G", "EXPR_LOGICA_RESTO_G")): "_logica",
+    ("EXPR_LOGICA_RESTO_G", ("OPER_LOGI_BIN", "EXPR_COMPAR_G", "EXPR_LOGICA_RESTO_G")): "_resto",
+    ("EXPR_COMPAR_G", ("EXPR_ARITMETICA_G", "EXPR_COMPAR_RESTO_G")): "_comparacao",
+    ("EXPR_COMPAR_RESTO_G", ("COMPAR", "EXPR_ARITMETICA_G", "EXPR_COMPAR_RESTO_G")): "_resto",
+    ("EXPR_ARITMETICA_G", ("TERMO_G", "EXPR_ARITMETICA_RESTO_G")): "_aritmetica",
+    ("EXPR_ARITMETICA_RESTO_G", ("OPER_ARIT", "TERMO_G", "EXPR_ARITMETICA_RESTO_G")): "_resto",
+    ("TERMO_G", ("FATOR_G", "TERMO_RESTO_G")): "_aritmetica",
+    ("TERMO_RESTO_G", ("OPER_ARIT", "FATOR_G", "TERMO_RESTO_G")): "_resto",
+    ("FATOR_G", ("LPAREN", "EXPRESSAO_G", "RPAREN")): "_parenteses",
+    ("FATOR_G", ("OPER_LOGI_UN", "FATOR_G")): "_nao",
+    ("FATOR_G", ("IDENT", "FATOR_IDENT_G")): "_fator_ident",
+    ("FATOR_G", ("NUMERO_INT",)): "_literal",
+    ("FATOR_G", ("NUMERO_REAL",)): "_literal",
+    ("FATOR_G", ("PALAVRA",)): "_literal",
+    ("FATOR_G", ("CARACTERE",)): "_literal",
+    ("FATOR_G", ("BOOLEANO",)): "_literal",
+    ("FATOR_IDENT_G", ("LPAREN", "ARGUMENTOS_G", "RPAREN")): "_parenteses",
+}
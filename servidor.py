@@ -0,0 +1,304 @@
+# servidor.py — Servidor de compilação com as tabelas já carregadas (socket Unix ou stdio)
+#
+# Uso: python servidor.py [--socket CAMINHO | --stdio] [--processos N]
+#
+# Protocolo: JSON-RPC 2.0 com o enquadramento do LSP (cabeçalho
+# "Content-Length: N" + linha em branco + N bytes de JSON), igual nos dois
+# transportes. Métodos:
+#   analisar  {codigo, metodo?: "slr"|"lalr", rastro?: "desligado"|"anel"|"completo",
+#              tokens?: bool}  -> {tokens?, diagnosticos, ll1_aceito, lr_aceito,
+#                                  passos_ll1?, passos_slr?, tempos}
+#   ping      {}               -> "pong"
+#   encerrar  {}               -> null (o servidor termina depois de responder)
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from cache_tabelas import obter_tabelas
+from grammar import grammar
+
+SOCKET_PADRAO = os.path.join(tempfile.gettempdir(), f"brick-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+
+ERRO_JSON = -32700
+ERRO_REQUISICAO = -32600
+ERRO_METODO = -32601
+ERRO_PARAMETROS = -32602
+ERRO_INTERNO = -32603
+
+# threads que analisam quando não há pool de processos: o laço de eventos
+# continua atendendo os outros clientes durante uma análise longa
+THREADS_ANALISE = 4
+
+# contexto dos processos de trabalho (--processos > 1), criado no fork
+_contexto = None
+
+
+class ErroRPC(Exception):
+    def __init__(self, codigo, mensagem):
+        super().__init__(mensagem)
+        self.codigo = codigo
+
+
+class Contexto:
+    """
+    Analisador LL(1) e tabelas SLR/LALR montados uma vez e reaproveitados
+    por todas as requisições.
+    """
+
+    def __init__(self, tabelas):
+        from ll1_parser import AnalisadorSintaticoLL1
+
+        self.parser = AnalisadorSintaticoLL1(grammar, tabelas.ll1)
+        self.tabelas_lr = {"slr": tabelas.lr("slr"), "lalr": tabelas.lr("lalr")}
+
+
+def analisar(contexto, params):
+    """
+    Executa uma requisição "analisar" (síncrona, sem impressão).
+    """
+    from scanner import analisador_lexico_buffer
+    from slr_parser import analisar_slr
+
+    codigo = params.get("codigo")
+    metodo = params.get("metodo", "slr")
+    rastro = params.get("rastro", "desligado")
+    if not isinstance(codigo, str):
+        raise ErroRPC(ERRO_PARAMETROS, "'codigo' deve ser o texto do programa")
+    if metodo not in contexto.tabelas_lr:
+        raise ErroRPC(ERRO_PARAMETROS, f"método desconhecido: {metodo!r}")
+    if rastro not in ("desligado", "anel", "completo"):
+        raise ErroRPC(ERRO_PARAMETROS, f"nível de rastro desconhecido: {rastro!r}")
+
+    tempos = {}
+    diagnosticos = []
+    t = time.perf_counter()
+    tokens = analisador_lexico_buffer(codigo, diagnosticos)
+    tempos["lexico"] = time.perf_counter() - t
+    n_lexico = len(diagnosticos)
+
+    t = time.perf_counter()
+    passos_ll1 = contexto.parser.analisar(tokens, rastro, diagnosticos, exibir=False)
+    tempos["ll1"] = time.perf_counter() - t
+    n_ll1 = len(diagnosticos)
+
+    t = time.perf_counter()
+    _, passos_slr = analisar_slr(tokens, grammar, contexto.tabelas_lr[metodo], rastro,
+                                 diagnosticos=diagnosticos, exibir=False)
+    tempos[metodo] = time.perf_counter() - t
+
+    resposta = {
+        "diagnosticos": [d._asdict() for d in diagnosticos],
+        "ll1_aceito": n_ll1 == 0,
+        "lr_aceito": n_lexico == 0 and len(diagnosticos) == n_ll1,
+        "tempos": tempos,
+    }
+    if params.get("tokens"):
+        resposta["tokens"] = list(tokens)
+    if rastro != "desligado":
+        resposta["passos_ll1"] = list(passos_ll1)
+        resposta["passos_slr"] = list(passos_slr)
+    return resposta
+
+
+def _inicializar(tabelas):
+    global _contexto
+    _contexto = Contexto(tabelas)
+
+
+def _analisar_no_processo(params):
+    return analisar(_contexto, params)
+
+
+async def ler_mensagem(leitor):
+    """
+    Próxima mensagem (bytes do corpo) ou None no fim da conexão.
+    Content-Length que não é um inteiro não negativo gera
+    ErroRPC(ERRO_REQUISICAO): sem ele não há como achar o fim do corpo.
+    """
+    tamanho = None
+    while True:
+        try:
+            linha = await leitor.readline()
+        except ValueError:
+            raise ErroRPC(ERRO_REQUISICAO, "linha de cabeçalho longa demais")
+        if not linha:
+            return None
+        linha = linha.strip()
+        if not linha:
+            if tamanho is None:
+                continue
+            break
+        nome, _, valor = linha.decode("ascii", "replace").partition(":")
+        if nome.strip().lower() == "content-length":
+            valor = valor.strip()
+            if not (valor.isascii() and valor.isdigit()):
+                raise ErroRPC(ERRO_REQUISICAO, f"Content-Length inválido: {valor!r}")
+            tamanho = int(valor)
+    try:
+        return await leitor.readexactly(tamanho)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def enquadrar(mensagem):
+    corpo = json.dumps(mensagem, ensure_ascii=False).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(corpo) + corpo
+
+
+class ServidorCompilacao:
+    """
+    Atende requisições JSON-RPC de vários clientes ao mesmo tempo: cada
+    conexão é uma tarefa e cada requisição também, então as respostas
+    podem sair fora de ordem (casadas pelo "id"). A análise nunca roda no
+    laço de eventos: vai para um pool de threads (que compartilham o
+    Contexto, só lido) ou, com `processos` > 1, para um pool de processos
+    que herda as tabelas. Um enquadramento inválido recebe um erro
+    JSON-RPC e encerra só aquela conexão.
+    """
+
+    def __init__(self, tabelas, processos=1):
+        self.contexto = Contexto(tabelas)
+        if processos > 1:
+            self.pool = ProcessPoolExecutor(processos, initializer=_inicializar, initargs=(tabelas,))
+        else:
+            self.pool = ThreadPoolExecutor(THREADS_ANALISE)
+        self.encerrado = None
+        self._conexoes = set()
+
+    async def _executar(self, metodo, params):
+        if metodo == "ping":
+            return "pong"
+        if metodo == "encerrar":
+            self.encerrado.set()
+            return None
+        if metodo != "analisar":
+            raise ErroRPC(ERRO_METODO, f"método não encontrado: {metodo}")
+        if not isinstance(params, dict):
+            raise ErroRPC(ERRO_PARAMETROS, "parâmetros devem ser um objeto")
+        loop = asyncio.get_running_loop()
+        if isinstance(self.pool, ThreadPoolExecutor):
+            return await loop.run_in_executor(self.pool, analisar, self.contexto, params)
+        return await loop.run_in_executor(self.pool, _analisar_no_processo, params)
+
+    async def atender(self, corpo, escrever):
+        """
+        Responde uma mensagem; notificações (sem "id") não têm resposta.
+        """
+        identificador = None
+        try:
+            try:
+                mensagem = json.loads(corpo)
+            except ValueError as erro:
+                raise ErroRPC(ERRO_JSON, f"JSON inválido: {erro}")
+            if not isinstance(mensagem, dict) or "method" not in mensagem:
+                raise ErroRPC(ERRO_REQUISICAO, "requisição inválida")
+            identificador = mensagem.get("id")
+            resultado = await self._executar(mensagem["method"], mensagem.get("params", {}))
+            resposta = {"jsonrpc": "2.0", "id": identificador, "result": resultado}
+            if identificador is None:
+                return
+        except ErroRPC as erro:
+            resposta = {"jsonrpc": "2.0", "id": identificador,
+                        "error": {"code": erro.codigo, "message": str(erro)}}
+        except Exception as erro:
+            resposta = {"jsonrpc": "2.0", "id": identificador,
+                        "error": {"code": ERRO_INTERNO, "message": f"{type(erro).__name__}: {erro}"}}
+        escrever(enquadrar(resposta))
+
+    async def conexao(self, leitor, escrever):
+        tarefas = set()
+        # a leitura disputa com o pedido de encerramento (de qualquer cliente)
+        encerrar = asyncio.ensure_future(self.encerrado.wait())
+        while True:
+            leitura = asyncio.ensure_future(ler_mensagem(leitor))
+            await asyncio.wait((leitura, encerrar), return_when=asyncio.FIRST_COMPLETED)
+            if not leitura.done():
+                leitura.cancel()
+                break
+            try:
+                corpo = leitura.result()
+            except ErroRPC as erro:
+                # fora de sincronia com o cliente: responde e fecha a conexão
+                escrever(enquadrar({"jsonrpc": "2.0", "id": None,
+                                    "error": {"code": erro.codigo, "message": str(erro)}}))
+                break
+            if corpo is None:
+                break
+            tarefa = asyncio.create_task(self.atender(corpo, escrever))
+            tarefas.add(tarefa)
+            tarefa.add_done_callback(tarefas.discard)
+        encerrar.cancel()
+        if tarefas:
+            await asyncio.gather(*tarefas)
+
+    async def _conexao_socket(self, leitor, escritor):
+        tarefa = asyncio.current_task()
+        self._conexoes.add(tarefa)
+        try:
+            await self.conexao(leitor, escritor.write)
+            await escritor.drain()
+        finally:
+            escritor.close()
+            self._conexoes.discard(tarefa)
+
+    async def servir_socket(self, caminho=SOCKET_PADRAO):
+        self.encerrado = asyncio.Event()
+        if os.path.exists(caminho):
+            os.unlink(caminho)
+        servidor = await asyncio.start_unix_server(self._conexao_socket, path=caminho)
+        print(f"servidor Brick ouvindo em {caminho}", file=sys.stderr)
+        try:
+            async with servidor:
+                await self.encerrado.wait()
+                # conexões abertas terminam as requisições em andamento
+                await asyncio.gather(*self._conexoes, return_exceptions=True)
+        finally:
+            if os.path.exists(caminho):
+                os.unlink(caminho)
+
+    async def servir_stdio(self):
+        self.encerrado = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        leitor = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(leitor), sys.stdin)
+        saida = sys.stdout.buffer
+
+        def escrever(dados):
+            saida.write(dados)
+            saida.flush()
+
+        await self.conexao(leitor, escrever)
+
+    def fechar(self):
+        self.pool.shutdown()
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Servidor de compilação Brick (tabelas em memória).")
+    transporte = args.add_mutually_exclusive_group()
+    transporte.add_argument("--socket", default=SOCKET_PADRAO, help=f"socket Unix (padrão: {SOCKET_PADRAO})")
+    transporte.add_argument("--stdio", action="store_true", help="JSON-RPC pela entrada/saída padrão")
+    args.add_argument("--processos", type=int, default=1,
+                      help="analisa em um pool de processos (padrão: 1, threads fora do laço de eventos)")
+    opcoes = args.parse_args(argv)
+
+    servidor = ServidorCompilacao(obter_tabelas(grammar), opcoes.processos)
+    try:
+        if opcoes.stdio:
+            asyncio.run(servidor.servir_stdio())
+        else:
+            asyncio.run(servidor.servir_socket(opcoes.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,13 @@
 # slr_parser.py
-from grammar import grammar, follow
-from tabela import GramaticaConvertida, ReducaoFinal
+import sys
+from array import array
+from collections import Counter, deque
+
+from arvore import NENHUM
+from grammar import analyze
+from diagnosticos import Diagnostico
+from rastro import COMPLETO, criar_rastro
+from scanner import TIPOS_TOKEN, TokenBuffer
 def sanitize(text):
     """
     Remove quebras de linha / tabs e normaliza espaços.
@@ -18,89 +25,308 @@ def Conversao(G):
     return nova
 
 def itens_lr0(G):
+    """
+    Coleção canônica LR(0) construída a partir dos kernels.
+
+    Cada estado é identificado pelo seu kernel (itens que não começam com o
+    ponto no início); um dicionário kernel -> id encontra estados repetidos
+    em O(1) e uma fila de trabalho processa cada estado uma única vez.
+    O fechamento usa os fechos de cada não-terminal calculados de antemão.
+
+    Devolve (estados, trans, G2): `estados[i]` é a tupla ordenada dos itens
+    (A, prod, ponto) do estado i e `trans[(i, X)]` o estado de destino.
+    """
 
     inicial = list(G.keys())[0]
     G2 = {"S'": [[inicial]]}
     G2.update(G)
 
-    def fechamento(itens):
-        fecho = set(itens)
-        mudou = True
-        while mudou:
-            mudou = False
-            novos = set()
-            for (A, prod, ponto) in fecho:
-                if ponto < len(prod):
-                    X = prod[ponto]
-                    if X in G2:
-                        for p in G2[X]:
-                            item = (X, tuple(p), 0)
-                            if item not in fecho:
-                                novos.add(item)
-            if novos:
-                fecho |= novos
-                mudou = True
-        return frozenset(fecho)
-
-    def GOTO(I, X):
-        mov = {
-            (A, prod, ponto + 1)
-            for (A, prod, ponto) in I
-            if ponto < len(prod) and prod[ponto] == X
-        }
-        return fechamento(mov) if mov else frozenset()
-
-    I0 = fechamento({("S'", (inicial,), 0)})
-    estados = [I0]
+    # fecho_nt[X]: todos os itens (Y, prod, 0) que entram no fechamento quando
+    # o ponto está antes de X (Y alcançável por X como primeiro símbolo)
+    fecho_nt = {}
+    for X in G2:
+        alcancaveis = [X]
+        vistos = {X}
+        for Y in alcancaveis:
+            for p in G2[Y]:
+                if p and p[0] in G2 and p[0] not in vistos:
+                    vistos.add(p[0])
+                    alcancaveis.append(p[0])
+        fecho_nt[X] = tuple((Y, tuple(p), 0) for Y in alcancaveis for p in G2[Y])
+
+    def fechamento(kernel):
+        itens = dict.fromkeys(kernel)
+        expandidos = set()
+        for (A, prod, ponto) in kernel:
+            if ponto < len(prod):
+                X = prod[ponto]
+                if X in G2 and X not in expandidos:
+                    expandidos.add(X)
+                    itens.update(dict.fromkeys(fecho_nt[X]))
+        return tuple(itens)
+
+    k0 = (("S'", (inicial,), 0),)
+    estado_do_kernel = {frozenset(k0): 0}
+    estados = [fechamento(k0)]
     trans = {}
-    mudou = True
-
-    while mudou:
-        mudou = False
-        for i, estado in enumerate(estados):
-            simbolos = set(prod[p] for (A, prod, p) in estado if p < len(prod))
-            for X in simbolos:
-                dest = GOTO(estado, X)
-                if dest and dest not in estados:
-                    estados.append(dest)
-                    mudou = True
-                trans[(i, X)] = estados.index(dest)
+    fila = deque([0])
+
+    while fila:
+        i = fila.popleft()
+
+        # kernels de destino agrupados pelo símbolo após o ponto,
+        # na ordem em que os símbolos aparecem no estado
+        destinos = {}
+        for (A, prod, ponto) in estados[i]:
+            if ponto < len(prod):
+                destinos.setdefault(prod[ponto], []).append((A, prod, ponto + 1))
+
+        for X, kernel in destinos.items():
+            chave = frozenset(kernel)
+            j = estado_do_kernel.get(chave)
+            if j is None:
+                j = len(estados)
+                estado_do_kernel[chave] = j
+                estados.append(fechamento(kernel))
+                fila.append(j)
+            trans[(i, X)] = j
 
     return estados, trans, G2
-def ConstrucaoTabelaSLR(G):
+def _ordem_producoes(G2):
+    return {(A, tuple(p)): k for k, (A, prods) in enumerate((A, ps) for A, ps in G2.items()) for p in prods}
 
-    estados, trans, G2 = itens_lr0(G)
-    acao = {}
-    goto = {}
-    start = "PROGRAMA_G"
 
-    for i, estado in enumerate(estados):
+def _define_acao(acao, chave, nova, conflitos, ordem):
+    """
+    Grava uma ação em ACTION. Em conflito vale a convenção do yacc:
+    accept > shift > reduce, e entre dois reduce vence a produção que
+    aparece primeiro na gramática. Conflitos são anotados em `conflitos`
+    (se for uma lista) como (estado, terminal, existente, nova, escolhida).
+    """
+    atual = acao.get(chave)
+    if atual is None or atual == nova:
+        acao[chave] = nova
+        return
+
+    prioridade = {"accept": 0, "shift": 1, "reduce": 2}
+    pa, pn = prioridade[atual[0]], prioridade[nova[0]]
+    if pa != pn:
+        escolhida = atual if pa < pn else nova
+    else:
+        escolhida = atual if ordem[atual[1]] <= ordem[nova[1]] else nova
+
+    if conflitos is not None:
+        conflitos.append((chave[0], chave[1], atual, nova, escolhida))
+    acao[chave] = escolhida
 
-        for (A, prod, p) in estado:
 
+def _acoes_lr0(G, estados, trans, acao, goto, conflitos, ordem):
+    """
+    Parte comum do SLR e do LALR: shifts, accept e GOTO.
+    """
+    for i, estado in enumerate(estados):
+        for (A, prod, p) in estado:
             if p < len(prod):
                 sym = prod[p]
                 # símbolo de transição é terminal (shift)
                 if sym not in G:
                     j = trans.get((i, sym))
                     if j is not None:
-                        acao[(i, sym)] = ("shift", j)
+                        _define_acao(acao, (i, sym), ("shift", j), conflitos, ordem)
+            elif A == "S'":
+                _define_acao(acao, (i, "EOF"), ("accept", None), conflitos, ordem)
 
-            else:
-                # ponto no fim da produção: reduce ou accept
-                if A == "S'":
-                    acao[(i, "EOF")] = ("accept", None)
-                else:
-                    for t in follow(A, grammar, start):
-                        acao[(i, t)] = ("reduce", (A, prod))
-
-        # transições por não-terminais (goto)
-        for nt in G.keys():
-            j = trans.get((i, nt))
-            if j is not None:
-                goto[(i, nt)] = j
+    # transições por não-terminais (goto), direto das transições do autômato
+    for (i, X), j in trans.items():
+        if X in G:
+            goto[(i, X)] = j
+
+
+def ConstrucaoTabelaSLR(G, analise=None, conflitos=None, lr0=None):
+    """
+    Tabelas ACTION/GOTO SLR(1). `lr0` é o (estados, trans, G2) de
+    itens_lr0(G), se já calculado (só é lido, pode servir ao LALR também).
+    """
+    estados, trans, G2 = lr0 if lr0 is not None else itens_lr0(G)
+    acao = {}
+    goto = {}
+    start = next(iter(G))
+    if analise is None:
+        analise = analyze(G, start)
+    FOLLOW = analise.follow
+    ordem = _ordem_producoes(G2)
+
+    _acoes_lr0(G, estados, trans, acao, goto, conflitos, ordem)
+
+    # ponto no fim da produção: reduce para todo terminal de FOLLOW(A)
+    for i, estado in enumerate(estados):
+        for (A, prod, p) in estado:
+            if p == len(prod) and A != "S'":
+                for t in FOLLOW[A]:
+                    _define_acao(acao, (i, t), ("reduce", (A, prod)), conflitos, ordem)
+
+    return acao, goto, estados
+
+
+def _digraph(nos, relacao, F):
+    """
+    Algoritmo Digraph de DeRemer e Pennello: ao final, F[x] contém a união
+    de F[y] para todo y alcançável a partir de x pela `relacao`. Ciclos
+    (componentes fortemente conexas) recebem o mesmo conjunto. Versão
+    iterativa, para não estourar a recursão em gramáticas grandes.
+    Os conjuntos são inteiros usados como bitsets.
+    """
+    infinito = len(nos) + 1
+    N = {}
+    S = []
+
+    for raiz in nos:
+        if raiz in N:
+            continue
+        S.append(raiz)
+        N[raiz] = len(S)
+        chamadas = [(raiz, iter(relacao.get(raiz, ())), len(S))]
+
+        while chamadas:
+            x, vizinhos, d = chamadas[-1]
+            desceu = False
+            for y in vizinhos:
+                if y not in N:
+                    S.append(y)
+                    N[y] = len(S)
+                    chamadas.append((y, iter(relacao.get(y, ())), len(S)))
+                    desceu = True
+                    break
+                if N[y] < N[x]:
+                    N[x] = N[y]
+                F[x] |= F[y]
+            if desceu:
+                continue
+
+            chamadas.pop()
+            if N[x] == d:
+                while True:
+                    z = S.pop()
+                    N[z] = infinito
+                    F[z] = F[x]
+                    if z == x:
+                        break
+            if chamadas:
+                pai = chamadas[-1][0]
+                if N[x] < N[pai]:
+                    N[pai] = N[x]
+                F[pai] |= F[x]
+    return F
+
+
+def lookaheads_lalr(G, estados, trans, G2, analise):
+    """
+    Lookaheads LALR(1) pelo método de DeRemer e Pennello, sobre o
+    autômato LR(0): DR, reads, includes e lookback, com as duas
+    passagens do Digraph (Read e Follow).
+
+    Devolve {(estado, (A, prod)): conjunto de terminais} para cada item
+    completo A → prod. do estado.
+    """
+    nullable = analise.nullable
+    inicial = next(iter(G))
+
+    terminais = dict.fromkeys(["EOF"] + [X for (_, X) in trans if X not in G2])
+    terminais = list(terminais)
+    bit = {t: 1 << k for k, t in enumerate(terminais)}
+
+    # transições que saem de cada estado
+    saidas = [[] for _ in estados]
+    for (i, X), j in trans.items():
+        saidas[i].append(X)
+
+    transicoes_nt = [(i, X) for (i, X) in trans if X in G2]
+
+    # DR(p, A): terminais lidos logo após a transição (p, A)
+    F = {}
+    reads = {}
+    for (p, A) in transicoes_nt:
+        r = trans[(p, A)]
+        conj = 0
+        for X in saidas[r]:
+            if X not in G2:
+                conj |= bit[X]
+        if p == 0 and A == inicial:
+            conj |= bit["EOF"]
+        F[(p, A)] = conj
+        anulaveis = [(r, C) for C in saidas[r] if C in G2 and C in nullable]
+        if anulaveis:
+            reads[(p, A)] = anulaveis
+
+    _digraph(transicoes_nt, reads, F)
+
+    # includes e lookback: percorre cada produção B → ω a partir de p'
+    includes = {}
+    lookback = {}
+    for (p_linha, B) in transicoes_nt:
+        for prod in G2[B]:
+            prod = tuple(prod)
+            # sufixo_anulavel[k]: prod[k:] deriva ε
+            sufixo_anulavel = [True] * (len(prod) + 1)
+            for k in range(len(prod) - 1, -1, -1):
+                sufixo_anulavel[k] = sufixo_anulavel[k + 1] and prod[k] in nullable
+
+            q = p_linha
+            for k, X in enumerate(prod):
+                if X in G2 and sufixo_anulavel[k + 1]:
+                    includes.setdefault((q, X), []).append((p_linha, B))
+                q = trans[(q, X)]
+            lookback.setdefault((q, (B, prod)), []).append((p_linha, B))
+
+    _digraph(transicoes_nt, includes, F)
+
+    LA = {}
+    for chave, origens in lookback.items():
+        conj = 0
+        for t in origens:
+            conj |= F[t]
+        # percorre só os bits ligados do conjunto
+        la = set()
+        while conj:
+            menor = conj & -conj
+            la.add(terminais[menor.bit_length() - 1])
+            conj ^= menor
+        LA[chave] = la
+    return LA
+
+
+def ConstrucaoTabelaLALR(G, analise=None, conflitos=None, lr0=None):
+    """
+    Tabelas ACTION/GOTO LALR(1). Usa o mesmo autômato LR(0) do SLR(1)
+    (`lr0`, como em ConstrucaoTabelaSLR), mas reduz só nos lookaheads de
+    cada estado em vez de todo FOLLOW(A).
+    """
+    estados, trans, G2 = lr0 if lr0 is not None else itens_lr0(G)
+    acao = {}
+    goto = {}
+    if analise is None:
+        analise = analyze(G, next(iter(G)))
+    ordem = _ordem_producoes(G2)
+
+    _acoes_lr0(G, estados, trans, acao, goto, conflitos, ordem)
+
+    LA = lookaheads_lalr(G, estados, trans, G2, analise)
+    for i, estado in enumerate(estados):
+        for (A, prod, p) in estado:
+            if p == len(prod) and A != "S'":
+                for t in LA.get((i, (A, prod)), ()):
+                    _define_acao(acao, (i, t), ("reduce", (A, prod)), conflitos, ordem)
 
     return acao, goto, estados
+
+
+# Construtores de tabela disponíveis em analisar_slr(metodo=...)
+CONSTRUTORES = {
+    "slr": ConstrucaoTabelaSLR,
+    "lalr": ConstrucaoTabelaLALR,
+}
+
+
 def _formata_pilha_est(pilha, max_len=6):
     """
     Formata pilha de estados.
@@ -127,76 +353,532 @@ def _formata_acao(tipo, valor):
         return f"reduce {A} → {rhs}"
     if tipo == "accept":
         return "accept"
+    if tipo == "erro":
+        return f"ERRO – {valor} → entrando em modo pânico"
+    if tipo == "recuperado":
+        A, descartados = valor
+        return f"recuperação concluída — goto {A} ({descartados} token(s) descartado(s))"
     return str((tipo, valor))
 
-def analisar_slr(tokens, G_original):
 
-    # converte gramática (ε -> lista vazia)
-    G = Conversao(G_original)
+class TabelaLRCompilada:
+    """
+    ACTION/GOTO de um autômato LR com símbolos internados como inteiros
+    e as linhas de todos os estados compactadas num "pente" (row
+    displacement) de três arrays planos.
+
+    Terminais recebem os ids 0..n_terminais-1, a coluna n_terminais é a
+    dos tokens que a gramática não conhece e os não-terminais vêm depois
+    (a mesma numeração da TabelaLL1Compilada). A entrada (e, x) está em
+    valores[base[e] + x] quando verificacao[base[e] + x] == e. Em ACTION,
+    v > 0 é shift para o estado v - 1 e v < 0 é reduce da produção
+    -v - 1 (accept quando -v - 1 == aceitar); em GOTO, v é o estado de
+    destino; 0 é erro.
+
+    A redução mais frequente de cada estado vira a redução padrão
+    (`padrao[e]`, já codificada) e sai do pente; `lookaheads[e]` (um bit
+    por terminal) diz onde ela vale, para os erros aparecerem no mesmo
+    ponto que com a tabela completa.
+    """
 
-    # imprime gramática convertida (tabela.py)
-    GramaticaConvertida(G)
+    def __init__(self, G, acao, goto):
+        terminais = []
+        vistos = set()
+        for producoes in G.values():
+            for producao in producoes:
+                for simbolo in producao:
+                    if simbolo not in G and simbolo not in vistos:
+                        vistos.add(simbolo)
+                        terminais.append(simbolo)
+        for terminal in ["EOF"] + [t for (_, t) in acao]:
+            if terminal not in vistos:
+                vistos.add(terminal)
+                terminais.append(terminal)
+
+        self.n_terminais = len(terminais)
+        self.n_colunas = self.n_terminais + 1
+        self.simbolos = terminais + ["?"] + list(G)
+        self.ids = {s: i for i, s in enumerate(self.simbolos)}
+        self.desconhecido = self.n_terminais
+
+        # produções na ordem da gramática: (cabeça, corpo) é o valor do reduce nos eventos
+        self.originais = [(A, tuple(p)) for A, producoes in G.items() for p in producoes]
+        indice = {producao: k for k, producao in enumerate(self.originais)}
+        self.aceitar = len(self.originais)
+        self.cabecas = array("I", [self.ids[A] for A, _ in self.originais])
+        self.tamanhos = array("I", [len(p) for _, p in self.originais])
+
+        self.n_estados = n = 1 + max([e for e, _ in acao] + [e for e, _ in goto] + [j for j in goto.values()] +
+                                     [v for t, v in acao.values() if t == "shift"])
+        linhas = [{} for _ in range(n)]
+        self.acesso = array("i", [-1] * n)
+        for (e, t), (tipo, valor) in acao.items():
+            if tipo == "shift":
+                linhas[e][self.ids[t]] = valor + 1
+                self.acesso[valor] = self.ids[t]
+            else:
+                linhas[e][self.ids[t]] = -(indice[valor] if tipo == "reduce" else self.aceitar) - 1
+        self.entradas_acao = len(acao)
+        self.entradas_goto = len(goto)
+        self.bytes_dicionarios = _bytes_dicionarios(acao, goto)
+
+        # redução padrão: a mais frequente da linha, retirada do pente
+        self.padrao = array("i", [0] * n)
+        lookaheads = [0] * n
+        for e, linha in enumerate(linhas):
+            reducoes = Counter(v for v in linha.values() if v < 0 and v != -self.aceitar - 1)
+            if reducoes:
+                codigo = reducoes.most_common(1)[0][0]
+                self.padrao[e] = codigo
+                for t in [t for t, v in linha.items() if v == codigo]:
+                    lookaheads[e] |= 1 << t
+                    del linha[t]
+        # até 64 colunas, uma palavra de máquina por estado
+        self.lookaheads = array("Q", lookaheads) if self.n_colunas <= 64 else lookaheads
+        self.reducoes_padrao = self.entradas_acao - sum(map(len, linhas))
+
+        for (e, A), j in goto.items():
+            linhas[e][self.ids[A]] = j
+            self.acesso[j] = self.ids[A]
+        self.base, self.valores, self.verificacao = _pente(linhas, len(self.simbolos))
+
+    def __getstate__(self):
+        # `ids` é refeito na carga; o resto já são arrays e listas planas
+        estado = dict(self.__dict__)
+        del estado["ids"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.ids = {s: i for i, s in enumerate(self.simbolos)}
+
+    def acao(self, estado, terminal):
+        """
+        Código da ação para (estado, terminal); 0 é erro.
+        """
+        k = self.base[estado] + terminal
+        if self.verificacao[k] == estado:
+            return self.valores[k]
+        if self.lookaheads[estado] >> terminal & 1:
+            return self.padrao[estado]
+        return 0
+
+    def desvio(self, estado, nao_terminal):
+        """
+        GOTO(estado, não-terminal) ou -1.
+        """
+        k = self.base[estado] + nao_terminal
+        return self.valores[k] if self.verificacao[k] == estado else -1
+
+    def decodificar(self, codigo):
+        """
+        Código de ACTION -> ("shift", j), ("reduce", (A, corpo)) ou ("accept", None).
+        """
+        if codigo > 0:
+            return "shift", codigo - 1
+        if -codigo - 1 == self.aceitar:
+            return "accept", None
+        return "reduce", self.originais[-codigo - 1]
+
+    def transicoes(self):
+        """
+        GOTO como (estado, nome do não-terminal, destino).
+        """
+        for e in range(self.n_estados):
+            for A in range(self.n_colunas, len(self.simbolos)):
+                j = self.desvio(e, A)
+                if j >= 0:
+                    yield e, self.simbolos[A], j
+
+    def colunas(self, nomes):
+        """
+        Coluna (id de terminal) de cada nome de token.
+        """
+        return [self.ids.get(nome, self.desconhecido) for nome in nomes]
+
+    def tamanho(self):
+        """
+        Tamanho antes (dicionários de tuplas) e depois (pente) da compressão.
+        """
+        arrays = (self.cabecas, self.tamanhos, self.acesso, self.padrao, self.base, self.valores, self.verificacao)
+        if isinstance(self.lookaheads, array):
+            mascaras = self.lookaheads.itemsize * len(self.lookaheads)
+        else:
+            mascaras = sum(map(sys.getsizeof, self.lookaheads))
+        return {
+            "estados": self.n_estados,
+            "entradas_acao": self.entradas_acao,
+            "entradas_goto": self.entradas_goto,
+            "reducoes_padrao": self.reducoes_padrao,
+            "celulas_densas": self.n_estados * len(self.simbolos),
+            "celulas_pente": len(self.valores),
+            "bytes_dicionarios": self.bytes_dicionarios,
+            "bytes_compactada": sum(a.itemsize * len(a) for a in arrays) + mascaras,
+        }
 
-    # ACTION e GOTO
-    acao, goto, estados = ConstrucaoTabelaSLR(G)
 
-    pilha_est = [0]
-    pilha_simb = []
-    pos = 0
-    simbolo = tokens[pos][0]
+def _pente(linhas, largura):
+    """
+    Empacota as linhas ({coluna: valor} por estado) por deslocamento:
+    da mais cheia para a mais vazia, cada uma vai para o primeiro `base`
+    em que todas as suas colunas caem em posições livres.
+    Devolve (base, valores, verificacao).
+    """
+    base = [0] * len(linhas)
+    ocupadas = 0   # bit i ligado: posição i do pente já tem dono
+    livre = 0      # nenhuma posição antes desta está livre
+    valores = []
+    verificacao = []
+    for e in sorted(range(len(linhas)), key=lambda e: -len(linhas[e])):
+        colunas = sorted(linhas[e])
+        if not colunas:
+            continue
+        # bit z de `conflito`: a base inicio + z põe alguma coluna numa posição
+        # ocupada. Todas as bases candidatas são testadas de uma vez (operações
+        # em inteiros, sem laço em Python por base) e vence o menor zero.
+        inicio = max(livre - colunas[0], 0)
+        conflito = 0
+        for c in colunas:
+            conflito |= ocupadas >> (inicio + c)
+        b = inicio + (~conflito & (conflito + 1)).bit_length() - 1
+        fim = b + colunas[-1] + 1
+        if fim > len(valores):
+            valores.extend([0] * (fim - len(valores)))
+            verificacao.extend([-1] * (fim - len(verificacao)))
+        for c in colunas:
+            ocupadas |= 1 << (b + c)
+            valores[b + c] = linhas[e][c]
+            verificacao[b + c] = e
+        base[e] = b
+        livre = (~ocupadas & (ocupadas + 1)).bit_length() - 1
+    # qualquer base + coluna cai dentro dos arrays
+    sobra = max(base, default=0) + largura - len(valores)
+    valores.extend([0] * max(sobra, 0))
+    verificacao.extend([-1] * max(sobra, 0))
+
+    maior = max([len(linhas)] + [abs(v) for v in valores])
+    tipo = "h" if maior < 0x7FFF else "i"
+    return array("I", base), array(tipo, valores), array(tipo, verificacao)
+
+
+def _bytes_dicionarios(acao, goto):
+    # dicionários + chaves (estado, símbolo) + tuplas de ação distintas; strings e ints são compartilhados
+    total = sys.getsizeof(acao) + sys.getsizeof(goto)
+    acoes = {id(v): v for v in acao.values()}
+    total += sum(sys.getsizeof(chave) for chave in acao) + sum(sys.getsizeof(chave) for chave in goto)
+    return total + sum(sys.getsizeof(v) for v in acoes.values())
+
+
+class RenderizadorSLR:
+    """
+    Gera as linhas [Passo, Pilha Estados, Pilha Símbolos, Entrada, Ação]
+    a partir dos eventos do SLR(1).
 
-    passos = []
-    n_pass = 1
+    Cada evento guarda uma referência para a pilha de estados do passo
+    (lista encadeada imutável, então guardar é O(1)). A pilha de símbolos
+    não é gravada: todo estado (exceto o 0) tem um único símbolo de acesso.
+    """
+
+    def __init__(self, tokens, tabela):
+        self.tokens = tokens
+        self.tabela = tabela
+        self._simbolo = None
+
+    def _simbolos_de_acesso(self):
+        if self._simbolo is None:
+            simbolos = self.tabela.simbolos
+            self._simbolo = [simbolos[x] if x >= 0 else None for x in self.tabela.acesso]
+        return self._simbolo
+
+    def linhas(self, eventos, inicio, fim, completo):
+        for k in range(inicio, fim):
+            yield self._linha(eventos[k])
+
+    def _linha(self, evento, max_len=6):
+        num, tipo, valor, pos, pilha, profundidade = evento
+        simbolo = self._simbolos_de_acesso()
+
+        # topo da pilha encadeada: só os últimos max_len estados são exibidos
+        topo = []
+        while pilha is not None and len(topo) < max_len:
+            topo.append(pilha[0])
+            pilha = pilha[1]
+        topo.reverse()
+
+        est_str = str(topo) if profundidade <= max_len else f"... {topo}"
+        simbolos = [simbolo[e] for e in (topo[1:] if profundidade <= max_len else topo)]
+        simb_str = " ".join(simbolos) if profundidade - 1 <= max_len else "... " + " ".join(simbolos)
+        entrada = self.tokens[pos][0]
+
+        return [
+            num,
+            sanitize(est_str),
+            sanitize(simb_str),
+            entrada,
+            sanitize(_formata_acao(tipo, valor))
+        ]
+
+
+# Não-terminais usados como ponto de sincronização no modo pânico do LR
+# (comandos e funções). Se nenhum existir na gramática, vale qualquer um.
+SINCRONIA_SLR = ("COMANDO_G", "COMANDOS_G", "DECL_FUNCOES_G")
 
+
+def _pontos_sincronia(tabela, sincronia, follow):
+    """
+    {estado: [(A, goto(estado, A), FOLLOW(A))]} para os A de sincronia.
+    """
+    transicoes = list(tabela.transicoes())
+    nao_terminais = {A for (_, A, _) in transicoes}
+    escolhidos = [A for A in sincronia if A in nao_terminais] or sorted(nao_terminais)
+    ordem = {A: k for k, A in enumerate(escolhidos)}
+    pontos = {}
+    for i, A, j in transicoes:
+        if A in ordem:
+            seguintes = {tabela.ids[t] for t in follow.get(A, ()) if t in tabela.ids}
+            pontos.setdefault(i, []).append((ordem[A], A, j, seguintes))
+    return {i: [x[1:] for x in sorted(lista)] for i, lista in pontos.items()}
+
+
+def _sincronizar(pilha, pos, tipos, colunas, tabela, pontos):
+    """
+    Modo pânico do LR: procura, descartando o mínimo de tokens, um estado
+    da pilha com GOTO em um não-terminal de sincronia A tal que o token
+    atual está no FOLLOW(A) e tem ação no estado de destino.
+    Devolve (pilha, estados retirados, A, pos) ou None se a entrada acabar.
+    """
+    eof = tabela.ids["EOF"]
     while True:
-        estado = pilha_est[-1]
-        entrada = simbolo
-        act = acao.get((estado, entrada))
+        token = colunas[tipos[pos]]
+        resto = pilha
+        retirados = 0
+        while resto is not None:
+            for A, j, follow in pontos.get(resto[0], ()):
+                if token in follow and tabela.acao(j, token):
+                    return (j, resto), retirados, A, pos
+            resto = resto[1]
+            retirados += 1
+        if token == eof:
+            return None
+        pos += 1
+
+
+def analisar_slr(tokens, G_original, tabelas=None, rastro=COMPLETO, metodo="slr",
+                 diagnosticos=None, exibir=True, arvore=None, sincronia=SINCRONIA_SLR, semantica=None):
+    """
+    Análise LR dos tokens (lista de tuplas ou TokenBuffer) com tabelas SLR(1) ou LALR(1) (`metodo` = "slr"
+    ou "lalr"; ignorado quando `tabelas` já vem pronta). `tabelas` é uma
+    TabelaLRCompilada (como as de cache_tabelas) ou o par (ACTION, GOTO) em
+    dicionários, compilado aqui. `rastro` segue o mesmo formato do LL(1);
+    devolve sempre (gramática convertida, rastro).
+
+    Erros sintáticos não interrompem a análise: o modo pânico desempilha
+    até um estado com GOTO em um não-terminal de `sincronia` e descarta
+    tokens até um do seu FOLLOW. `diagnosticos` (lista) recebe cada erro
+    como Diagnostico; `exibir=False` não imprime nada. Uma ArvoreSintatica
+    em `arvore` recebe a árvore concreta, montada a cada reduce.
+    Um AnalisadorSemantico (semantica.py) em `semantica` roda suas ações
+    nos mesmos shifts e reduces, até o primeiro erro sintático; os erros
+    semânticos também vão para `diagnosticos`.
+    """
 
-        if not act:
-            print(f"[ERRO] SLR: token '{entrada}' inesperado no estado {estado}")
-            return False
+    # converte gramática (ε -> lista vazia)
+    G = Conversao(G_original)
 
-        tipo, valor = act
+    # imprime gramática convertida (tabela.py, carregado só para exibir)
+    if exibir:
+        from tabela import GramaticaConvertida
+
+        GramaticaConvertida(G)
+
+    # ACTION e GOTO prontos (cache_tabelas) ou construídos agora;
+    # FIRST/FOLLOW compartilhados com o LL(1) (mesma gramática original)
+    if isinstance(tabelas, TabelaLRCompilada):
+        tabela = tabelas
+    else:
+        if tabelas is not None:
+            acao, goto = tabelas
+        else:
+            acao, goto, estados = CONSTRUTORES[metodo](G, analyze(G_original, next(iter(G_original))))
+        tabela = TabelaLRCompilada(G, acao, goto)
+
+    rastro = criar_rastro(rastro)
+    registrar = rastro.registrar
+
+    # pilha de estados como lista encadeada (estado, resto): o rastro
+    # guarda a referência de cada passo sem copiar a pilha
+    # nome do tipo do token i = nomes[tipos[i]]: o TokenBuffer fornece a
+    # coluna de ids; para a lista de tuplas os índices são os próprios
+    if isinstance(tokens, TokenBuffer):
+        tipos, nomes = tokens.tipos, TIPOS_TOKEN
+    else:
+        tipos, nomes = range(len(tokens)), [tk[0] for tk in tokens]
+    # coluna da tabela de cada tipo de token, para consultar sem montar tuplas
+    colunas = tabela.colunas(nomes)
+
+    # os arrays são o formato guardado; no laço, listas (ler um item de
+    # array cria um int novo a cada acesso). A cópia custa microssegundos
+    base, valores, verificacao = list(tabela.base), list(tabela.valores), list(tabela.verificacao)
+    padrao, lookaheads = list(tabela.padrao), list(tabela.lookaheads)
+    cabecas, tamanhos, originais = list(tabela.cabecas), list(tabela.tamanhos), tabela.originais
+    aceitar = -tabela.aceitar - 1
+
+    pilha = (0, None)
+    profundidade = 1
+    pos = 0
+    coluna = colunas[tipos[pos]]
 
-        # strings sanitizadas (sem \n, tabs, espaços duplicados)
-        est_str = sanitize(_formata_pilha_est(pilha_est))
-        simb_str = sanitize(_formata_pilha_simb(pilha_simb))
-        acao_str = sanitize(_formata_acao(tipo, valor))
+    n_pass = 1
 
-        passos.append([
-            n_pass,
-            est_str,
-            simb_str,
-            entrada,
-            acao_str
-        ])
+    # modo pânico: pontos de sincronia calculados só no primeiro erro
+    pontos = None
+    ultima_recuperacao = -1
+    erros = 0
+
+    # pilha de nós paralela à de estados; ids de produção na ordem da gramática
+    nos = None
+    if arvore is not None:
+        arvore.reiniciar(list(G), tokens)
+        no_tipo, no_filho, no_irmao = arvore.tipo, arvore.filho, arvore.irmao
+        no_token, no_producao = arvore.token, arvore.producao
+        # tipo do nó de cada token e (tipo, id da produção) de cada produção da tabela
+        tipo_folha = [arvore.id_simbolo(x) for x in nomes]
+        id_producao = {(A, tuple(p)): k for k, (A, p) in enumerate((A, p) for A, ps in G.items() for p in ps)}
+        reducoes = [(arvore.id_simbolo(A), id_producao.get((A, p), NENHUM)) for A, p in originais]
+        nos = []
+
+    # ações semânticas a cada shift/reduce (desligadas no primeiro erro)
+    empilhar = reduzir = None
+    if semantica is not None:
+        semantica.iniciar(tokens, originais, diagnosticos)
+        empilhar, reduzir = semantica.empilhar, semantica.reduzir
 
-        if tipo == "shift":
-            pilha_simb.append(entrada)
-            pilha_est.append(valor)
+    while True:
+        estado = pilha[0]
+        k = base[estado] + coluna
+        if verificacao[k] == estado:
+            codigo = valores[k]
+        elif lookaheads[estado] >> coluna & 1:
+            codigo = padrao[estado]
+        else:
+            codigo = 0
+
+        if codigo > 0:
+            if registrar:
+                registrar((n_pass, "shift", codigo - 1, pos, pilha, profundidade))
+            if nos is not None:
+                nos.append(len(no_tipo))
+                no_tipo.append(tipo_folha[tipos[pos]])
+                no_filho.append(NENHUM)
+                no_irmao.append(NENHUM)
+                no_token.append(pos)
+                no_producao.append(NENHUM)
+            if empilhar is not None:
+                empilhar(pos)
+            pilha = (codigo - 1, pilha)
+            profundidade += 1
             pos += 1
-            simbolo = tokens[pos][0]
+            coluna = colunas[tipos[pos]]
             n_pass += 1
             continue
 
-        if tipo == "reduce":
-            A, prod = valor
-            # desempilha quantidade de símbolos da produção
-            for _ in prod:
-                pilha_est.pop()
-                pilha_simb.pop()
-            topo = pilha_est[-1]
-            pilha_simb.append(A)
-            pilha_est.append(goto[(topo, A)])
-            n_pass += 1
+        if codigo == 0:
+            entrada = nomes[tipos[pos]]
+            mensagem = f"token '{entrada}' inesperado no estado {estado}"
+            erros += 1
+            if diagnosticos is not None:
+                diagnosticos.append(Diagnostico("slr", tokens[pos][2], mensagem))
+            if exibir:
+                print(f"[ERRO] SLR: {mensagem}")
+            if registrar:
+                registrar((n_pass, "erro", mensagem, pos, pilha, profundidade))
+                n_pass += 1
+            if empilhar is not None:
+                semantica.abandonar()
+                empilhar = reduzir = None
+
+            # novo erro no mesmo token da última recuperação: descarta-o
+            # para garantir que a análise avança
+            if pos == ultima_recuperacao:
+                if entrada == "EOF":
+                    break
+                pos += 1
+            if pontos is None:
+                pontos = _pontos_sincronia(tabela, sincronia, analyze(G_original, next(iter(G_original))).follow)
+
+            recuperacao = _sincronizar(pilha, pos, tipos, colunas, tabela, pontos)
+            if recuperacao is None:
+                break
+            pilha, retirados, A, novo_pos = recuperacao
+            profundidade += 1 - retirados
+            if nos is not None:
+                if retirados:
+                    del nos[-retirados:]
+                nos.append(arvore.novo(arvore.id_simbolo(A)))
+            if registrar:
+                registrar((n_pass, "recuperado", (A, novo_pos - pos), novo_pos, pilha, profundidade))
+                n_pass += 1
+            pos = ultima_recuperacao = novo_pos
+            coluna = colunas[tipos[pos]]
             continue
 
-        if tipo == "accept":
+        if codigo == aceitar:
+            if registrar:
+                registrar((n_pass, "accept", None, pos, pilha, profundidade))
+            if nos:
+                arvore.raiz = nos[-1]
             break
 
-    # imprime redução final no terminal (tabela.py)
-    ReducaoFinal(passos)
+        # reduce: desempilha um estado por símbolo da produção
+        producao = -codigo - 1
+        if registrar:
+            registrar((n_pass, "reduce", originais[producao], pos, pilha, profundidade))
+        tamanho = tamanhos[producao]
+        for _ in range(tamanho):
+            pilha = pilha[1]
+        profundidade -= tamanho
+        if nos is not None:
+            # liga os nós dos símbolos desempilhados como irmãos sob o novo pai
+            tipo_pai, id_prod = reducoes[producao]
+            pai = len(no_tipo)
+            no_tipo.append(tipo_pai)
+            no_irmao.append(NENHUM)
+            no_token.append(NENHUM)
+            no_producao.append(id_prod)
+            if tamanho:
+                corte = len(nos) - tamanho
+                anterior = no_filho_pai = nos[corte]
+                for no in nos[corte + 1:]:
+                    no_irmao[anterior] = no
+                    anterior = no
+                del nos[corte:]
+                no_filho.append(no_filho_pai)
+            else:
+                no_filho.append(NENHUM)
+            nos.append(pai)
+        if reduzir is not None:
+            reduzir(producao, tamanho)
+        estado = pilha[0]
+        pilha = (valores[base[estado] + cabecas[producao]], pilha)
+        profundidade += 1
+        n_pass += 1
+
+    if registrar:
+        rastro.vincular(RenderizadorSLR(tokens, tabela))
+
+    if registrar and exibir:
+        # imprime redução final no terminal (tabela.py)
+        from tabela import ReducaoFinal
+
+        ReducaoFinal(rastro)
+
+    if erros and exibir:
+        print(f"\nAnálise SLR concluída com {erros} erro(s) (modo pânico ativo).")
+    if semantica is not None and exibir:
+        if semantica.abandonada:
+            print("Análise semântica interrompida no primeiro erro sintático.")
+        else:
+            print(f"\nAnálise semântica concluída com {semantica.erros} erro(s).")
 
     # retorna gramática convertida + todos os passos
-    return G, passos
+    return G, rastro
@@ -0,0 +1 @@
+# tests — testes de regressão do compilador Brick (python -m pytest)
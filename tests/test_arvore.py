@@ -0,0 +1,78 @@
+# tests/test_arvore.py — Árvore sintática em arena montada pelos analisadores LL(1) e SLR
+import pytest
+
+from arvore import NENHUM, ArvoreSintatica
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from scanner import analisador_lexico_buffer
+from slr_parser import analisar_slr
+
+PROGRAMA = 'principal { int x = (1 + 2) * 3; cadeia s = "ok"; x = x - 1; }'
+
+
+def _ll1(tokens, diagnosticos):
+    arvore = ArvoreSintatica()
+    AnalisadorSintaticoLL1(grammar).analisar(tokens, "desligado", diagnosticos, exibir=False, arvore=arvore)
+    return arvore
+
+
+def _slr(tokens, diagnosticos):
+    arvore = ArvoreSintatica()
+    analisar_slr(tokens, grammar, rastro="desligado", diagnosticos=diagnosticos, exibir=False, arvore=arvore)
+    return arvore
+
+
+@pytest.mark.parametrize("montar", [_ll1, _slr])
+def test_folhas_sao_os_tokens_em_ordem(montar):
+    tokens = analisador_lexico_buffer(PROGRAMA, [])
+    diagnosticos = []
+    arvore = montar(tokens, diagnosticos)
+    assert diagnosticos == []
+    assert arvore.nome(arvore.raiz) == next(iter(grammar))
+    folhas = list(arvore.folhas())
+    # todos os tokens, menos o EOF
+    assert [arvore.token[n] for n in folhas] == list(range(len(tokens) - 1))
+    assert [arvore.lexema(n) for n in folhas] == [t[1] for t in list(tokens)[:-1]]
+    assert all(arvore.nome(n) == tokens[arvore.token[n]][0] for n in folhas)
+    # nós internos guardam a produção e não têm token
+    assert all(arvore.producao[n] >= 0 for n, _ in arvore.percorrer() if arvore.filho[n] >= 0)
+
+
+@pytest.mark.parametrize("montar", [_ll1, _slr])
+def test_pos_ordem_visita_filhos_antes(montar):
+    arvore = montar(analisador_lexico_buffer(PROGRAMA, []), [])
+    ordem = list(arvore.pos_ordem())
+    assert sorted(ordem) == sorted(n for n, _ in arvore.percorrer())
+    assert ordem[-1] == arvore.raiz
+    visto = set()
+    for n in ordem:
+        assert all(f in visto for f in arvore.filhos(n))
+        visto.add(n)
+
+
+@pytest.mark.parametrize("montar", [_ll1, _slr])
+def test_aninhamento_fundo_sem_recursao(montar):
+    profundo = 20_000
+    tokens = analisador_lexico_buffer(f"principal {{ int x = {'(' * profundo}1{')' * profundo}; }}", [])
+    arvore = montar(tokens, [])
+    assert max(prof for _, prof in arvore.percorrer()) > profundo
+    assert sum(1 for _ in arvore.pos_ordem()) == len(arvore)
+    assert arvore.formatar(limite=10).endswith("...")
+
+
+@pytest.mark.parametrize("montar", [_ll1, _slr])
+def test_erro_ainda_da_uma_arvore(montar):
+    diagnosticos = []
+    arvore = montar(analisador_lexico_buffer("principal { int x = (1 + ; }", []), diagnosticos)
+    assert diagnosticos
+    assert arvore.raiz != NENHUM
+    # no SLR, o que o modo pânico desempilhou fica na arena, fora da árvore
+    assert sorted(arvore.pos_ordem()) == sorted(n for n, _ in arvore.percorrer())
+
+
+def test_reiniciar_esvazia_a_arena():
+    arvore = _ll1(analisador_lexico_buffer(PROGRAMA, []), [])
+    assert len(arvore) > 0
+    arvore.reiniciar([], None)
+    assert len(arvore) == 0 and arvore.raiz == NENHUM
+    assert list(arvore.percorrer()) == [] and list(arvore.pos_ordem()) == []
@@ -0,0 +1,51 @@
+# tests/test_cache_tabelas.py — Um arquivo de cache por gramática
+import os
+
+import cache_tabelas
+import slr_parser
+from grammar import analyze, grammar
+from otimizacao_gramatica import otimizar
+from slr_parser import SINCRONIA_SLR, ConstrucaoTabelaLALR, ConstrucaoTabelaSLR, Conversao
+
+
+def test_original_e_otimizada_nao_se_sobrescrevem(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_tabelas, "DIRETORIO_CACHE", str(tmp_path))
+    otimizada = otimizar(grammar, preservar=SINCRONIA_SLR).gramatica
+    cache_tabelas.obter_tabelas(grammar)
+    cache_tabelas.obter_tabelas(otimizada)
+    assert cache_tabelas.carregar_cache(grammar) is not None
+    assert cache_tabelas.carregar_cache(otimizada) is not None
+
+
+def test_poda_os_caches_mais_antigos(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_tabelas, "DIRETORIO_CACHE", str(tmp_path))
+    tabelas = cache_tabelas.construir_tabelas(grammar)
+    for k in range(cache_tabelas.CACHES_MANTIDOS + 2):
+        antigo = tmp_path / f"brick.tabelas.{k:016x}.cache"
+        antigo.write_bytes(b"")
+        os.utime(antigo, (k, k))
+    cache_tabelas.salvar_cache(grammar, tabelas)
+    restantes = sorted(p.name for p in tmp_path.iterdir())
+    assert len(restantes) == cache_tabelas.CACHES_MANTIDOS
+    assert os.path.basename(cache_tabelas.caminho_cache(grammar)) in restantes
+
+
+def test_lr0_construido_uma_vez(monkeypatch):
+    chamadas = []
+    original = slr_parser.itens_lr0
+
+    def contar(G):
+        chamadas.append(G)
+        return original(G)
+
+    monkeypatch.setattr(slr_parser, "itens_lr0", contar)
+    tabelas = cache_tabelas.construir_tabelas(grammar)
+    assert len(chamadas) == 1
+
+    # as mesmas tabelas de cada construção sozinha
+    G = Conversao(grammar)
+    for construir, tabela in ((ConstrucaoTabelaSLR, tabelas.lr("slr")), (ConstrucaoTabelaLALR, tabelas.lr("lalr"))):
+        acao, goto, _ = construir(G, analyze(grammar))
+        assert sorted(tabela.transicoes()) == sorted((e, A, j) for (e, A), j in goto.items())
+        for (e, t), esperada in acao.items():
+            assert tabela.decodificar(tabela.acao(e, tabela.simbolos.index(t))) == esperada
@@ -0,0 +1,67 @@
+# tests/test_gerador_descendente.py — Analisador descendente gerado x LL(1) por tabela
+import os
+import sys
+
+import pytest
+
+import cache_tabelas
+import gerador_descendente
+from benchmarks.gerador import gerar_programa
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from otimizacao_gramatica import otimizar
+from scanner import analisador_lexico_buffer
+from slr_parser import SINCRONIA_SLR
+
+
+@pytest.fixture
+def diretorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_tabelas, "DIRETORIO_CACHE", str(tmp_path))
+    monkeypatch.setattr(gerador_descendente, "DIRETORIO_DESCENDENTE", str(tmp_path))
+    return tmp_path
+
+
+def _comparar(G, tokens):
+    parser = AnalisadorSintaticoLL1(G, cache_tabelas.obter_tabelas(G).ll1)
+    modulo = gerador_descendente.obter_descendente(G)
+    for nivel in ("completo", "desligado"):
+        esperado, obtido = [], []
+        rastro_tabela = parser.analisar(tokens, nivel, esperado, exibir=False)
+        rastro_gerado = modulo.analisar(tokens, nivel, obtido, exibir=False)
+        assert obtido == esperado
+        assert list(rastro_gerado.eventos) == list(rastro_tabela.eventos)
+    assert list(rastro_gerado) == list(rastro_tabela)
+
+
+@pytest.mark.parametrize("otimizada", [False, True])
+@pytest.mark.parametrize("erros", [0, 5])
+def test_gerado_igual_a_tabela(diretorio, otimizada, erros):
+    G = otimizar(grammar, preservar=SINCRONIA_SLR).gramatica if otimizada else grammar
+    for semente in range(3):
+        _comparar(G, analisador_lexico_buffer(gerar_programa(2000, semente=semente, erros=erros), []))
+
+
+def test_aninhamento_fundo_cai_na_tabela(diretorio, capsys):
+    limite = sys.getrecursionlimit()
+    profundo = 20_000
+    tokens = analisador_lexico_buffer(f"principal {{ int x = {'(' * profundo}1{')' * profundo}; }}", [])
+    _comparar(grammar, tokens)
+    assert sys.getrecursionlimit() == limite
+    assert "refeito pela tabela" in capsys.readouterr().err
+
+    # o mesmo com um erro no fundo das expressões
+    tokens = analisador_lexico_buffer(f"principal {{ int x = {'(' * profundo}1 +{')' * profundo}; }}", [])
+    _comparar(grammar, tokens)
+
+
+def test_um_modulo_por_gramatica(diretorio):
+    otimizada = otimizar(grammar, preservar=SINCRONIA_SLR).gramatica
+    original = gerador_descendente.obter_descendente(grammar)
+    gerador_descendente.obter_descendente(otimizada)
+    caminho = gerador_descendente.caminho_descendente(grammar)
+    assert caminho != gerador_descendente.caminho_descendente(otimizada)
+    assert os.path.exists(caminho) and os.path.exists(gerador_descendente.caminho_descendente(otimizada))
+    # alternar não regera: a chave do arquivo continua valendo
+    modificado = os.path.getmtime(caminho)
+    assert gerador_descendente.obter_descendente(grammar).__file__ == original.__file__
+    assert os.path.getmtime(caminho) == modificado
@@ -0,0 +1,68 @@
+# tests/test_incremental.py — Edições com caracteres inválidos na análise incremental
+import random
+
+import pytest
+
+from grammar import grammar
+from incremental import AnalisadorIncremental, relexar
+from ll1_parser import AnalisadorSintaticoLL1
+from scanner import analisador_lexico_buffer
+
+PROGRAMA = 'principal {\n    int x = 1;\n    cadeia s = "ok";\n    x = x + 2;\n}\n'
+
+
+@pytest.fixture(scope="module")
+def inc():
+    return AnalisadorIncremental(AnalisadorSintaticoLL1(grammar))
+
+
+def conferir(inc, estado, texto):
+    # o estado editado é o mesmo de uma análise completa do texto novo
+    completo = inc.analisar(texto)
+    assert list(estado.tokens) == list(completo.tokens)
+    assert estado.lexicos == completo.lexicos
+    assert estado.diagnosticos == completo.diagnosticos
+
+
+def test_caractere_invalido_vira_diagnostico(inc):
+    estado = inc.analisar(PROGRAMA)
+    assert estado.aceito
+    pos = PROGRAMA.index("x = x")
+    editado = inc.editar(estado, pos, 0, "@")
+    assert [(d.etapa, d.linha) for d in editado.diagnosticos] == [("lexico", 4)]
+    assert not editado.aceito
+    conferir(inc, editado, PROGRAMA[:pos] + "@" + PROGRAMA[pos:])
+
+    # apagar o caractere tira o diagnóstico
+    assert inc.editar(editado, pos, 1, "").aceito
+
+
+def test_aspa_digitada_aos_poucos(inc):
+    # o editor manda a aspa de abertura antes da de fechamento
+    texto = PROGRAMA
+    estado = inc.analisar(texto)
+    pos = texto.index("x = x") - 4
+    for trecho in ('cadeia t = "', "abc", '"', ";"):
+        estado = inc.editar(estado, pos, 0, trecho)
+        texto = texto[:pos] + trecho + texto[pos:]
+        pos += len(trecho)
+        conferir(inc, estado, texto)
+    assert estado.aceito
+
+
+def test_edicoes_aleatorias(inc):
+    sorteio = random.Random(0)
+    texto = PROGRAMA * 3
+    estado = inc.analisar(texto)
+    for _ in range(300):
+        pos = sorteio.randrange(len(texto) + 1)
+        removidos = min(sorteio.choice([0, 0, 1, 2]), len(texto) - pos)
+        inseridos = "".join(sorteio.choice(" '\"\\@#x1;{}\n=") for _ in range(sorteio.randrange(4)))
+        estado = inc.editar(estado, pos, removidos, inseridos)
+        texto = texto[:pos] + inseridos + texto[pos + removidos:]
+        conferir(inc, estado, texto)
+
+
+def test_relexar_sem_lista_mantem_runtime_error():
+    with pytest.raises(RuntimeError):
+        relexar(analisador_lexico_buffer(PROGRAMA), 0, 0, "@")
@@ -0,0 +1,48 @@
+# tests/test_ll1_parser.py — Modo pânico do LL(1) quando o limite de descarte se esgota
+import cache_tabelas
+import gerador_descendente
+from grammar import grammar
+from incremental import AnalisadorIncremental
+from ll1_parser import DESCARTE_MAXIMO, AnalisadorSintaticoLL1
+from scanner import analisador_lexico_buffer
+
+# nenhum IDENT está no FOLLOW da expressão: o descarte para no limite
+ESGOTADO = "principal { int x = * " + "a " * (DESCARTE_MAXIMO + 500) + "; }"
+
+
+def test_descarte_esgotado_nao_fala_em_follow():
+    tokens = analisador_lexico_buffer(ESGOTADO, [])
+    diagnosticos = []
+    rastro = AnalisadorSintaticoLL1(grammar).analisar(tokens, "completo", diagnosticos, exibir=False)
+    mensagens = [d.mensagem for d in diagnosticos]
+    assert mensagens[1] == f"descarte máximo atingido ({DESCARTE_MAXIMO} tokens) sem token de sincronia; " \
+                           "retomando em 'IDENT'"
+    acoes = [linha[3] for linha in rastro]
+    # o primeiro descarte termina no limite, e não em RECUPERADO
+    inicio = next(i for i, acao in enumerate(acoes) if acao.startswith("descartando"))
+    fim = inicio + DESCARTE_MAXIMO
+    assert all(acao.startswith("descartando") for acao in acoes[inicio:fim])
+    assert acoes[fim].startswith("descarte máximo atingido")
+
+    # um descarte curto continua terminando em RECUPERADO
+    tokens = analisador_lexico_buffer("principal { int x = * a a; }", [])
+    diagnosticos = []
+    rastro = AnalisadorSintaticoLL1(grammar).analisar(tokens, "completo", diagnosticos, exibir=False)
+    assert len(diagnosticos) == 1
+    assert any("está no FOLLOW" in linha[3] for linha in rastro)
+
+
+def test_descarte_esgotado_igual_no_gerado_e_no_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_tabelas, "DIRETORIO_CACHE", str(tmp_path))
+    monkeypatch.setattr(gerador_descendente, "DIRETORIO_DESCENDENTE", str(tmp_path))
+    tokens = analisador_lexico_buffer(ESGOTADO, [])
+    parser = AnalisadorSintaticoLL1(grammar, cache_tabelas.obter_tabelas(grammar).ll1)
+    modulo = gerador_descendente.obter_descendente(grammar)
+    for nivel in ("completo", "desligado"):
+        esperado, obtido = [], []
+        rastro_tabela = parser.analisar(tokens, nivel, esperado, exibir=False)
+        rastro_gerado = modulo.analisar(tokens, nivel, obtido, exibir=False)
+        assert obtido == esperado
+        assert list(rastro_gerado) == list(rastro_tabela)
+
+    assert AnalisadorIncremental(parser).analisar(ESGOTADO).diagnosticos == esperado
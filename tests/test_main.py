@@ -0,0 +1,30 @@
+# tests/test_main.py — Linha de comando: importações sob demanda e -q
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _importados(*argumentos):
+    comando = [sys.executable, "-X", "importtime", os.path.join(RAIZ, "main.py"), "app.br", *argumentos]
+    saida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True).stderr
+    return {linha.rsplit("|", 1)[-1].strip() for linha in saida.splitlines() if linha.startswith("import time:")}
+
+
+def test_so_lexico_nao_carrega_pdf():
+    importados = _importados("--etapas", "lex", "-q", "--formato", "nenhum")
+    assert "scanner" in importados
+    assert not importados & {"pdf_rastro", "pdf_exporter", "fpdf", "fontTools"}
+
+
+def test_relatorio_pdf_silencioso(tmp_path):
+    pytest.importorskip("fpdf")
+    saida = tmp_path / "relatorio"
+    comando = [sys.executable, os.path.join(RAIZ, "main.py"), "app.br", "--formato", "pdf", "-q", "--saida", str(saida)]
+    resultado = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True)
+    assert resultado.returncode == 0
+    assert resultado.stdout == ""
+    assert (tmp_path / "relatorio.pdf").exists()
@@ -0,0 +1,75 @@
+# tests/test_otimizacao_gramatica.py — A gramática otimizada aceita a mesma linguagem e traduz as contagens
+import pytest
+
+from benchmarks.gerador import gerar_programa
+from grammar import grammar
+from instrumentacao import ContadoresLL1, ContadoresSLR
+from ll1_parser import AnalisadorSintaticoLL1
+from otimizacao_gramatica import otimizar
+from scanner import analisador_lexico_buffer
+from slr_parser import SINCRONIA_SLR, analisar_slr
+
+# A -> B é unitária e D é inalcançável
+PEQUENA = {
+    "S": [["A", "PONTO"]],
+    "A": [["B"]],
+    "B": [["X", "C"], ["Y"]],
+    "C": [["X"], ["ε"]],
+    "D": [["X"]],
+}
+
+
+@pytest.fixture(scope="module")
+def otimizada():
+    return otimizar(grammar, preservar=SINCRONIA_SLR)
+
+
+def test_passes_na_gramatica_pequena():
+    otimizada = otimizar(PEQUENA)
+    assert otimizada.gramatica == {"S": [["A", "PONTO"]], "A": [["X", "C"], ["Y"]], "C": [["X"], ["ε"]]}
+    assert otimizada.originais("A", ["X", "C"]) == (("A", ("B",)), ("B", ("X", "C")))
+    assert otimizada.originais("C", ["ε"]) == (("C", ()),)
+    assert [nome for nome, _, _ in otimizada.historico][0] == "original"
+
+
+def test_traduzir_contagem():
+    otimizada = otimizar(PEQUENA)
+    contagem = {("A", ("X", "C")): 2, ("A", ("Y",)): 3, ("C", ()): 2, ("Z", ("X",)): 7}
+    assert otimizada.traduzir_contagem(contagem) == {
+        ("A", ("B",)): 5,
+        ("B", ("X", "C")): 2,
+        ("B", ("Y",)): 3,
+        ("C", ()): 2,
+    }
+
+
+@pytest.mark.parametrize("erros", [0, 3])
+def test_mesma_linguagem(otimizada, erros):
+    original_ll1, otimizado_ll1 = AnalisadorSintaticoLL1(grammar), AnalisadorSintaticoLL1(otimizada.gramatica)
+    for semente in range(4):
+        tokens = analisador_lexico_buffer(gerar_programa(800, semente=semente, erros=erros), [])
+        aceitos = []
+        for parser in (original_ll1, otimizado_ll1):
+            diagnosticos = []
+            parser.analisar(tokens, "desligado", diagnosticos, exibir=False)
+            aceitos.append(not diagnosticos)
+        for G in (grammar, otimizada.gramatica):
+            diagnosticos = []
+            analisar_slr(tokens, G, rastro="desligado", diagnosticos=diagnosticos, exibir=False)
+            aceitos.append(not diagnosticos)
+        assert aceitos == [erros == 0] * 4
+
+
+def test_contagens_traduzidas_batem_com_a_original(otimizada):
+    tokens = analisador_lexico_buffer(gerar_programa(800, semente=1), [])
+    original, otimizado = AnalisadorSintaticoLL1(grammar), AnalisadorSintaticoLL1(otimizada.gramatica)
+    esperado, obtido = ContadoresLL1(original), ContadoresLL1(otimizado, otimizada=otimizada)
+    original.analisar(tokens, esperado, [], exibir=False)
+    otimizado.analisar(tokens, obtido, [], exibir=False)
+    assert obtido.resumo()["expansoes"] < esperado.resumo()["expansoes"]
+    assert obtido.resumo()["expansoes_por_producao_original"] == esperado.resumo()["expansoes_por_producao"]
+
+    esperado, obtido = ContadoresSLR(), ContadoresSLR(otimizada=otimizada)
+    analisar_slr(tokens, grammar, rastro=esperado, diagnosticos=[], exibir=False)
+    analisar_slr(tokens, otimizada.gramatica, rastro=obtido, diagnosticos=[], exibir=False)
+    assert obtido.resumo()["reduces_por_producao_original"] == esperado.resumo()["reduces_por_producao"]
@@ -0,0 +1,79 @@
+# tests/test_paralelo.py — LL(1) e SLR em processos sobre o TokenBuffer compartilhado
+import pytest
+
+import paralelo
+from cache_tabelas import obter_tabelas
+from grammar import grammar
+from instrumentacao import Instrumentacao
+from ll1_parser import AnalisadorSintaticoLL1
+from scanner import analisador_lexico_buffer
+from slr_parser import analisar_slr
+
+FONTES = [
+    'principal { cadeia s = "ascii"; int x = 1 + ; }',
+    'principal { cadeia s = "ação é ótima"; car c = \'ç\'; x = ; }',
+    'principal { cadeia s = "seta → e 𝔹"; int y = (2; }',
+]
+
+
+@pytest.fixture(scope="module")
+def tabelas():
+    return obter_tabelas(grammar)
+
+
+@pytest.fixture(scope="module")
+def analisador(tabelas):
+    analisador = paralelo.AnalisadorParalelo(tabelas, modo=paralelo.PROCESSOS)
+    yield analisador
+    analisador.fechar()
+
+
+@pytest.mark.parametrize("fonte", FONTES)
+def test_fonte_compartilhada_fatia_como_str(fonte):
+    tokens = analisador_lexico_buffer(fonte, [])
+    bloco, descritor = paralelo.publicar_tokens(tokens)
+    try:
+        anexado, vistas, compartilhados = paralelo._anexar_tokens(descritor)
+        assert len(compartilhados.fonte) == len(fonte)
+        assert list(compartilhados) == list(tokens)
+        assert compartilhados.fonte[-1] == fonte[-1]
+        del compartilhados
+        for vista in vistas:
+            vista.release()
+        anexado.close()
+    finally:
+        bloco.close()
+        bloco.unlink()
+
+
+@pytest.mark.parametrize("fonte", FONTES)
+def test_processos_igual_a_sequencia(tabelas, analisador, fonte):
+    tokens = analisador_lexico_buffer(fonte, [])
+    diag_ll1, diag_slr = [], []
+    passos_ll1 = AnalisadorSintaticoLL1(grammar, tabelas.ll1).analisar(tokens, "completo", diag_ll1, exibir=False)
+    _, passos_slr = analisar_slr(tokens, grammar, tabelas.lr("slr"), "completo", diagnosticos=diag_slr, exibir=False)
+    (_, d1, p1), (_, d2, p2, _) = analisador.analisar(tokens, "completo", "completo", exibir=False)
+    assert (d1, d2) == (diag_ll1, diag_slr)
+    assert (p1, p2) == (list(passos_ll1), list(passos_slr))
+
+
+def test_contadores_voltam_dos_processos(tabelas, analisador):
+    tokens = analisador_lexico_buffer(FONTES[0], [])
+    perfil = Instrumentacao()
+    analisador.analisar(tokens, "anel", "anel", exibir=False, perfil=perfil)
+    contadores = perfil.relatorio()["contadores"]
+
+    esperado = Instrumentacao()
+    parser = AnalisadorSintaticoLL1(grammar, tabelas.ll1)
+    parser.analisar(tokens, esperado.contadores_ll1(parser, "anel"), [], exibir=False)
+    analisar_slr(tokens, grammar, tabelas.lr("slr"), esperado.contadores_slr("anel"), diagnosticos=[], exibir=False)
+    assert contadores == esperado.relatorio()["contadores"]
+
+
+def test_pool_reaproveitado(tabelas):
+    primeiro = paralelo.obter_analisador(tabelas, modo=paralelo.THREADS)
+    try:
+        assert paralelo.obter_analisador(tabelas, modo=paralelo.THREADS) is primeiro
+    finally:
+        primeiro.fechar()
+        paralelo._compartilhado = None
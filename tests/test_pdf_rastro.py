@@ -0,0 +1,43 @@
+# tests/test_pdf_rastro.py — Fonte embutida no PDF do rastro só com os glifos usados
+import io
+import os
+import re
+import zlib
+
+import pytest
+
+TTFont = pytest.importorskip("fontTools.ttLib").TTFont
+
+from pdf_rastro import FONTE, gerar_pdf_rastro
+
+
+def _fonte_embutida(dados):
+    numero = re.search(rb"/FontFile2 (\d+) 0 R", dados).group(1)
+    cabecalho = re.search(rb"\n" + numero + rb" 0 obj\n<< /Length (\d+) /Filter /FlateDecode /Length1 (\d+) >>"
+                          rb"\nstream\n", dados)
+    fluxo = zlib.decompress(dados[cabecalho.end():cabecalho.end() + int(cabecalho.group(1))])
+    assert len(fluxo) == int(cabecalho.group(2))
+    return fluxo
+
+
+def test_fonte_embutida_e_subconjunto(tmp_path):
+    caminho = tmp_path / "rastro.pdf"
+    passos = [(1, "$ programa", "principal", "programa -> principal { ... }"),
+              (2, "$ } comandos", "{", "casar '{' (ação)")]
+    assert gerar_pdf_rastro(iter(passos), None, str(caminho)) == 1
+    dados = caminho.read_bytes()
+    assert re.search(rb"/BaseFont /[A-Z]{6}\+DejaVuSans ", dados)
+
+    fluxo = _fonte_embutida(dados)
+    assert len(fluxo) < os.path.getsize(FONTE) / 4
+    original, subconjunto = TTFont(FONTE), TTFont(io.BytesIO(fluxo))
+    # Identity-H: o glifo de cada caractere tem de manter o número original
+    cmap = original.getBestCmap()
+    ordem, ordem_sub = original.getGlyphOrder(), subconjunto.getGlyphOrder()
+    for c in "programa{}çã'":
+        glifo = original.getGlyphID(cmap[ord(c)])
+        assert subconjunto["hmtx"][ordem_sub[glifo]] == original["hmtx"][ordem[glifo]]
+        assert subconjunto["glyf"][ordem_sub[glifo]].numberOfContours != 0
+    # e um caractere que não aparece fica sem contorno
+    glifo = original.getGlyphID(cmap[ord("@")])
+    assert subconjunto["glyf"][ordem_sub[glifo]].numberOfContours == 0
@@ -0,0 +1,35 @@
+# tests/test_rastro.py — O rastro se comporta como a lista de linhas que ele gera
+import pytest
+
+from grammar import grammar
+from ll1_parser import AnalisadorSintaticoLL1
+from rastro import ANEL, COMPLETO, criar_rastro
+from scanner import analisador_lexico_buffer
+
+FATIAS = [
+    slice(None), slice(3, 10), slice(-5, None), slice(None, None, 2), slice(1, 20, 3),
+    slice(None, None, -1), slice(10, 2, -1), slice(-1, -8, -2), slice(None, 5, -3), slice(5, 5), slice(8, 2),
+]
+
+
+@pytest.fixture(params=[COMPLETO, ANEL])
+def rastro(request):
+    tokens = analisador_lexico_buffer("principal { int x = 1 + 2; x = x * 3; }", [])
+    rastro = criar_rastro(request.param, tamanho=25)
+    AnalisadorSintaticoLL1(grammar).analisar(tokens, rastro, [], exibir=False)
+    return rastro
+
+
+@pytest.mark.parametrize("fatia", FATIAS, ids=str)
+def test_fatias_como_lista(rastro, fatia):
+    assert rastro[fatia] == list(rastro)[fatia]
+
+
+def test_indices(rastro):
+    linhas = list(rastro)
+    assert len(rastro) == len(linhas)
+    assert [rastro[i] for i in range(-len(linhas), len(linhas))] == linhas + linhas
+    with pytest.raises(IndexError):
+        rastro[len(linhas)]
+    with pytest.raises(ValueError):
+        rastro[::0]
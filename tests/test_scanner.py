@@ -0,0 +1,59 @@
+# tests/test_scanner.py — Regressões do analisador léxico
+import io
+
+import pytest
+
+import scanner
+from scanner import analisador_lexico, analisador_lexico_buffer, gerar_tokens_arquivo
+
+BRANCOS_NO_FIM = ["principal { }  ", "principal { }\t \t", "principal {\n}\n \t", "x = 1; "]
+
+
+@pytest.mark.parametrize("fonte", BRANCOS_NO_FIM)
+def test_brancos_no_fim_nao_sao_erro(fonte):
+    # sem lista de diagnósticos, um erro léxico seria RuntimeError
+    esperado = analisador_lexico(fonte.rstrip(" \t"))
+    assert analisador_lexico(fonte) == esperado
+    diagnosticos = []
+    assert list(analisador_lexico_buffer(fonte, diagnosticos)) == esperado
+    assert diagnosticos == []
+    for bloco in (1, 4, 64):
+        assert list(gerar_tokens_arquivo(io.StringIO(fonte), bloco)) == esperado
+
+
+def test_caractere_invalido_continua_anotado():
+    diagnosticos = []
+    tokens = analisador_lexico("x @ y  ", diagnosticos)
+    assert [t[0] for t in tokens] == ["IDENT", "IDENT", "EOF"]
+    assert [(d.etapa, d.linha) for d in diagnosticos] == [("lexico", 1)]
+    with pytest.raises(RuntimeError):
+        analisador_lexico("x @ y")
+
+
+def test_aspa_sem_fechamento_em_blocos(monkeypatch):
+    monkeypatch.setattr(scanner, "MAXIMO_CADEIA", 4096)
+    fonte = 'principal { cadeia s = "abc;\n' + "x = x + 1;\n" * 5000 + "}\n"
+    esperado_diag = []
+    esperado = analisador_lexico(fonte, esperado_diag)
+    assert esperado_diag[0].mensagem == "Cadeia sem aspas de fechamento"
+    for bloco in (7, 256, 1 << 16):
+        diagnosticos = []
+        assert list(gerar_tokens_arquivo(io.StringIO(fonte), bloco, diagnosticos)) == esperado
+        assert diagnosticos == esperado_diag
+
+
+def test_aspa_sem_fechamento_nao_reanalisa_o_texto_guardado(monkeypatch):
+    # cada pedaço sem aspas é só guardado: a expressão mestra passa uma vez
+    # pelo texto segurado, não uma vez por pedaço
+    chamadas = []
+    padrao = scanner._PADRAO
+
+    class Contador:
+        def finditer(self, texto):
+            chamadas.append(len(texto))
+            return padrao.finditer(texto)
+
+    monkeypatch.setattr(scanner, "_PADRAO", Contador())
+    fonte = '"' + "x " * 200_000
+    list(gerar_tokens_arquivo(io.StringIO(fonte), 1024, []))
+    assert sum(chamadas) < 3 * len(fonte)
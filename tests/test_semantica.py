@@ -0,0 +1,59 @@
+# tests/test_semantica.py — Identificadores não declarados e redeclarados nas reduções do SLR
+import pytest
+
+from grammar import grammar
+from scanner import analisador_lexico, analisador_lexico_buffer
+from semantica import AnalisadorSemantico, TabelaSimbolos
+from slr_parser import analisar_slr
+
+# (fonte, diagnósticos esperados (linha, mensagem), na ordem)
+CASOS = [
+    ("principal { int x = 1; x = x + 2; }", []),
+    ("principal {\n x = 1;\n y = x;\n x = 2;\n}",
+     [(2, "variável 'x' não declarada"), (3, "variável 'y' não declarada")]),
+    ("principal { int x = y + z * 2; }", [(1, "variável 'y' não declarada"), (1, "variável 'z' não declarada")]),
+    ("principal {\n int x;\n real x;\n}", [(3, "'x' já declarada neste escopo (linha 2)")]),
+    ("principal { int x; se (verdadeiro) { real x = 1; } }", []),
+    ("principal { se (verdadeiro) { int x; } x = 1; }", [(1, "variável 'x' não declarada")]),
+    ("principal { para (int i = 0; i < 3; i = i + 1) { } i = 1; }", [(1, "variável 'i' não declarada")]),
+    ("funcao int f(int a) { int a; retornar a; } principal { }", [(1, "'a' já declarada neste escopo (linha 1)")]),
+    ("funcao int f() { retornar 1; }\nfuncao int f() { retornar 2; }\nprincipal { }",
+     [(2, "função 'f' já declarada (linha 1)")]),
+    ("principal { g(1); }", [(1, "função 'g' não declarada")]),
+    ("funcao int f(int a) { retornar f(a - 1); } principal { int x = f(1); }", []),
+]
+
+
+def _analisar(tokens):
+    diagnosticos = []
+    analise = AnalisadorSemantico()
+    analisar_slr(tokens, grammar, rastro="desligado", diagnosticos=diagnosticos, exibir=False, semantica=analise)
+    return analise, diagnosticos
+
+
+@pytest.mark.parametrize("lexico", [analisador_lexico, analisador_lexico_buffer])
+@pytest.mark.parametrize("fonte, esperado", CASOS)
+def test_declaracoes(lexico, fonte, esperado):
+    analise, diagnosticos = _analisar(lexico(fonte, []))
+    assert [(d.etapa, d.linha, d.mensagem) for d in diagnosticos] == [("semantica", *e) for e in esperado]
+    assert analise.erros == len(esperado)
+
+
+def test_para_no_primeiro_erro_sintatico():
+    analise, diagnosticos = _analisar(analisador_lexico_buffer("principal { x = ; y = 1; }", []))
+    assert analise.abandonada and diagnosticos
+    assert [d.etapa for d in diagnosticos] == ["slr"] * len(diagnosticos)
+    assert not any("'y'" in d.mensagem for d in diagnosticos)
+
+
+def test_tabela_de_simbolos_com_escopos():
+    tabela = TabelaSimbolos()
+    assert tabela.declarar("x", "int", 1) is None
+    tabela.abrir()
+    assert tabela.declarar("x", "real", 2) is None
+    assert tabela.buscar("x").tipo == "real"
+    assert tabela.declarar("x", "car", 3).linha == 2
+    tabela.fechar()
+    assert tabela.buscar("x").tipo == "int"
+    tabela.fechar()
+    assert tabela.buscar("x") is None
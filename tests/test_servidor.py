@@ -0,0 +1,73 @@
+# tests/test_servidor.py — Enquadramento inválido e análise fora do laço de eventos no servidor
+import asyncio
+import json
+
+import pytest
+
+from cache_tabelas import obter_tabelas
+from grammar import grammar
+from servidor import ERRO_REQUISICAO, ErroRPC, ServidorCompilacao, enquadrar, ler_mensagem
+
+
+@pytest.fixture(scope="module")
+def servidor():
+    servidor = ServidorCompilacao(obter_tabelas(grammar))
+    yield servidor
+    servidor.fechar()
+
+
+def leitor_com(dados):
+    leitor = asyncio.StreamReader()
+    leitor.feed_data(dados)
+    leitor.feed_eof()
+    return leitor
+
+
+def respostas(dados):
+    # separa as mensagens enquadradas escritas pelo servidor
+    mensagens = []
+    while dados:
+        cabecalho, _, dados = dados.partition(b"\r\n\r\n")
+        tamanho = int(cabecalho.split(b":")[1])
+        mensagens.append(json.loads(dados[:tamanho]))
+        dados = dados[tamanho:]
+    return mensagens
+
+
+async def conversar(servidor, dados):
+    servidor.encerrado = asyncio.Event()
+    saida = []
+    await servidor.conexao(leitor_com(dados), saida.append)
+    return respostas(b"".join(saida))
+
+
+@pytest.mark.parametrize("valor", [b"abc", b"-5", b"", b"1e3", b"\xd9\xa3"])
+def test_content_length_invalido(valor):
+    async def ler():
+        return await ler_mensagem(leitor_com(b"Content-Length: " + valor + b"\r\n\r\n{}"))
+
+    with pytest.raises(ErroRPC) as erro:
+        asyncio.run(ler())
+    assert erro.value.codigo == ERRO_REQUISICAO
+
+
+def test_enquadramento_invalido_responde_e_fecha(servidor):
+    ping = enquadrar({"jsonrpc": "2.0", "id": 1, "method": "ping"})
+    mensagens = asyncio.run(conversar(servidor, ping + b"Content-Length: -1\r\n\r\n" + ping))
+    assert mensagens[0] == {"jsonrpc": "2.0", "id": 1, "result": "pong"}
+    assert mensagens[1]["error"]["code"] == ERRO_REQUISICAO
+    # a conexão fecha no erro: o ping seguinte não é lido
+    assert len(mensagens) == 2
+
+    # e o servidor continua atendendo novas conexões
+    assert asyncio.run(conversar(servidor, ping))[0]["result"] == "pong"
+
+
+def test_analise_longa_nao_bloqueia_o_laco(servidor):
+    codigo = "principal {\n" + "    int x = 1 + 2 * 3;\n" * 20000 + "}\n"
+    analisar = enquadrar({"jsonrpc": "2.0", "id": 1, "method": "analisar", "params": {"codigo": codigo}})
+    ping = enquadrar({"jsonrpc": "2.0", "id": 2, "method": "ping"})
+    mensagens = asyncio.run(conversar(servidor, analisar + ping))
+    # o ping chega antes da resposta da análise, que roda em outra thread
+    assert [m["id"] for m in mensagens] == [2, 1]
+    assert mensagens[1]["result"]["lr_aceito"]